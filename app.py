@@ -1,9 +1,24 @@
 # AI Architect with AWS Components — Deterministic final (RPS / TB / Retention / SLA)
 # Paste this into app.py in your repo. Uses only streamlit + graphviz (Streamlit Free friendly).
+# The decision logic lives in engine.py (no Streamlit import); this file is the UI layer.
 
 import streamlit as st
+import io
 import json
-from datetime import datetime
+import os
+import sys
+import time
+
+import engine
+import latency
+import tagging
+from incremental import IncrementalEvaluator
+from metrics import METRICS
+from store import ReportStore
+from whatif import explore
+from widgets import get_diagram_cache, show_diagram
+
+_rerun_start, _rerun_blocks = time.perf_counter(), sys.getallocatedblocks()
 
 st.set_page_config(page_title="AI Architect with AWS Components (Deterministic)", layout="wide")
 st.title("🤖 AI Architect with AWS Components — Deterministic (RPS/Size/SLA)")
@@ -14,475 +29,187 @@ st.caption("Set sliders + four deterministic dropdowns (RPS, Dataset TB, Retenti
 # --------------------------
 st.sidebar.header("⚙️ Configure AI Architecture Parameters")
 params = {
-    "Data Volume": st.sidebar.slider("Data Volume (1=GB .. 10=PB)", 1, 10, 1),
-    "Data Variety": st.sidebar.slider("Data Variety (1=structured .. 10=multi-modal)", 1, 10, 1),
-    "Real-Time Requirement": st.sidebar.slider("Real-Time (1=batch .. 10=real-time)", 1, 10, 1),
-    "Model Complexity": st.sidebar.slider("Model Complexity (1=basic .. 10=GenAI)", 1, 10, 1),
-    "Scalability Need": st.sidebar.slider("Scalability Need (1=small .. 10=global)", 1, 10, 1),
-    "Security & Compliance": st.sidebar.slider("Security (1=low .. 10=HIPAA/Finance)", 1, 10, 1),
-    "Integration Needs": st.sidebar.slider("Integration (1=standalone .. 10=ERP/SAP)", 1, 10, 1),
-    "Cost Sensitivity": st.sidebar.slider("Cost Sensitivity (1=perf .. 10=cost-saving)", 1, 10, 1),
-    "Automation (CI/CD)": st.sidebar.slider("Automation (1=manual .. 10=full CI/CD)", 1, 10, 1),
-    "User Experience": st.sidebar.slider("UX (1=API .. 10=rich app)", 1, 10, 1),
+    name: st.sidebar.slider(label, engine.PARAM_MIN, engine.PARAM_MAX, engine.PARAM_MIN)
+    for name, label in engine.PARAM_SLIDERS
 }
 
 # --------------------------
 # New deterministic dropdowns (only these values)
 # --------------------------
 st.sidebar.markdown("### 🔎 Deterministic inputs (choose one each)")
-RPS = st.sidebar.selectbox("Traffic / RPS (requests per second)", [
-    ("very_low", "Very low (<=10 RPS)"),
-    ("low", "Low (<=100 RPS)"),
-    ("medium", "Medium (<=1k RPS)"),
-    ("high", "High (<=10k RPS)"),
-    ("very_high", "Very high (>10k RPS)")
-], index=1)[0]
-
-DATA_TB = st.sidebar.selectbox("Dataset size (TB)", [
-    ("tiny", "< 0.1 TB"),
-    ("small", "0.1 - 1 TB"),
-    ("medium", "1 - 10 TB"),
-    ("large", "10 - 100 TB"),
-    ("huge", "> 100 TB")
-], index=2)[0]
-
-RETENTION = st.sidebar.selectbox("Retention policy", [
-    ("short", "30 days"),
-    ("medium", "6 months"),
-    ("long", "3 years"),
-    ("archive", "Archive (>3 years)")
-], index=1)[0]
-
-SLA = st.sidebar.selectbox("SLA / Availability", [
-    ("best_effort", "Best-effort (no SLA)"),
-    ("slo_99_9", "SLO 99.9%"),
-    ("slo_99_95", "SLO 99.95%"),
-    ("slo_99_99", "SLO 99.99%")
-], index=1)[0]
+RPS = st.sidebar.selectbox("Traffic / RPS (requests per second)", engine.RPS_OPTIONS, index=engine.RPS_DEFAULT)[0]
+DATA_TB = st.sidebar.selectbox("Dataset size (TB)", engine.DATA_TB_OPTIONS, index=engine.DATA_TB_DEFAULT)[0]
+RETENTION = st.sidebar.selectbox("Retention policy", engine.RETENTION_OPTIONS, index=engine.RETENTION_DEFAULT)[0]
+SLA = st.sidebar.selectbox("SLA / Availability", engine.SLA_OPTIONS, index=engine.SLA_DEFAULT)[0]
 
 brief = st.text_input("Optional: one-line project brief (domain tags help; e.g., 'banking RAG / SAP')", "")
-
-# --------------------------
-# Profile detection improved using deterministic dropdowns and sliders
-# --------------------------
-def detect_profiles(params, brief_text, rps, tb, retention, sla):
-    profiles = set()
-
-    # GraphRAG / GenAI if model complexity high + data variety high
-    if params["Model Complexity"] >= 8 and params["Data Variety"] >= 6:
-        profiles.add("GraphRAG-GenAI")
-
-    # streaming if real-time or RPS high
-    if params["Real-Time Requirement"] >= 7 or rps in ("high", "very_high"):
-        profiles.add("RealTime-Streaming")
-
-    # big data profile
-    if tb in ("large", "huge") or params["Data Volume"] >= 8:
-        profiles.add("BigData-Lakehouse")
-
-    # compliance
-    if params["Security & Compliance"] >= 8 or "health" in brief_text.lower() or "hipaa" in brief_text.lower():
-        profiles.add("Compliance-High")
-
-    # ERP / SAP
-    if params["Integration Needs"] >= 8 or "sap" in brief_text.lower():
-        profiles.add("ERP-Integrated")
-
-    # cost sensitive
-    if params["Cost Sensitivity"] >= 8:
-        profiles.add("Cost-Optimized")
-
-    # SLA constraints
-    if sla == "slo_99_99":
-        profiles.add("High-Availability")
-    elif sla == "slo_99_95":
-        profiles.add("HA-Redundant")
-
-    if not profiles:
-        profiles.add("Baseline-RAG")
-
-    return profiles
-
-profiles = detect_profiles(params, brief, RPS, DATA_TB, RETENTION, SLA)
-
-# --------------------------
-# Profile templates (deterministic rules)
-# --------------------------
-PROFILE_TEMPLATES = {
-    "GraphRAG-GenAI": {
-        "required": ["S3", "Glue", "Athena", "OpenSearch", "Neptune", "SageMaker", "Bedrock", "Step Functions", "API Gateway", "IAM", "KMS", "CloudWatch"],
-        "recommended": ["SageMaker Model Registry", "SageMaker Model Monitor", "ECS Fargate", "CloudFront", "Macie", "GuardDuty"]
-    },
-    "RealTime-Streaming": {
-        "required": ["Kinesis", "MSK", "Lambda", "DynamoDB", "API Gateway", "IAM", "CloudWatch", "SQS"],
-        "recommended": ["Glue", "S3", "OpenSearch", "SageMaker"]
-    },
-    "BigData-Lakehouse": {
-        "required": ["S3", "Glue", "Athena", "EMR", "Redshift", "IAM", "KMS"],
-        "recommended": ["Lake Formation", "Glue Data Catalog", "S3 Intelligent-Tiering"]
-    },
-    "Compliance-High": {
-        "required": ["IAM", "KMS", "VPC", "Macie", "GuardDuty", "CloudTrail", "S3 Object Lock"],
-        "recommended": ["AWS Config", "Lake Formation"]
-    },
-    "ERP-Integrated": {
-        "required": ["AppFlow", "Lambda", "API Gateway", "Step Functions", "S3"],
-        "recommended": ["DynamoDB", "Glue"]
-    },
-    "Cost-Optimized": {
-        "required": ["S3", "S3 Intelligent-Tiering", "Glue", "Athena"],
-        "recommended": ["Spot Instances", "SageMaker Batch Transform"]
-    },
-    "High-Availability": {
-        "required": ["Multi-AZ", "ECS Fargate", "ALB", "AutoScaling", "Route53", "CloudFront"],
-        "recommended": ["Provisioned Concurrency", "Multi-Region Replication"]
-    },
-    "HA-Redundant": {
-        "required": ["Multi-AZ", "AutoScaling", "Route53"],
-        "recommended": ["ALB", "Read Replicas"]
-    },
-    "Baseline-RAG": {
-        "required": ["S3", "Glue", "OpenSearch", "SageMaker", "API Gateway", "Lambda", "IAM", "CloudWatch"],
-        "recommended": ["SageMaker Model Registry", "SageMaker Model Monitor", "Step Functions"]
-    }
-}
-
-# Compose required + recommended services deterministically from detected profiles and dropdowns
-def compose_services(profiles, rps, tb, retention, sla, params):
-    required = set()
-    recommended = set()
-    for p in profiles:
-        tmpl = PROFILE_TEMPLATES.get(p, {})
-        required.update(tmpl.get("required", []))
-        recommended.update(tmpl.get("recommended", []))
-
-    # Adjustments based on RPS
-    if rps in ("high", "very_high", "medium"):
-        # prefer autoscaling and managed endpoints
-        required.update(["API Gateway", "AutoScaling", "ECS Fargate", "CloudFront"])
-        recommended.update(["Provisioned Concurrency"])
-
-    # Adjustments based on dataset TB
-    if tb in ("large", "huge"):
-        required.update(["Redshift", "EMR", "Glue", "S3"])
-        recommended.update(["Parquet", "Partitioning", "S3 Intelligent-Tiering"])
-    elif tb == "medium":
-        required.update(["S3", "Glue", "Athena"])
-    else:
-        required.update(["S3"])
-
-    # retention
-    if retention == "long":
-        recommended.update(["S3 Glacier", "S3 Lifecycle"])
-    elif retention == "archive":
-        required.update(["S3 Glacier", "S3 Object Lock"])
-
-    # SLA
-    if sla == "slo_99_99":
-        required.update(["Multi-AZ", "Route53", "ECS Fargate"])
-        recommended.update(["Multi-Region Replication"])
-    elif sla == "slo_99_95":
-        required.update(["Multi-AZ", "AutoScaling"])
-
-    # model complexity tuning
-    if params["Model Complexity"] >= 8:
-        required.update(["SageMaker", "SageMaker Training", "SageMaker Model Registry", "SageMaker Model Monitor"])
-        recommended.update(["EC2 GPU", "SageMaker Distributed"])
-
-    # ensure storage core
-    required.add("S3")
-
-    # cost sensitivity reductions
-    if params["Cost Sensitivity"] >= 8:
-        recommended.update(["Spot Instances", "S3 Intelligent-Tiering"])
-
-    return sorted(required), sorted(recommended - required)
-
-required_services, recommended_services = compose_services(profiles, RPS, DATA_TB, RETENTION, SLA, params)
-
-# --------------------------
-# Map to 20 ML components (deterministic coverage)
-# --------------------------
-ML_COMPONENTS = [
-    "Data Ingestion", "Data Storage", "Data Preprocessing", "Feature Engineering", "Data Labeling", "Data Versioning",
-    "Problem Statement", "Model Selection", "Model Training", "Hyperparameter Tuning", "Model Evaluation", "Model Registry",
-    "Model Packaging", "Model Deployment", "API/Serving Layer", "Inference Service", "Model Monitoring", "Feedback Loop",
-    "Orchestration", "Model Retraining"
-]
-
-def map_ml_components(required_services, recommended_services, params, rps, tb, sla):
-    svc = set(required_services) | set(recommended_services)
-    covered = set()
-
-    # Data stage
-    covered.add("Data Ingestion")
-    covered.add("Data Storage")
-    if "Glue" in svc or params["Data Variety"] >= 4:
-        covered.add("Data Preprocessing")
-    if params["Data Variety"] >= 6 or tb in ("large","huge"):
-        covered.add("Feature Engineering")
-    if params["Automation (CI/CD)"] >= 7:
-        covered.add("Data Versioning")
-    if params["Model Complexity"] >= 6:
-        covered.add("Data Labeling")
-
-    # Modeling stage
-    covered.add("Problem Statement")
-    covered.add("Model Selection")
-    covered.add("Model Training")
-    covered.add("Hyperparameter Tuning")
-    covered.add("Model Evaluation")
-    if "SageMaker Model Registry" in svc or params["Automation (CI/CD)"] >= 8:
-        covered.add("Model Registry")
-
-    # Packaging & Deployment
-    covered.add("Model Packaging")
-    covered.add("Model Deployment")
-    covered.add("API/Serving Layer")
-    covered.add("Inference Service")
-    covered.add("Model Monitoring")
-    covered.add("Feedback Loop")
-    covered.add("Orchestration")
-
-    # Retraining (deterministic: if long retention or frequent data, plan retraining)
-    if params["Real-Time Requirement"] >= 7 or rps in ("high", "very_high"):
-        covered.add("Model Retraining")
-    else:
-        covered.add("Model Retraining")
-
-    # Return deterministic ordering matching ML_COMPONENTS
-    return [c for c in ML_COMPONENTS if c in covered] + [c for c in ML_COMPONENTS if c not in covered]
-
-ml_pipeline = map_ml_components(required_services, recommended_services, params, RPS, DATA_TB, SLA)
+documents = st.file_uploader("Optional: requirement documents (txt / markdown), scanned for domain and compliance terms",
+                             type=["txt", "md", "markdown"], accept_multiple_files=True)
+
+# one streaming pass per uploaded file, cached by upload id (the file object itself is not hashed)
+@st.cache_data(max_entries=32, show_spinner="Scanning document…")
+def scan_document(file_id, _file):
+    _file.seek(0)
+    text = io.TextIOWrapper(_file, encoding="utf-8", errors="replace")
+    try:
+        return tagging.default_tagger().scan(text)
+    finally:
+        text.detach()
+
+document_tags = tagging.merge(scan_document(f.file_id, f) for f in documents) if documents else None
+# matched tags reach detect_profiles as brief words
+rule_brief = tagging.tag_brief(brief, document_tags["tags"]) if document_tags else brief
+
+# All decision logic lives in engine.py; the page only renders its report.
+# Stages are memoised server-wide on the inputs each one reads, so a rerun only recomputes
+# the stages a widget change can actually affect.
+@st.cache_resource
+def get_evaluator():
+    return IncrementalEvaluator()
+
+evaluator = get_evaluator()
+outputs = evaluator.run(params, RPS, DATA_TB, RETENTION, SLA, rule_brief)
+report = evaluator.report(outputs, params, RPS, DATA_TB, RETENTION, SLA, rule_brief)
+if document_tags:
+    tagging.apply_tags(report, brief, document_tags["tags"])
+    report["document_tags"] = document_tags["tags"]
+# memoised per serving path / capacities / RPS class, so only a new combination pays for the 10^6-request run
+with METRICS.stage("latency_simulation"):
+    report["latency"] = latency.simulate_report(report)
+required_services = report["required_services"]
+recommended_services = report["recommended_services"]
+checks = report["checks"]
+
+# simulated latency sits right under the SLA choice
+lat = report["latency"]
+if lat["saturated"]:
+    st.sidebar.error(f"Request path saturates at {lat['saturation_rps']} RPS ({lat['bottleneck']}); design point is {lat['rps']} RPS.")
+elif lat["p99_ms"] is not None:
+    budget = f" / budget {lat['p99_budget_ms']} ms" if lat["p99_budget_ms"] is not None else ""
+    st.sidebar.metric("Simulated p99 latency", f"{lat['p99_ms']} ms", delta=budget.strip(" /") or None,
+                      delta_color="off")
+    if lat["within_budget"] is False:
+        st.sidebar.warning(f"p99 {lat['p99_ms']} ms is over the {SLA} budget of {lat['p99_budget_ms']} ms.")
 
 # --------------------------
 # Display profiles and services for transparency
 # --------------------------
 st.markdown("## 🔎 Deterministic Profiles & AWS Components")
-st.write("Profiles detected:", ", ".join(sorted(profiles)))
+st.write("Profiles detected:", ", ".join(report["profiles"]))
+if document_tags:
+    st.write("Document tags:", ", ".join(f"{tag} ×{n}" for tag, n in document_tags["tags"].items()) or "none",
+             f"({document_tags['chars']:,} characters scanned)")
 st.write("Required services (core):", ", ".join(required_services))
 st.write("Recommended services (optional):", ", ".join(recommended_services))
 
 # --------------------------
-# Build AWS architecture Graphviz (layered clusters) - deterministic, presentation-ready
+# Final AWS architecture + ML lifecycle diagrams
 # --------------------------
 st.markdown("---")
 st.markdown("## 🗺️ Final AWS Architecture — Layered (presentation-ready)")
+show_diagram(outputs["aws_dot"], "aws_architecture")
 
-def build_aws_dot(required_services, recommended_services):
-    nodes = required_services + recommended_services
-    dot = [
-        "digraph FinalAWS {",
-        "rankdir=LR;",
-        'node [shape=rect, style="rounded,filled", fillcolor="#F2F4F8", fontsize=14];'
-    ]
-    dot.append('subgraph cluster_sources {label="Client & Sources"; style=filled; fillcolor="#FFFFFF"; "Client";}')
-    dot.append('subgraph cluster_storage {label="Storage & Catalog"; style=filled; fillcolor="#FFF8E6";')
-    for n in ["S3", "Redshift", "RDS", "Athena"]:
-        if n in nodes:
-            dot.append(f'"{n}" [fillcolor="#FFF8E6"];')
-    dot.append("}")
-    dot.append('subgraph cluster_ingest {label="Ingestion & Stream"; style=filled; fillcolor="#F1F8E9";')
-    for n in ["Kinesis", "MSK", "DMS", "AppFlow"]:
-        if n in nodes:
-            dot.append(f'"{n}" [fillcolor="#F1F8E9"];')
-    dot.append("}")
-    dot.append('subgraph cluster_processing {label="Processing & ETL"; style=filled; fillcolor="#F0F7FF";')
-    for n in ["Glue", "EMR", "SageMaker Processing", "Glue DataBrew", "Athena"]:
-        if n in nodes:
-            dot.append(f'"{n}" [fillcolor="#F0F7FF"];')
-    dot.append("}")
-    dot.append('subgraph cluster_ml {label="ML & Model Ops"; style=filled; fillcolor="#F7F2FF";')
-    for n in ["SageMaker", "SageMaker Training", "SageMaker Model Registry", "SageMaker Endpoints", "SageMaker Model Monitor", "Bedrock", "Neptune", "OpenSearch"]:
-        if n in nodes:
-            dot.append(f'"{n}" [fillcolor="#F7F2FF"];')
-    dot.append("}")
-    dot.append('subgraph cluster_serving {label="Serving & API"; style=filled; fillcolor="#F2FFF6";')
-    for n in ["API Gateway", "Lambda", "ECS Fargate", "CloudFront", "Amplify", "AutoScaling", "ALB", "Route53"]:
-        if n in nodes:
-            dot.append(f'"{n}" [fillcolor="#F2FFF6"];')
-    dot.append("}")
-    dot.append('subgraph cluster_ops {label="Security & Observability"; style=filled; fillcolor="#FFF2F4";')
-    for n in ["IAM", "KMS", "Macie", "GuardDuty", "CloudWatch", "CodePipeline", "CloudTrail", "S3 Object Lock"]:
-        if n in nodes:
-            dot.append(f'"{n}" [fillcolor="#FFF2F4"];')
-    dot.append("}")
-
-    # edges (deterministic logical flow)
-    edges = [
-        ('"Client"', '"API Gateway"'),
-        ('"API Gateway"', '"Lambda"'),
-        ('"Lambda"', '"Kinesis"'),
-        ('"Kinesis"', '"Glue"'),
-        ('"Glue"', '"S3"'),
-        ('"S3"', '"Athena"'),
-        ('"S3"', '"SageMaker"'),
-        ('"SageMaker"', '"SageMaker Model Registry"'),
-        ('"SageMaker Model Registry"', '"SageMaker Endpoints"'),
-        ('"SageMaker Endpoints"', '"API Gateway"'),
-        ('"Lambda"', '"CloudWatch"'),
-        ('"SageMaker"', '"SageMaker Model Monitor"'),
-        ('"Neptune"', '"Bedrock"'),
-        ('"OpenSearch"', '"Bedrock"')
-    ]
-    for a,b in edges:
-        an = a.strip('"')
-        bn = b.strip('"')
-        if (an == "Client" or an in nodes) and (bn in nodes):
-            dot.append(f'{a} -> {b} [penwidth=1.2];')
-    dot.append("}")
-    return "\n".join(dot)
-
-aws_dot = build_aws_dot(required_services, recommended_services)
-st.graphviz_chart(aws_dot, use_container_width=True)
-
-# --------------------------
-# ML lifecycle diagram (20 components) clustered TB and deterministic highlighting
-# --------------------------
 st.markdown("---")
 st.markdown("## 🧠 ML Lifecycle (20 components) — Deterministic mapping")
-
-def build_ml_dot(ml_components):
-    dot = [
-        "digraph MLFull {",
-        "rankdir=TB;",
-        'node [shape=rect, style="rounded,filled", fillcolor="#E8F0FE", fontsize=12];'
-    ]
-    dot.append('subgraph cluster_data { label="📂 Data Pipeline"; style=filled; fillcolor="#F1F8E9"; fontsize=14;')
-    for n in ["Data Ingestion","Data Storage","Data Preprocessing","Feature Engineering","Data Labeling","Data Versioning"]:
-        color = "#DFF4D8" if n in ml_components else "#FFF8E6"
-        dot.append(f'"{n}" [fillcolor="{color}"];')
-    dot.append("}")
-    dot.append('subgraph cluster_model { label="🤖 Model Dev & Training"; style=filled; fillcolor="#E3F2FD"; fontsize=14;')
-    for n in ["Problem Statement","Model Selection","Model Training","Hyperparameter Tuning","Model Evaluation","Model Registry"]:
-        color = "#DDEBF9" if n in ml_components else "#F8F8FF"
-        dot.append(f'"{n}" [fillcolor="{color}"];')
-    dot.append("}")
-    dot.append('subgraph cluster_deploy { label="🚀 Deployment & MLOps"; style=filled; fillcolor="#FFF3E0"; fontsize=14;')
-    for n in ["Model Packaging","Model Deployment","API/Serving Layer","Inference Service","Model Monitoring","Feedback Loop","Orchestration","Model Retraining"]:
-        color = "#FFF0D9" if n in ml_components else "#FFFCEA"
-        dot.append(f'"{n}" [fillcolor="{color}"];')
-    dot.append("}")
-    # connections
-    flow_pairs = [
-        ("Data Ingestion","Data Storage"),("Data Storage","Data Preprocessing"),("Data Preprocessing","Feature Engineering"),
-        ("Feature Engineering","Model Training"),("Model Training","Model Evaluation"),("Model Evaluation","Model Registry"),
-        ("Model Registry","Model Packaging"),("Model Packaging","Model Deployment"),("Model Deployment","API/Serving Layer"),
-        ("API/Serving Layer","Inference Service"),("Inference Service","Model Monitoring"),("Model Monitoring","Feedback Loop"),
-        ("Feedback Loop","Model Retraining")
-    ]
-    for a,b in flow_pairs:
-        dot.append(f'"{a}" -> "{b}" [penwidth=1.0];')
-    dot.append("}")
-    return "\n".join(dot)
-
-ml_dot = build_ml_dot(ml_pipeline)
-st.graphviz_chart(ml_dot, use_container_width=True)
+show_diagram(outputs["ml_dot"], "ml_lifecycle")
 
 # --------------------------
 # Validation (strict checks influenced by deterministic dropdowns)
 # --------------------------
 st.markdown("---")
 st.markdown("## ✅ Deterministic Validation & Confidence (standards-aware)")
-
-def strict_checks(required, recommended, ml_components, rps, tb, retention, sla):
-    svc = set(required) | set(recommended)
-    checks = {}
-    # Security presence
-    checks["Security"] = any(x in svc for x in ["IAM","KMS","Macie","GuardDuty","VPC","S3 Object Lock"])
-    # Storage resilience
-    checks["Storage"] = "S3" in svc
-    # Monitoring & MLOps
-    checks["Observability"] = any(x in svc for x in ["CloudWatch","SageMaker Model Monitor","CloudTrail"])
-    # Orchestration
-    checks["Orchestration"] = any(x in svc for x in ["Step Functions","CodePipeline","AutoScaling"])
-    # High RPS readiness
-    checks["HighRPS"] = (rps in ("high", "very_high") and any(x in svc for x in ["AutoScaling","ECS Fargate","Provisioned Concurrency","CloudFront"])) or (rps in ("very_low","low","medium"))
-    # Big Data readiness
-    checks["BigData"] = (tb in ("large","huge") and any(x in svc for x in ["Redshift","EMR","Athena","Glue"])) or (tb in ("tiny","small","medium"))
-    # SLA readiness
-    checks["SLA"] = False
-    if sla == "slo_99_99":
-        checks["SLA"] = all(x in svc for x in ["Multi-AZ","Route53"])
-    elif sla == "slo_99_95":
-        checks["SLA"] = "Multi-AZ" in svc or "AutoScaling" in svc
-    else:
-        checks["SLA"] = True
-    # ML lifecycle coverage (training, registry, monitoring, deployment)
-    checks["MLLifecycle"] = all(x in ml_components for x in ["Model Training","Model Registry","Model Monitoring","Model Deployment"])
-    return checks
-
-checks = strict_checks(required_services, recommended_services, ml_pipeline, RPS, DATA_TB, RETENTION, SLA)
-
-# compute a stricter confidence score with clear weights
-weights = {"Security":0.22, "Storage":0.18, "Observability":0.15, "Orchestration":0.15, "HighRPS":0.10, "BigData":0.10, "SLA":0.05, "MLLifecycle":0.05}
-score = 0.0
-for k,w in weights.items():
-    score += (1.0 if checks.get(k) else 0.0) * w * 100
-score = round(score,1)
-
 st.write("Checks:", checks)
-st.metric(label="Deterministic Architecture Confidence", value=f"{score}%")
-
-# remediation (strict)
-rem = []
-if not checks["Security"]:
-    rem.append("Add IAM, KMS, GuardDuty/Macie, VPC and S3 Object Lock for high compliance.")
-if not checks["Storage"]:
-    rem.append("Add S3 + lifecycle policies; ensure Glue Data Catalog and Lake Formation if dataset large.")
-if not checks["Observability"]:
-    rem.append("Add CloudWatch, CloudTrail and SageMaker Model Monitor.")
-if not checks["Orchestration"]:
-    rem.append("Add Step Functions, CodePipeline and Autoscaling for production workflows.")
-if not checks["HighRPS"]:
-    rem.append("Tune API Gateway + AutoScaling / CloudFront + provisioned concurrency for endpoints.")
-if not checks["BigData"]:
-    rem.append("Add Redshift / EMR / Athena and partitioned Parquet storage for TB-scale datasets.")
-if not checks["SLA"]:
-    rem.append("Add Multi-AZ, Route53 failover and multi-region replication for required SLAs.")
-if not checks["MLLifecycle"]:
-    rem.append("Ensure Model Registry + Model Monitor + automated retraining pipelines exist.")
+st.metric(label="Deterministic Architecture Confidence", value=f"{report['confidence']}%")
 
-if rem:
+if report["remediation"]:
     st.markdown("### 🔧 Remediation Suggestions (strict)")
-    for r in rem:
+    for r in report["remediation"]:
         st.write("- " + r)
 else:
     st.success("All deterministic checks passed for the given RPS/TB/Retention/SLA choices.")
 
-# role mapping (simple & deterministic)
-ROLE_MAP = {
-    "S3":"Data Engineering","Glue":"Data Engineering","Athena":"Analytics","Redshift":"Data Engineering",
-    "OpenSearch":"Search","Neptune":"Knowledge Engineering","SageMaker":"ML Platform","Bedrock":"ML Platform",
-    "Step Functions":"Platform/Orchestration","Kinesis":"Streaming","MSK":"Streaming","Lambda":"Backend",
-    "API Gateway":"Integration","CloudWatch":"Observability","KMS":"Security","IAM":"Security",
-    "Macie":"Security","GuardDuty":"Security","CodePipeline":"DevOps","ECS Fargate":"Platform Infra",
-    "EMR":"Data Engineering","SageMaker Model Monitor":"ML Platform"
-}
+st.markdown("### 📏 Capacity sizing (from the RPS / TB / retention / SLA choices)")
+sizing_report = report["sizing"]
+st.dataframe([
+    {"service": svc, "metric": metric, "estimate": value}
+    for svc, metrics in sizing_report["services"].items()
+    for metric, value in metrics.items()
+], hide_index=True)
+for w in sizing_report["warnings"]:
+    st.warning(w)
+st.caption("Design point: " + ", ".join(f"{k} = {v}" for k, v in sizing_report["demand"].items())
+           + ". Throughput limits and quotas are editable in sizing.py.")
+
+st.markdown("### ⏱️ Latency budget (simulated request path at the RPS class)")
+if lat["path"]:
+    st.write("Serving path:", " → ".join(["Client"] + lat["path"]))
+    cols = st.columns(4)
+    for col, key in zip(cols, ["p50_ms", "p95_ms", "p99_ms", "p99_budget_ms"]):
+        col.metric(key.replace("_ms", "").replace("_", " "), "—" if lat[key] is None else f"{lat[key]} ms")
+    st.dataframe([
+        {"hop": svc, "mean ms": h["mean_ms"], "servers": h["servers"] or "∞", "utilisation": h["utilisation"],
+         "saturates at RPS": h["saturation_rps"]}
+        for svc, h in lat["hops"].items()
+    ], hide_index=True)
+    st.caption(f"{lat['samples']:,} simulated requests at {lat['rps']:,} RPS; bottleneck {lat['bottleneck']} "
+               f"saturates at {lat['saturation_rps']} RPS. Hop profiles are editable in latency.py.")
+else:
+    st.write("No synchronous serving path in this architecture.")
+
+with st.expander("🔀 What-if: which single change would alter the result?"):
+    # the expander body runs on every rerun even when collapsed, so exploring is opt-in
+    if not st.toggle("Explore one-step changes", key="whatif_explore"):
+        st.caption("Turn on to evaluate every single-control move from the current configuration.")
+    else:
+        whatif_rows, whatif_skipped = explore(params, RPS, DATA_TB, RETENTION, SLA, rule_brief, evaluator=evaluator,
+                                              base=outputs)
+        if whatif_rows:
+            st.dataframe([
+                {
+                    "control": r["control"],
+                    "change": r["change"],
+                    "score Δ": r["score_delta"],
+                    "checks flipped": ", ".join(r["checks_flipped"]),
+                    "services +": ", ".join(r["services_gained"]),
+                    "services −": ", ".join(r["services_lost"]),
+                    "profiles +/−": ", ".join(["+" + p for p in r["profiles_gained"]] + ["−" + p for p in r["profiles_lost"]]),
+                    "re-tiered": ", ".join(r["services_retiered"]),
+                }
+                for r in whatif_rows
+            ], hide_index=True)
+        else:
+            st.write("No one-step change alters the architecture.")
+        st.caption(f"{whatif_skipped} one-step moves stay inside the same rule class and change nothing.")
+
 st.markdown("### 👥 Deterministic Role Ownership")
-for s in required_services + recommended_services:
-    st.write(f"- **{s}** → {ROLE_MAP.get(s, 'Platform / Engineering')}")
+st.markdown("\n".join(f"- **{s}** → {role}" for s, role in outputs["roles"]))
 
 # --------------------------
 # Final deterministic report (downloadable)
 # --------------------------
 st.markdown("---")
 st.markdown("## 📄 Download Deterministic Architecture Report")
-report = {
-    "generated_at": datetime.utcnow().isoformat() + "Z",
-    "params": params,
-    "deterministic_inputs": {"RPS":RPS,"DATA_TB":DATA_TB,"RETENTION":RETENTION,"SLA":SLA},
-    "brief": brief,
-    "profiles": sorted(list(profiles)),
-    "required_services": required_services,
-    "recommended_services": recommended_services,
-    "ml_pipeline": ml_pipeline,
-    "checks": checks,
-    "confidence": score,
-    "remediation": rem
-}
-st.download_button("Download JSON report", json.dumps(report, indent=2), file_name="architecture_report.json", mime="application/json")
-st.download_button("Download TXT report", json.dumps(report, indent=2), file_name="architecture_report.txt", mime="text/plain")
+with METRICS.stage("report_serialisation"):
+    report_json = json.dumps(report, indent=2)
+st.download_button("Download JSON report", report_json, file_name="architecture_report.json", mime="application/json")
+st.download_button("Download TXT report", report_json, file_name="architecture_report.txt", mime="text/plain")
+
+# Local append-only report store (store.py); ARCHITECT_REPORT_STORE picks the SQLite file
+store_path = os.environ.get("ARCHITECT_REPORT_STORE", "reports.db")
+col_project, col_save = st.columns([3, 1])
+project = col_project.text_input("Project", value="default", help=f"Runs of one project are stored and diffed together in {store_path}")
+if col_save.button("Save to report store"):
+    report_store = ReportStore(store_path)
+    try:
+        previous = report_store.runs(project)
+        rid = report_store.add(report, project)
+        st.success(f"Saved as run {len(previous) + 1} of {project!r} (report {rid}).")
+        if previous:
+            changes = report_store.diff(previous[-1][1], rid)
+            st.caption("Changes since the previous run:")
+            st.json({k: v for k, v in changes.items() if v and k not in ("a", "b")})
+    finally:
+        report_store.close()
 
 # --------------------------
 # Final honest note
@@ -494,3 +221,30 @@ Because these values are discrete and pre-defined, the resulting architecture ma
 
 ⚠️ Caveat: for specialized legal/regulatory decisions (e.g., exact encryption standards, procurement approvals, cost estimates at scale, account landing zones), a last human review is still recommended as part of governance.
 """)
+
+# --------------------------
+# Performance instrumentation (sidebar panel, optional Prometheus file / endpoint)
+# --------------------------
+METRICS.observe("rerun", time.perf_counter() - _rerun_start, sys.getallocatedblocks() - _rerun_blocks)
+
+@st.cache_resource
+def start_metrics_endpoint(port):
+    return METRICS.serve(port)
+
+if os.environ.get("ARCHITECT_METRICS_PORT"):
+    start_metrics_endpoint(int(os.environ["ARCHITECT_METRICS_PORT"]))
+if os.environ.get("ARCHITECT_METRICS_FILE"):
+    METRICS.write(os.environ["ARCHITECT_METRICS_FILE"])
+
+if st.sidebar.checkbox("Show performance panel", value=False):
+    st.sidebar.markdown("### ⏱️ Performance (recent reruns)")
+    st.sidebar.dataframe([
+        {"stage": name, "runs": s["count"], "p50 ms": round(s["p50_ms"], 3), "p95 ms": round(s["p95_ms"], 3), "alloc blocks p50": s["alloc_blocks_p50"]}
+        for name, s in METRICS.summary().items()
+    ], hide_index=True)
+    stage_hits, stage_misses = evaluator.hits, evaluator.misses
+    diagram_stats = get_diagram_cache().stats()
+    st.sidebar.write(f"Evaluations: {METRICS.counter('evaluations')}")
+    st.sidebar.write(f"Stage cache: {stage_hits} hits / {stage_misses} misses")
+    st.sidebar.write(f"Diagram cache: {diagram_stats['hits']} hits / {diagram_stats['disk_hits']} disk hits / {diagram_stats['misses']} misses")
+    st.sidebar.caption("Recomputed this rerun: " + (", ".join(outputs["recomputed"]) or "nothing (all stages cached)"))
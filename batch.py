@@ -0,0 +1,251 @@
+# NumPy-vectorised batch evaluator: scores whole grids of requirement configurations at once.
+#
+# Inputs are columnar: one int array per slider (values 1..10) and one code array per dropdown
+# (index into engine.RPS_OPTIONS / DATA_TB_OPTIONS / RETENTION_OPTIONS / SLA_OPTIONS).
+# Outputs are columnar too: profile and ML-coverage bitmasks, (words, n) uint64 service bitmasks
+# using the engine's service registry IDs, one bool array per check and the confidence score.
+# Results are identical to looping engine.detect_profiles -> compose_services -> map_ml_components
+# -> strict_checks -> confidence_score over the built-in rules; use row() to decode a single row back
+# to names. size_batch() adds the capacity sizing columns (sizing.py) for a result.
+
+import itertools
+
+import numpy as np
+
+import engine
+import sizing
+from services import REGISTRY
+
+PROFILES = list(engine.PROFILE_TEMPLATES)
+CHECKS = list(engine.WEIGHTS)
+
+def dropdown_codes(options, values):
+    lookup = {v: i for i, (v, _) in enumerate(options)}
+    return np.fromiter((lookup[v] for v in values), dtype=np.int8, count=len(values))
+
+def _code(options, value):
+    return [v for v, _ in options].index(value)
+
+def _is(codes, options, *values):
+    out = np.zeros(codes.shape, dtype=bool)
+    for v in values:
+        out |= codes == _code(options, v)
+    return out
+
+# --------------------------
+# Confidence score: 8 checks -> 256 possible scores, so look them up instead of re-summing weights
+# --------------------------
+SCORE_LUT = np.array([
+    engine.confidence_score({k: bool(bits >> i & 1) for i, k in enumerate(CHECKS)})
+    for bits in range(1 << len(CHECKS))
+], dtype=np.float64)
+
+class _Masks:
+    # word-major (words, n) uint64 layout so rule packs can grow the registry past 64 services
+    def __init__(self, n):
+        self.words = max(1, (len(REGISTRY) + 63) // 64)
+        self.n = n
+
+    def split(self, mask):
+        return [(mask >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(self.words)]
+
+    # adds: [(cond, required_mask, recommended_mask)] -> OR of the masks whose cond holds, per row.
+    # Conditions are packed 8 at a time into a uint8 code and resolved with one 256-entry table
+    # gather per word, instead of one masked OR per condition.
+    def accumulate(self, adds):
+        required = np.zeros((self.words, self.n), dtype=np.uint64)
+        recommended = np.zeros((self.words, self.n), dtype=np.uint64)
+        for start in range(0, len(adds), 8):
+            chunk = adds[start:start + 8]
+            code = np.zeros(self.n, dtype=np.uint8)
+            for i, (cond, _, _) in enumerate(chunk):
+                code |= cond.view(np.uint8) << np.uint8(i)
+            req_lut = [0] * (1 << len(chunk))
+            rec_lut = [0] * (1 << len(chunk))
+            for bits in range(1, 1 << len(chunk)):
+                low = (bits & -bits).bit_length() - 1
+                req_lut[bits] = req_lut[bits & (bits - 1)] | chunk[low][1]
+                rec_lut[bits] = rec_lut[bits & (bits - 1)] | chunk[low][2]
+            for w in range(self.words):
+                required[w] |= np.array([self.split(v)[w] for v in req_lut], dtype=np.uint64)[code]
+                recommended[w] |= np.array([self.split(v)[w] for v in rec_lut], dtype=np.uint64)[code]
+        return required, recommended
+
+    def any_of(self, svc, mask):
+        out = np.zeros(self.n, dtype=bool)
+        for w, c in enumerate(self.split(mask)):
+            if c:
+                out |= (svc[w] & np.uint64(c)) != 0
+        return out
+
+    def all_of(self, svc, mask):
+        out = np.ones(self.n, dtype=bool)
+        for w, c in enumerate(self.split(mask)):
+            if c:
+                out &= (svc[w] & np.uint64(c)) == np.uint64(c)
+        return out
+
+def evaluate_batch(params, rps, tb, retention, sla, briefs=None):
+    # params: {name: int array} for the 10 sliders (missing names default to 1)
+    # rps/tb/retention/sla: dropdown code arrays; briefs: optional sequence of brief strings
+    if engine.RULE_PACKS:
+        raise ValueError("evaluate_batch mirrors the built-in rules only; use engine.evaluate with rule packs installed")
+    rps, tb, retention, sla = (np.asarray(a) for a in (rps, tb, retention, sla))
+    n = len(rps)
+    p = {name: np.asarray(params[name]) if name in params else np.ones(n, dtype=np.int8) for name in engine.PARAM_NAMES}
+
+    if briefs is not None:
+        lowered = np.char.lower(np.asarray(briefs, dtype=str))
+        compliance_kw = (np.char.find(lowered, "health") >= 0) | (np.char.find(lowered, "hipaa") >= 0)
+        sap_kw = np.char.find(lowered, "sap") >= 0
+    else:
+        compliance_kw = sap_kw = np.zeros(n, dtype=bool)
+
+    rps_high = _is(rps, engine.RPS_OPTIONS, "high", "very_high")
+    rps_scaled = rps_high | _is(rps, engine.RPS_OPTIONS, "medium")
+    tb_large = _is(tb, engine.DATA_TB_OPTIONS, "large", "huge")
+    tb_medium = _is(tb, engine.DATA_TB_OPTIONS, "medium")
+    sla_9999 = _is(sla, engine.SLA_OPTIONS, "slo_99_99")
+    sla_9995 = _is(sla, engine.SLA_OPTIONS, "slo_99_95")
+
+    # --- detect_profiles
+    flags = {
+        "GraphRAG-GenAI": (p["Model Complexity"] >= 8) & (p["Data Variety"] >= 6),
+        "RealTime-Streaming": (p["Real-Time Requirement"] >= 7) | rps_high,
+        "BigData-Lakehouse": tb_large | (p["Data Volume"] >= 8),
+        "Compliance-High": (p["Security & Compliance"] >= 8) | compliance_kw,
+        "ERP-Integrated": (p["Integration Needs"] >= 8) | sap_kw,
+        "Cost-Optimized": p["Cost Sensitivity"] >= 8,
+        "High-Availability": sla_9999,
+        "HA-Redundant": sla_9995,
+    }
+    any_profile = np.zeros(n, dtype=bool)
+    for f in flags.values():
+        any_profile |= f
+    flags["Baseline-RAG"] = ~any_profile
+    profiles = np.zeros(n, dtype=np.uint16)
+    for i, name in enumerate(PROFILES):
+        profiles |= flags[name].astype(np.uint16) << np.uint16(i)
+
+    # --- compose_services
+    m = _Masks(n)
+    retention_long = _is(retention, engine.RETENTION_OPTIONS, "long")
+    retention_archive = _is(retention, engine.RETENTION_OPTIONS, "archive")
+    complex_model = p["Model Complexity"] >= 8
+    always_on = np.ones(n, dtype=bool)
+    adds = [(flags[name],) + engine.PROFILE_MASKS.get(name, (0, 0)) for name in PROFILES]
+    adds += [
+        (rps_scaled, engine.RPS_SCALE_REQUIRED, engine.RPS_SCALE_RECOMMENDED),
+        (tb_large, engine.TB_LARGE_REQUIRED, engine.TB_LARGE_RECOMMENDED),
+        (tb_medium, engine.TB_MEDIUM_REQUIRED, 0),
+        (~(tb_large | tb_medium), engine.TB_SMALL_REQUIRED, 0),
+        (retention_long, 0, engine.RETENTION_LONG_RECOMMENDED),
+        (retention_archive, engine.RETENTION_ARCHIVE_REQUIRED, 0),
+        (sla_9999, engine.SLA_9999_REQUIRED, engine.SLA_9999_RECOMMENDED),
+        (sla_9995, engine.SLA_9995_REQUIRED, 0),
+        (complex_model, engine.COMPLEX_MODEL_REQUIRED, engine.COMPLEX_MODEL_RECOMMENDED),
+        (always_on, engine.STORAGE_CORE, 0),
+        (p["Cost Sensitivity"] >= 8, 0, engine.COST_SAVING_RECOMMENDED),
+    ]
+    required, recommended = m.accumulate(adds)
+    recommended &= ~required
+    svc = required | recommended
+
+    # --- map_ml_components (bit i = engine.ML_COMPONENTS[i] covered)
+    always = ["Data Ingestion", "Data Storage", "Problem Statement", "Model Selection", "Model Training",
+              "Hyperparameter Tuning", "Model Evaluation", "Model Packaging", "Model Deployment",
+              "API/Serving Layer", "Inference Service", "Model Monitoring", "Feedback Loop",
+              "Orchestration", "Model Retraining"]
+    registry_covered = m.any_of(svc, engine.MODEL_REGISTRY) | (p["Automation (CI/CD)"] >= 8)
+    covered = {
+        "Data Preprocessing": m.any_of(svc, engine.GLUE) | (p["Data Variety"] >= 4),
+        "Feature Engineering": (p["Data Variety"] >= 6) | tb_large,
+        "Data Versioning": p["Automation (CI/CD)"] >= 7,
+        "Data Labeling": p["Model Complexity"] >= 6,
+        "Model Registry": registry_covered,
+    }
+    ml_covered = np.zeros(n, dtype=np.uint32)
+    for i, c in enumerate(engine.ML_COMPONENTS):
+        if c in always:
+            ml_covered |= np.uint32(1 << i)
+        else:
+            ml_covered |= covered[c].astype(np.uint32) << np.uint32(i)
+
+    # --- strict_checks
+    checks = {
+        "Security": m.any_of(svc, engine.SECURITY_SERVICES),
+        "Storage": m.any_of(svc, engine.STORAGE_SERVICES),
+        "Observability": m.any_of(svc, engine.OBSERVABILITY_SERVICES),
+        "Orchestration": m.any_of(svc, engine.ORCHESTRATION_SERVICES),
+        "HighRPS": (rps_high & m.any_of(svc, engine.HIGH_RPS_SERVICES)) | ~rps_high,
+        "BigData": (tb_large & m.any_of(svc, engine.BIG_DATA_SERVICES)) | ~tb_large,
+        "SLA": np.where(sla_9999, m.all_of(svc, engine.SLA_9999_SERVICES),
+                        np.where(sla_9995, m.any_of(svc, engine.SLA_9995_SERVICES), True)),
+        # strict_checks tests membership in the full reordered ml_pipeline list, which always holds all 20
+        "MLLifecycle": np.ones(n, dtype=bool),
+    }
+    check_bits = np.zeros(n, dtype=np.uint8)
+    for i, k in enumerate(CHECKS):
+        check_bits |= checks[k].astype(np.uint8) << np.uint8(i)
+
+    return {
+        "profiles": profiles,
+        "required": required,
+        "recommended": recommended,
+        "ml_covered": ml_covered,
+        "checks": checks,
+        "check_bits": check_bits,
+        "confidence": SCORE_LUT[check_bits],
+    }
+
+# --------------------------
+# Capacity sizing over a batch result (see sizing.py): one int64 array per (service, metric)
+# --------------------------
+def _demand_lut(options, values):
+    return np.array([values[v] for v, _ in options], dtype=np.float64)
+
+def size_batch(result, rps, tb, retention, sla):
+    rps, tb, retention, sla = (np.asarray(a) for a in (rps, tb, retention, sla))
+    d = {
+        "rps": _demand_lut(engine.RPS_OPTIONS, sizing.DEMAND["rps"])[rps],
+        "tb": _demand_lut(engine.DATA_TB_OPTIONS, sizing.DEMAND["tb"])[tb],
+        "retention_months": _demand_lut(engine.RETENTION_OPTIONS, sizing.DEMAND["retention_months"])[retention],
+        "replicas": _demand_lut(engine.SLA_OPTIONS, sizing.DEMAND["replicas"])[sla],
+    }
+    m = _Masks(len(rps))
+    svc = result["required"] | result["recommended"]
+    has = {s: m.any_of(svc, REGISTRY.bit(s)) for s in sizing.SIZED_SERVICES + sizing.MODIFIERS}
+    return sizing.size_columns(d, has)
+
+# --------------------------
+# Helpers
+# --------------------------
+def _mask_of(words, i):
+    return sum(int(words[w][i]) << (64 * w) for w in range(len(words)))
+
+# decode one row of a batch result into the same fields engine.evaluate() reports
+def row(result, i):
+    profile_bits = int(result["profiles"][i])
+    ml_bits = int(result["ml_covered"][i])
+    checks = {k: bool(result["checks"][k][i]) for k in CHECKS}
+    return {
+        "profiles": sorted(p for j, p in enumerate(PROFILES) if profile_bits >> j & 1),
+        "required_services": list(REGISTRY.names_of(_mask_of(result["required"], i))),
+        "recommended_services": list(REGISTRY.names_of(_mask_of(result["recommended"], i))),
+        "ml_pipeline": [c for j, c in enumerate(engine.ML_COMPONENTS) if ml_bits >> j & 1]
+                       + [c for j, c in enumerate(engine.ML_COMPONENTS) if not ml_bits >> j & 1],
+        "checks": checks,
+        "confidence": float(result["confidence"][i]),
+        "remediation": engine.remediation(checks),
+    }
+
+# full slider grid (10^10 is too big; pass the sliders you want to sweep and pin the rest)
+def slider_grid(sweep, fixed=None, values=range(engine.PARAM_MIN, engine.PARAM_MAX + 1)):
+    fixed = fixed or {}
+    combos = np.array(list(itertools.product(values, repeat=len(sweep))), dtype=np.int8)
+    n = len(combos)
+    params = {name: combos[:, j] for j, name in enumerate(sweep)}
+    for name in engine.PARAM_NAMES:
+        if name not in params:
+            params[name] = np.full(n, fixed.get(name, engine.PARAM_MIN), dtype=np.int8)
+    return params, n
@@ -0,0 +1,61 @@
+# Throughput of batch.evaluate_batch vs looping the scalar engine functions.
+# Run from the repo root: python benchmarks/bench_batch.py [rows]
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import batch
+import engine
+
+def random_columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    params = {name: rng.integers(1, 11, n, dtype=np.int8) for name in engine.PARAM_NAMES}
+    codes = [rng.integers(0, len(opts), n, dtype=np.int8)
+             for opts in (engine.RPS_OPTIONS, engine.DATA_TB_OPTIONS, engine.RETENTION_OPTIONS, engine.SLA_OPTIONS)]
+    return params, codes
+
+def scalar_loop(params, codes, rows):
+    values = [[v for v, _ in opts] for opts in (engine.RPS_OPTIONS, engine.DATA_TB_OPTIONS, engine.RETENTION_OPTIONS, engine.SLA_OPTIONS)]
+    t0 = time.perf_counter()
+    for i in range(rows):
+        p = {name: int(params[name][i]) for name in engine.PARAM_NAMES}
+        rps, tb, retention, sla = (values[d][codes[d][i]] for d in range(4))
+        profiles = engine.detect_profiles(p, "", rps, tb, retention, sla)
+        required, recommended = engine.compose_services(profiles, rps, tb, retention, sla, p)
+        ml = engine.map_ml_components(required, recommended, p, rps, tb, sla)
+        checks = engine.strict_checks(required, recommended, ml, rps, tb, retention, sla)
+        engine.confidence_score(checks)
+    return (time.perf_counter() - t0) / rows
+
+def vectorised(params, codes, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = batch.evaluate_batch(params, *codes)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(codes[0]), result
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    params, codes = random_columns(n)
+    scalar = scalar_loop(params, codes, min(n, 20000))
+    vector, result = vectorised(params, codes)
+
+    # spot-check equivalence on a sample before reporting numbers
+    values = [[v for v, _ in opts] for opts in (engine.RPS_OPTIONS, engine.DATA_TB_OPTIONS, engine.RETENTION_OPTIONS, engine.SLA_OPTIONS)]
+    for i in range(0, n, max(1, n // 2000)):
+        p = {name: int(params[name][i]) for name in engine.PARAM_NAMES}
+        expected = engine.evaluate(p, *(values[d][codes[d][i]] for d in range(4)))
+        got = batch.row(result, i)
+        assert all(expected[k] == got[k] for k in got), f"batch mismatch at row {i}"
+
+    print(f"rows: {n}")
+    print(f"scalar loop: {1 / scalar:,.0f} configs/s ({scalar * 1e6:.2f} us/config)")
+    print(f"batch:       {1 / vector:,.0f} configs/s ({vector * 1e9:.0f} ns/config)")
+    print(f"speedup:     {scalar / vector:.0f}x")
@@ -0,0 +1,39 @@
+# Cold-start + per-call latency of the headless engine.
+# Run from the repo root: python benchmarks/bench_engine.py
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine
+
+def cold_start(module, repeats=10):
+    # best-of-N wall time for a fresh interpreter that imports `module`, minus a bare interpreter
+    def run(code):
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+            best = min(best, time.perf_counter() - t0)
+        return best
+    return max(0.0, run(f"import {module}") - run("pass"))
+
+def per_call(n=20000):
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    t0 = time.perf_counter()
+    for _ in range(n):
+        engine.evaluate(params, "medium", "large", "long", "slo_99_99", "hipaa / SAP")
+    return (time.perf_counter() - t0) / n
+
+if __name__ == "__main__":
+    print(f"engine import (cold start): {cold_start('engine') * 1e3:.1f} ms")
+    try:
+        import streamlit  # noqa: F401
+        print(f"streamlit import (for comparison): {cold_start('streamlit') * 1e3:.1f} ms")
+    except ImportError:
+        pass
+    print(f"engine.evaluate per call: {per_call() * 1e6:.1f} us")
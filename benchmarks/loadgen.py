@@ -0,0 +1,145 @@
+# Load generator for server.py: keep-alive connections firing specs for a fixed time, then
+# throughput, latency percentiles and the server's cache counters.
+#
+#   python server.py --port 8080 &
+#   python benchmarks/loadgen.py --port 8080 --connections 16 --duration 10
+#   python benchmarks/loadgen.py --spawn --distinct 0 --endpoint report     # own server; every spec new
+#
+# --distinct N cycles over N fixed specs (after the first round they are cache hits); --distinct 0 sends
+# a fresh random spec per request (all misses). --batch N sends N specs per POST /batch instead.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import engine
+from metrics import percentile
+
+def random_spec(rng):
+    return {
+        "params": {name: rng.randint(engine.PARAM_MIN, engine.PARAM_MAX) for name in engine.PARAM_NAMES},
+        "RPS": rng.choice(engine.RPS_OPTIONS)[0],
+        "DATA_TB": rng.choice(engine.DATA_TB_OPTIONS)[0],
+        "RETENTION": rng.choice(engine.RETENTION_OPTIONS)[0],
+        "SLA": rng.choice(engine.SLA_OPTIONS)[0],
+        "brief": rng.choice(["", "hipaa", "sap", "banking RAG / SAP"]),
+    }
+
+def _request(host, path, body):
+    return (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+async def _worker(host, port, next_body, path, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            request = _request(host, path, next_body())
+            t0 = time.perf_counter()
+            writer.write(request)
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def _get(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+async def run(host, port, connections=16, duration=10.0, distinct=64, endpoint="evaluate", batch=0, seed=0):
+    rng = random.Random(seed)
+    pool = [json.dumps(random_spec(rng)).encode("utf-8") for _ in range(distinct)]
+    counter = iter(range(1 << 62))
+
+    def next_spec():
+        return pool[next(counter) % distinct] if distinct else json.dumps(random_spec(rng)).encode("utf-8")
+
+    if batch:
+        path = "/batch"
+        prefix = b'{"endpoint": "' + endpoint.encode() + b'", "specs": ['
+        next_body = lambda: prefix + b",".join(next_spec() for _ in range(batch)) + b"]}"
+    else:
+        path = "/" + endpoint
+        next_body = next_spec
+
+    latencies, errors = [], {}
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+    await asyncio.gather(*(_worker(host, port, next_body, path, deadline, latencies, errors) for _ in range(connections)))
+    elapsed = time.perf_counter() - t0
+    specs = len(latencies) * (batch or 1)
+    return {
+        "requests": len(latencies),
+        "specs": specs,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "specs_per_s": round(specs / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1e3, 3),
+        "p90_ms": round(percentile(latencies, 0.9) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+        "max_ms": round(max(latencies, default=0) * 1e3, 3),
+        "errors": errors,
+        "server": await _get(host, port, "/stats"),
+    }
+
+def spawn_server(port=0, extra=()):
+    # server.py in a subprocess; returns (process, port) once it accepts connections
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "server.py"), "--port", str(port), *extra],
+                            stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("serving on"):
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return proc, int(line.rsplit(":", 1)[1])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Drive server.py and report throughput / tail latency.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--spawn", action="store_true", help="start a server.py on a free port for this run")
+    ap.add_argument("--server-arg", action="append", default=[], help="extra server.py argument with --spawn; repeatable")
+    ap.add_argument("--connections", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds")
+    ap.add_argument("--distinct", type=int, default=64, help="distinct specs cycled over (0 = a new one per request)")
+    ap.add_argument("--endpoint", choices=["evaluate", "report", "dot"], default="evaluate")
+    ap.add_argument("--batch", type=int, default=0, help="specs per POST /batch (0 = one spec per request)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    proc, port = None, args.port
+    if args.spawn:
+        proc, port = spawn_server(0, args.server_arg)
+    try:
+        result = asyncio.run(run(args.host, port, args.connections, args.duration, args.distinct, args.endpoint,
+                                 args.batch, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
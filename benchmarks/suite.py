@@ -0,0 +1,425 @@
+# Reproducible benchmark suite for the architecture engine, with regression tracking.
+#
+#   python benchmarks/suite.py run -o results.json            # run everything, write JSON
+#   python benchmarks/suite.py run --quick --only engine.     # subset, fewer repeats
+#   python benchmarks/suite.py run --update-baseline          # store as benchmarks/baseline.json
+#   python benchmarks/suite.py compare results.json           # vs benchmarks/baseline.json, exit 1 on regression
+#   python benchmarks/suite.py compare new.json --baseline old.json --threshold 0.15
+#
+# Every metric is a median wall time in seconds (lower is better), so comparisons are a plain ratio.
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import engine
+
+SCHEMA = 1
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+# --------------------------
+# Fixed workload: a spread of inputs that exercises every profile and check branch
+# --------------------------
+def workload():
+    cases = []
+    levels = [1, 4, 6, 8, 10]
+    briefs = ["", "hipaa", "sap", "health / SAP"]
+    for i in range(64):
+        params = {name: levels[(i + j) % len(levels)] for j, name in enumerate(engine.PARAM_NAMES)}
+        cases.append((
+            params,
+            engine.RPS_OPTIONS[i % len(engine.RPS_OPTIONS)][0],
+            engine.DATA_TB_OPTIONS[(i // 5) % len(engine.DATA_TB_OPTIONS)][0],
+            engine.RETENTION_OPTIONS[(i // 3) % len(engine.RETENTION_OPTIONS)][0],
+            engine.SLA_OPTIONS[(i // 7) % len(engine.SLA_OPTIONS)][0],
+            briefs[i % len(briefs)],
+        ))
+    return cases
+
+def measure(fn, number, repeats):
+    # median seconds per call of fn() over `repeats` timing runs of `number` calls each
+    fn()
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return statistics.median(samples)
+
+def _cycle(items):
+    state = {"i": 0}
+    def nxt():
+        state["i"] = (state["i"] + 1) % len(items)
+        return items[state["i"]]
+    return nxt
+
+# --------------------------
+# Benchmarks: each takes `quick` and returns {metric name: seconds}
+# --------------------------
+def bench_engine_functions(quick):
+    cases = workload()
+    staged = []
+    for params, rps, tb, retention, sla, brief in cases:
+        profiles = engine.detect_profiles(params, brief, rps, tb, retention, sla)
+        required, recommended = engine.compose_services(profiles, rps, tb, retention, sla, params)
+        ml = engine.map_ml_components(required, recommended, params, rps, tb, sla)
+        checks = engine.strict_checks(required, recommended, ml, rps, tb, retention, sla)
+        staged.append((params, rps, tb, retention, sla, brief, profiles, required, recommended, ml, checks))
+    number, repeats = (500, 3) if quick else (5000, 7)
+    nxt = _cycle(staged)
+    nxt_case = _cycle(cases)
+
+    def detect():
+        p, rps, tb, ret, sla, brief, *_ = nxt()
+        engine.detect_profiles(p, brief, rps, tb, ret, sla)
+    def compose():
+        p, rps, tb, ret, sla, _, profiles, *_ = nxt()
+        engine.compose_services(profiles, rps, tb, ret, sla, p)
+    def ml_map():
+        p, rps, tb, _, sla, _, _, req, rec, *_ = nxt()
+        engine.map_ml_components(req, rec, p, rps, tb, sla)
+    def checks():
+        _, rps, tb, ret, sla, _, _, req, rec, ml, _ = nxt()
+        engine.strict_checks(req, rec, ml, rps, tb, ret, sla)
+    def score():
+        engine.confidence_score(nxt()[-1])
+    def aws_dot():
+        s = nxt()
+        engine.build_aws_dot(s[7], s[8])
+    def ml_dot():
+        engine.build_ml_dot(nxt()[9])
+    def evaluate():
+        engine.evaluate(*nxt_case())
+
+    return {
+        "engine.detect_profiles": measure(detect, number, repeats),
+        "engine.compose_services": measure(compose, number, repeats),
+        "engine.map_ml_components": measure(ml_map, number, repeats),
+        "engine.strict_checks": measure(checks, number, repeats),
+        "engine.confidence_score": measure(score, number, repeats),
+        "dot.build_aws_dot": measure(aws_dot, number, repeats),
+        "dot.build_ml_dot": measure(ml_dot, number, repeats),
+        "engine.evaluate": measure(evaluate, number, repeats),
+    }
+
+def bench_report_json(quick):
+    reports = [engine.evaluate(*case) for case in workload()]
+    nxt = _cycle(reports)
+    number, repeats = (300, 3) if quick else (3000, 7)
+    return {"report.json_dumps": measure(lambda: json.dumps(nxt(), indent=2), number, repeats)}
+
+def bench_sweeps(quick):
+    import eqtable
+    spec = eqtable.derive_classes()
+    table = eqtable.EquivalenceTable(spec, [], None)
+    reps = list(table.representatives())
+    if quick:
+        reps = reps[::16]
+    def sweep():
+        for args in reps:
+            engine.evaluate(*args)
+    out = {"sweep.classes_engine": measure(sweep, 1, 3)}
+
+    try:
+        import numpy as np
+        import batch
+    except ImportError:
+        return out
+    n = 200_000 if quick else 1_000_000
+    rng = np.random.default_rng(0)
+    params = {name: rng.integers(1, 11, n, dtype=np.int8) for name in engine.PARAM_NAMES}
+    codes = [rng.integers(0, len(opts), n, dtype=np.int8)
+             for opts in (engine.RPS_OPTIONS, engine.DATA_TB_OPTIONS, engine.RETENTION_OPTIONS, engine.SLA_OPTIONS)]
+    out["sweep.batch_random"] = measure(
+        lambda: batch.evaluate_batch(params, *codes), 1, 3)
+    result = batch.evaluate_batch(params, *codes)
+    out["sweep.batch_sizing"] = measure(lambda: batch.size_batch(result, *codes), 1, 3)
+    return out
+
+def bench_table_lookup(quick):
+    import eqtable
+    table = eqtable.EquivalenceTable.build()
+    nxt = _cycle(workload())
+    number, repeats = (2000, 3) if quick else (20000, 7)
+    return {"eqtable.lookup": measure(lambda: table.lookup(*nxt()), number, repeats)}
+
+def synthetic_pack(n, seed=0):
+    # n extra rules shaped like compliance-regime / region / threshold packs
+    rng = random.Random(seed)
+    pack = {"profiles": [], "services": []}
+    for i in range(n):
+        if i % 3 < 2:
+            word = ("regime-" if i % 3 == 0 else "region-") + str(i)
+            pack["profiles"].append({"when": [["brief", "contains_any", [word]]], "profile": f"Pack-{i}"})
+            pack["services"].append({"when": [["profiles", "has", f"Pack-{i}"]], "required": [f"Pack Service {i % 200}"]})
+        else:
+            pack["services"].append({
+                "when": [[rng.choice(engine.PARAM_NAMES), ">=", rng.randint(2, 10)],
+                         ["sla", "in", [rng.choice(engine.SLA_OPTIONS)[0]]],
+                         ["tb", "in", [rng.choice(engine.DATA_TB_OPTIONS)[0]]]],
+                "recommended": [f"Pack Service {i % 200}"],
+            })
+    return pack
+
+def bench_rule_scaling(quick):
+    # match cost of the compiled rule set as packs grow (should stay roughly flat)
+    import rules
+    cases = workload()
+    for i, case in enumerate(cases):
+        if i % 4 == 0:
+            cases[i] = case[:5] + (case[5] + f" regime-{i * 3} region-{i * 3 + 1}",)
+    nxt = _cycle(cases)
+    number, repeats = (500, 3) if quick else (5000, 7)
+    out = {}
+    for n in ((0, 1000) if quick else (0, 1000, 10000)):
+        rs = rules.RuleSet([engine.builtin_rules(), synthetic_pack(n)], components=engine.ML_COMPONENTS,
+                           param_names=engine.PARAM_NAMES)
+        def run():
+            params, rps, tb, retention, sla, brief = nxt()
+            profiles = rs.profiles(params, brief, rps, tb, retention, sla)
+            required, recommended = rs.services(profiles, rps, tb, retention, sla, params)
+            svc = required.mask | recommended.mask
+            ml = rs.ml_pipeline(svc, params, rps, tb, sla)
+            rs.remediation(rs.checks(svc, ml, rps, tb, retention, sla))
+        out[f"rules.match_{n}"] = measure(run, number, repeats)
+    return out
+
+def bench_latency_simulation(quick):
+    if importlib.util.find_spec("numpy") is None:
+        return {}
+    import latency
+    params = dict.fromkeys(engine.PARAM_NAMES, 9)
+    report = engine.evaluate(params, "very_low", "large", "long", "slo_99_9")
+    n = 200_000 if quick else latency.SAMPLES
+    # a fresh seed per call so the simulation memo never answers
+    seeds = iter(range(1_000_000))
+    return {"latency.simulate": measure(lambda: latency.simulate_report(report, n, next(seeds)), 1, 3)}
+
+def bench_document_tagging(quick):
+    # one streaming scan of a synthetic requirements document; the two dictionary sizes should stay close
+    import tagging
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+    vocab += ["hipaa", "patient", "sap", "s/4hana", "pci-dss", "real-time"]
+    doc = " ".join(rng.choice(vocab) for _ in range(300_000 if quick else 1_500_000))
+    bulk = ["".join(rng.choice(letters) for _ in range(rng.randint(6, 14))) for _ in range(10000)]
+    out = {}
+    for name, extra in (("default", []), ("10k_terms", bulk)):
+        tagger = tagging.Tagger(dict(tagging.DICTIONARY, bulk=extra))
+        out[f"tagging.scan_{name}"] = measure(lambda: tagger.scan(doc), 1, 3)
+    return out
+
+def bench_report_store(quick):
+    # append the workload's reports many times over, then query / get / diff against the full store
+    import tempfile
+    from store import ReportStore
+    reports = [engine.evaluate(*case) for case in workload()]
+    n = 50_000 if quick else 200_000
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reports.db")
+        store = ReportStore(path)
+        batch = [reports[i % len(reports)] for i in range(10000)]
+        samples = []
+        for i in range(n // len(batch)):
+            t0 = time.perf_counter()
+            store.add_many(batch, f"project{i % 4}")
+            samples.append((time.perf_counter() - t0) / len(batch))
+        # median over the appended batches, like the repeated timings
+        out["store.add_per_report"] = statistics.median(samples)
+        filters = dict(services=["OpenSearch"], sla="slo_99_99", confidence_below=100)
+        def cold_query():
+            # a fresh connection: nothing cached yet
+            fresh = ReportStore(path)
+            fresh.count(**filters)
+            fresh.close()
+        out["store.query_cold"] = measure(cold_query, 5, 5)
+        out["store.query_warm"] = measure(lambda: store.query(limit=100, **filters), 100, 5)
+        out["store.get"] = measure(lambda: store.get(n // 2), 100, 5)
+        out["store.diff"] = measure(lambda: store.diff(store.run_id("project1", 3), store.run_id("project1", n // 8)), 100, 5)
+        store.close()
+    return out
+
+def bench_portfolio(quick):
+    # a 10k-row CSV through parsing, the batch evaluation, the aggregates and one table page
+    if importlib.util.find_spec("numpy") is None:
+        return {}
+    import portfolio
+    rng = random.Random(0)
+    lines = [",".join(f'"{c}"' if "," in c else c for c in portfolio.COLUMNS)]
+    for i in range(10000):
+        case = workload()[rng.randrange(64)]
+        lines.append(",".join([f"p{i}"] + [str(case[0][name]) for name in engine.PARAM_NAMES] + list(case[1:5]) + [case[5]]))
+    text = "\n".join(lines) + "\n"
+    def run():
+        result = portfolio.Portfolio(*portfolio.read_csv(text)[:2])
+        result.summary()
+        result.heatmap()
+        result.rows(result.order("confidence")[:50])
+    return {"portfolio.csv_10k": measure(run, 1, 3 if quick else 5)}
+
+def bench_http_server(quick):
+    # server.py in a subprocess driven by loadgen.py: seconds per request (1 / throughput) and p99 latency
+    import asyncio
+    import loadgen
+    proc, port = loadgen.spawn_server(0, ["--latency-samples", "20000"])
+    out = {}
+    try:
+        duration = 2.0 if quick else 5.0
+        for name, distinct in (("cached", 64), ("uncached", 0)):
+            r = asyncio.run(loadgen.run("127.0.0.1", port, 16, duration, distinct))
+            out[f"server.{name}_request"] = r["seconds"] / max(r["requests"], 1)
+            out[f"server.{name}_p99"] = r["p99_ms"] / 1e3
+    finally:
+        proc.terminate()
+        proc.wait()
+    return out
+
+def bench_verification(quick):
+    # verify.py's per-class cost (evaluate twice + incremental + second member + rule-by-rule pass);
+    # a full sweep costs this x ClassKeyer size / cores
+    import verify
+    os.environ.setdefault("SOURCE_DATE_EPOCH", verify.EPOCH)
+    verify._init_worker()
+    stride = 997 if quick else 251
+    size = verify._state.keyer.size
+    classes = len(range(0, size, stride))
+    return {"verify.class": measure(lambda: verify.verify_chunk((0, size, stride)), 1, 3) / classes}
+
+def bench_streamlit_rerun(quick):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {}
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+    values = [1, 8]
+    samples = []
+    for i in range(3 if quick else 10):
+        at.sidebar.slider[3].set_value(values[i % 2])
+        t0 = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t0)
+        if at.exception:
+            raise RuntimeError(f"app raised during benchmark: {at.exception}")
+    return {"streamlit.rerun": statistics.median(samples)}
+
+# group -> (benchmark, metric name prefixes it produces)
+BENCHMARKS = {
+    "engine": (bench_engine_functions, ["engine.", "dot."]),
+    "report": (bench_report_json, ["report."]),
+    "sweep": (bench_sweeps, ["sweep."]),
+    "eqtable": (bench_table_lookup, ["eqtable."]),
+    "rules": (bench_rule_scaling, ["rules."]),
+    "latency": (bench_latency_simulation, ["latency."]),
+    "tagging": (bench_document_tagging, ["tagging."]),
+    "store": (bench_report_store, ["store."]),
+    "portfolio": (bench_portfolio, ["portfolio."]),
+    "server": (bench_http_server, ["server."]),
+    "verify": (bench_verification, ["verify."]),
+    "streamlit": (bench_streamlit_rerun, ["streamlit."]),
+}
+
+# --------------------------
+# Results file + comparison
+# --------------------------
+def run(only=None, quick=False):
+    metrics = {}
+    for fn, prefixes in BENCHMARKS.values():
+        if only and not any(p.startswith(o) or o.startswith(p) for p in prefixes for o in only):
+            continue
+        for name, seconds in fn(quick).items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            metrics[name] = {"seconds": seconds}
+            print(f"{name:<32} {seconds * 1e6:>14.3f} us", file=sys.stderr)
+    return {
+        "schema": SCHEMA,
+        "created": datetime.utcnow().isoformat() + "Z",
+        "quick": quick,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": dict(sorted(metrics.items())),
+    }
+
+def compare(baseline, current, threshold):
+    rows, regressions = [], []
+    for name, cur in sorted(current["metrics"].items()):
+        base = baseline["metrics"].get(name)
+        if base is None:
+            rows.append((name, None, cur["seconds"], None, "new"))
+            continue
+        ratio = cur["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        status = "REGRESSION" if ratio > 1 + threshold else ("improved" if ratio < 1 - threshold else "ok")
+        if status == "REGRESSION":
+            regressions.append(name)
+        rows.append((name, base["seconds"], cur["seconds"], ratio, status))
+    for name in sorted(set(baseline["metrics"]) - set(current["metrics"])):
+        rows.append((name, baseline["metrics"][name]["seconds"], None, None, "missing"))
+    return rows, regressions
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("schema") != SCHEMA:
+        raise SystemExit(f"{path}: unsupported benchmark schema {data.get('schema')!r}")
+    return data
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark suite for the architecture engine.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="run the benchmarks and write JSON results")
+    r.add_argument("-o", "--output", default="-", help="results file (default: stdout)")
+    r.add_argument("--quick", action="store_true", help="fewer iterations / smaller sweeps")
+    r.add_argument("--only", nargs="*", help="metric name prefixes to keep, e.g. engine. dot.")
+    r.add_argument("--update-baseline", action="store_true", help=f"also write {os.path.relpath(DEFAULT_BASELINE, ROOT)}")
+    c = sub.add_parser("compare", help="compare results against a baseline; exit 1 on regression")
+    c.add_argument("current")
+    c.add_argument("--baseline", default=DEFAULT_BASELINE)
+    c.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown ratio (default 0.10 = 10%%)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "run":
+        results = run(args.only, args.quick)
+        text = json.dumps(results, indent=2) + "\n"
+        if args.output == "-":
+            sys.stdout.write(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text)
+        if args.update_baseline:
+            with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+                f.write(text)
+        return 0
+
+    for path in (args.baseline, args.current):
+        if not os.path.isfile(path):
+            hint = "; record one with 'run --update-baseline'" if path == args.baseline else ""
+            c.error(f"no such results file: {path}{hint}")
+    baseline, current = _load(args.baseline), _load(args.current)
+    if baseline.get("quick") != current.get("quick"):
+        print("warning: comparing quick and full runs", file=sys.stderr)
+    rows, regressions = compare(baseline, current, args.threshold)
+    fmt = lambda v: "-" if v is None else f"{v * 1e6:.3f}"
+    print(f"{'metric':<32} {'baseline us':>14} {'current us':>14} {'ratio':>7}  status")
+    for name, base, cur, ratio, status in rows:
+        print(f"{name:<32} {fmt(base):>14} {fmt(cur):>14} {'-' if ratio is None else f'{ratio:.2f}':>7}  {status}")
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# Streaming JSONL batch CLI: one requirement spec per input line -> one report per output line.
+#
+#   python cli.py specs.jsonl -o reports.jsonl --workers 8 --ordered
+#   cat specs.jsonl | python cli.py --table eqtable.bin > reports.jsonl
+#
+# Input lines look like the report's own inputs:
+#   {"params": {"Data Volume": 8, ...}, "RPS": "high", "DATA_TB": "large", "RETENTION": "long", "SLA": "slo_99_9", "brief": "..."}
+# (the four dropdowns may also sit under "deterministic_inputs"; missing sliders/dropdowns take the UI defaults).
+# "documents": ["req.md", ...] are scanned for dictionary terms (tagging.py); their tags join the brief the rules
+# read, the report keeps the brief as given and lists them under "tags" (counts under "document_tags").
+# Output lines are the same dict the "Download JSON report" button produces; an input "id" is echoed back,
+# and lines that fail to parse produce {"error": ..., "line": n} instead of stopping the run.
+# Memory stays constant: input is read lazily and at most --inflight chunks are queued at any time.
+# --store reports.db --project NAME also appends every report to a local report store (store.py).
+
+import argparse
+import json
+import os
+import sys
+import threading
+from multiprocessing import Pool
+
+import engine
+import latency
+import sizing
+import tagging
+from store import ReportStore
+
+DROPDOWN_SPECS = [
+    ("RPS", engine.RPS_OPTIONS, engine.RPS_DEFAULT),
+    ("DATA_TB", engine.DATA_TB_OPTIONS, engine.DATA_TB_DEFAULT),
+    ("RETENTION", engine.RETENTION_OPTIONS, engine.RETENTION_DEFAULT),
+    ("SLA", engine.SLA_OPTIONS, engine.SLA_DEFAULT),
+]
+
+_evaluate = engine.evaluate
+_latency_samples = 0
+
+def _init_worker(table_path, rule_packs=(), sizing_table=None, latency_samples=0, dictionaries=()):
+    global _evaluate, _latency_samples
+    _latency_samples = latency_samples
+    # merging a dictionary twice is a no-op, so forked workers may repeat what main() loaded
+    for path in dictionaries:
+        tagging.load_dictionary(path)
+    # forked workers inherit the packs main() installed; spawned ones load them here
+    if rule_packs and not engine.RULE_PACKS:
+        for path in rule_packs:
+            engine.load_rule_pack(path)
+    if sizing_table:
+        sizing.load_table(sizing_table)
+    if table_path:
+        import eqtable
+        _evaluate = eqtable.EquivalenceTable.load(table_path).evaluate
+
+def parse_spec(spec):
+    if not isinstance(spec, dict):
+        raise ValueError("spec must be a JSON object")
+    params = {}
+    given = spec.get("params", {})
+    if not isinstance(given, dict):
+        raise ValueError("params must be an object")
+    for name in engine.PARAM_NAMES:
+        value = given.get(name, engine.PARAM_MIN)
+        if isinstance(value, bool) or not isinstance(value, int) or not engine.PARAM_MIN <= value <= engine.PARAM_MAX:
+            raise ValueError(f"param {name!r} must be an integer in {engine.PARAM_MIN}..{engine.PARAM_MAX}")
+        params[name] = value
+    inputs = spec.get("deterministic_inputs", {})
+    if not isinstance(inputs, dict):
+        raise ValueError("deterministic_inputs must be an object")
+    inputs = dict(inputs)
+    inputs.update({k: spec[k] for k, _, _ in DROPDOWN_SPECS if k in spec})
+    dropdowns = []
+    for key, options, default in DROPDOWN_SPECS:
+        value = inputs.get(key, options[default][0])
+        if value not in [v for v, _ in options]:
+            raise ValueError(f"{key} must be one of {[v for v, _ in options]}")
+        dropdowns.append(value)
+    brief = spec.get("brief", "")
+    if not isinstance(brief, str):
+        raise ValueError("brief must be a string")
+    documents = spec.get("documents", [])
+    if not isinstance(documents, list) or not all(isinstance(d, str) for d in documents):
+        raise ValueError("documents must be a list of file paths")
+    return (params, *dropdowns, brief)
+
+def document_tags(spec):
+    documents = spec.get("documents")
+    if not documents:
+        return None
+    return tagging.merge(tagging.scan_file(path) for path in documents)["tags"]
+
+def process_line(lineno, line):
+    try:
+        spec = json.loads(line)
+        args = parse_spec(spec)
+        tags = document_tags(spec)
+        brief = args[-1]
+        if tags is not None:
+            args = args[:-1] + (tagging.tag_brief(brief, tags),)
+        report = _evaluate(*args)
+        if tags is not None:
+            tagging.apply_tags(report, brief, tags)
+            report["document_tags"] = tags
+        if _latency_samples:
+            report["latency"] = latency.simulate_report(report, _latency_samples)
+        if "id" in spec:
+            report["id"] = spec["id"]
+    except Exception as e:
+        report = {"error": str(e), "line": lineno}
+    return json.dumps(report)
+
+def process_chunk(chunk):
+    return [process_line(lineno, line) for lineno, line in chunk]
+
+def read_chunks(stream, size):
+    chunk = []
+    for lineno, line in enumerate(stream, 1):
+        if line.strip():
+            chunk.append((lineno, line))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+class _StoreWriter:
+    # tees report lines into a ReportStore (store.py) in batches; error lines are not stored
+    def __init__(self, out, store, project, batch=1000):
+        self.out, self.store, self.project, self.batch = out, store, project, batch
+        self.pending = []
+
+    def write(self, text):
+        self.out.write(text)
+        report = json.loads(text)
+        if "error" not in report:
+            self.pending.append(report)
+            if len(self.pending) >= self.batch:
+                self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.store.add_many(self.pending, self.project)
+            self.pending = []
+
+def run(stream, out, workers=None, ordered=False, chunk_size=256, inflight=None, table_path=None, rule_packs=(),
+        sizing_table=None, latency_samples=0, dictionaries=(), store=None, project="default"):
+    if store is not None:
+        out = _StoreWriter(out, store, project)
+        try:
+            return run(stream, out, workers, ordered, chunk_size, inflight, table_path, rule_packs, sizing_table,
+                       latency_samples, dictionaries)
+        finally:
+            out.flush()
+    workers = workers or os.cpu_count() or 1
+    chunks = read_chunks(stream, chunk_size)
+    count = 0
+    if workers == 1:
+        _init_worker(table_path, rule_packs, sizing_table, latency_samples, dictionaries)
+        for chunk in chunks:
+            for line in process_chunk(chunk):
+                out.write(line + "\n")
+                count += 1
+        return count
+
+    # Pool.imap drains its input eagerly; the semaphore caps queued chunks so memory stays flat
+    slots = threading.BoundedSemaphore(inflight or workers * 4)
+    def throttled():
+        for chunk in chunks:
+            slots.acquire()
+            yield chunk
+
+    initargs = (table_path, tuple(rule_packs), sizing_table, latency_samples, tuple(dictionaries))
+    with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        for lines in mapper(process_chunk, throttled()):
+            slots.release()
+            for line in lines:
+                out.write(line + "\n")
+                count += 1
+    return count
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stream architecture reports for JSONL requirement specs.")
+    ap.add_argument("input", nargs="?", default="-", help="JSONL file of specs (default: stdin)")
+    ap.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count; 1 = in-process)")
+    ap.add_argument("--ordered", action="store_true", help="emit reports in input order")
+    ap.add_argument("--chunk-size", type=int, default=256, help="specs per task sent to a worker")
+    ap.add_argument("--inflight", type=int, default=None, help="max chunks queued at once (default: 4 x workers)")
+    ap.add_argument("--table", default=None, help="serve from a prebuilt equivalence table (see eqtable.py)")
+    ap.add_argument("--rules", action="append", default=[], help="extra JSON rule pack (see rules.py); repeatable")
+    ap.add_argument("--sizing-table", default=None, help="JSON overrides for the capacity sizing tables (see sizing.py)")
+    ap.add_argument("--latency-samples", type=int, default=0,
+                    help="add a simulated latency section with this many requests (see latency.py; default: off)")
+    ap.add_argument("--dictionary", action="append", default=[],
+                    help="extra JSON {tag: [terms]} for scanning spec documents (see tagging.py); repeatable")
+    ap.add_argument("--store", default=None, help="also append the reports to this report store (see store.py)")
+    ap.add_argument("--project", default="default", help="project the stored reports belong to (with --store)")
+    args = ap.parse_args(argv)
+    for path in args.rules:
+        try:
+            engine.load_rule_pack(path)
+        except (OSError, ValueError) as e:
+            ap.error(f"{path}: {e}")
+    if args.sizing_table:
+        try:
+            sizing.load_table(args.sizing_table)
+        except (OSError, ValueError) as e:
+            ap.error(f"{args.sizing_table}: {e}")
+    for path in args.dictionary:
+        try:
+            tagging.load_dictionary(path)
+        except (OSError, ValueError) as e:
+            ap.error(str(e))
+
+    if args.table:
+        # fail here rather than in every worker: a table built for other rules would drop the packs' effects
+        import eqtable
+        try:
+            eqtable.EquivalenceTable.load(args.table)
+        except (OSError, ValueError) as e:
+            ap.error(f"{args.table}: {e}")
+
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    store = ReportStore(args.store) if args.store else None
+    try:
+        n = run(stream, out, args.workers, args.ordered, args.chunk_size, args.inflight, args.table, args.rules,
+                args.sizing_table, args.latency_samples, args.dictionary, store, args.project)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+        if store is not None:
+            store.close()
+    print(f"{n} reports written", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Content-addressed cache for server-side rendered architecture diagrams.
+#
+# build_aws_dot / build_ml_dot only depend on the final service set and ml_pipeline, so the same
+# few hundred DOT strings come up again and again. Rendered images are keyed by a SHA-256 of
+# (format, DOT text), kept in a byte-capped in-memory LRU shared by all sessions, and optionally
+# persisted to a disk tier so restarts and other processes reuse earlier layouts.
+# Rendering uses the local graphviz `dot` binary; `available` is False when it is not installed.
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+
+from metrics import METRICS
+
+FORMATS = {"svg": "image/svg+xml", "png": "image/png"}
+
+def render_with_dot(dot, fmt, binary="dot", timeout=30):
+    proc = subprocess.run([binary, f"-T{fmt}"], input=dot.encode("utf-8"), capture_output=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(f"graphviz failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return proc.stdout
+
+def diagram_key(dot, fmt):
+    return hashlib.sha256(f"{fmt}\n{dot}".encode("utf-8")).hexdigest()
+
+class DiagramCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, renderer=None, metrics=METRICS):
+        self.metrics = metrics
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.renderer = renderer
+        if renderer is None:
+            binary = shutil.which("dot")
+            self.renderer = (lambda dot, fmt: render_with_dot(dot, fmt, binary)) if binary else None
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # per-key locks so concurrent sessions asking for the same new diagram lay it out once
+        self._pending = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @property
+    def available(self):
+        return self.renderer is not None
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def _remember(self, key, data):
+        with self._lock:
+            if key in self._items:
+                return
+            if len(data) > self.max_bytes:
+                return
+            self._items[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self._bytes -= len(old)
+
+    def _disk_path(self, key, fmt):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.{fmt}")
+
+    def _read_disk(self, key, fmt):
+        try:
+            with open(self._disk_path(key, fmt), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, fmt, data):
+        path = self._disk_path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write-then-rename so readers in other processes never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def get(self, dot, fmt="svg"):
+        key = diagram_key(dot, fmt)
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                self.metrics.inc("cache_hits", cache="diagram")
+                return data
+        return None
+
+    def render(self, dot, fmt="svg"):
+        if fmt not in FORMATS:
+            raise ValueError(f"unsupported format {fmt!r}; expected one of {sorted(FORMATS)}")
+        data = self.get(dot, fmt)
+        if data is not None:
+            return data
+        key = diagram_key(dot, fmt)
+        with self._lock:
+            pending = self._pending.setdefault(key, threading.Lock())
+        with pending:
+            # another thread may have finished the same layout while we waited
+            with self._lock:
+                data = self._items.get(key)
+                if data is not None:
+                    self.hits += 1
+                    self.metrics.inc("cache_hits", cache="diagram")
+            if data is None and self.disk_dir:
+                data = self._read_disk(key, fmt)
+                if data is not None:
+                    self.disk_hits += 1
+                    self.metrics.inc("cache_hits", cache="diagram_disk")
+            if data is None:
+                if self.renderer is None:
+                    raise RuntimeError("graphviz `dot` binary not found; install graphviz to render diagrams server-side")
+                self.misses += 1
+                self.metrics.inc("cache_misses", cache="diagram")
+                with self.metrics.stage("graph_rendering"):
+                    data = self.renderer(dot, fmt)
+                if self.disk_dir:
+                    self._write_disk(key, fmt, data)
+            self._remember(key, data)
+        with self._lock:
+            self._pending.pop(key, None)
+        return data
+
+    def stats(self):
+        return {
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
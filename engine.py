@@ -0,0 +1,471 @@
+# AI Architect decision engine — pure Python, no Streamlit / graphviz imports.
+# app.py is a thin UI over this module; pipelines can import it directly and call evaluate().
+
+import os
+from datetime import datetime
+
+import sizing
+from rules import RuleSet, load_pack
+from services import REGISTRY, ServiceSet
+
+S = REGISTRY.mask
+
+# --------------------------
+# Inputs: 10 sliders (1..10) + four deterministic dropdowns
+# --------------------------
+PARAM_SLIDERS = [
+    ("Data Volume", "Data Volume (1=GB .. 10=PB)"),
+    ("Data Variety", "Data Variety (1=structured .. 10=multi-modal)"),
+    ("Real-Time Requirement", "Real-Time (1=batch .. 10=real-time)"),
+    ("Model Complexity", "Model Complexity (1=basic .. 10=GenAI)"),
+    ("Scalability Need", "Scalability Need (1=small .. 10=global)"),
+    ("Security & Compliance", "Security (1=low .. 10=HIPAA/Finance)"),
+    ("Integration Needs", "Integration (1=standalone .. 10=ERP/SAP)"),
+    ("Cost Sensitivity", "Cost Sensitivity (1=perf .. 10=cost-saving)"),
+    ("Automation (CI/CD)", "Automation (1=manual .. 10=full CI/CD)"),
+    ("User Experience", "UX (1=API .. 10=rich app)"),
+]
+PARAM_NAMES = [name for name, _ in PARAM_SLIDERS]
+PARAM_MIN, PARAM_MAX = 1, 10
+
+RPS_OPTIONS = [
+    ("very_low", "Very low (<=10 RPS)"),
+    ("low", "Low (<=100 RPS)"),
+    ("medium", "Medium (<=1k RPS)"),
+    ("high", "High (<=10k RPS)"),
+    ("very_high", "Very high (>10k RPS)")
+]
+
+DATA_TB_OPTIONS = [
+    ("tiny", "< 0.1 TB"),
+    ("small", "0.1 - 1 TB"),
+    ("medium", "1 - 10 TB"),
+    ("large", "10 - 100 TB"),
+    ("huge", "> 100 TB")
+]
+
+RETENTION_OPTIONS = [
+    ("short", "30 days"),
+    ("medium", "6 months"),
+    ("long", "3 years"),
+    ("archive", "Archive (>3 years)")
+]
+
+SLA_OPTIONS = [
+    ("best_effort", "Best-effort (no SLA)"),
+    ("slo_99_9", "SLO 99.9%"),
+    ("slo_99_95", "SLO 99.95%"),
+    ("slo_99_99", "SLO 99.99%")
+]
+
+# UI defaults (index into the option lists above)
+RPS_DEFAULT, DATA_TB_DEFAULT, RETENTION_DEFAULT, SLA_DEFAULT = 1, 2, 1, 1
+
+# --------------------------
+# Profile detection improved using deterministic dropdowns and sliders
+# --------------------------
+# Rules are data (see rules.py); an `or` is written as one rule per alternative.
+PROFILE_RULES = [
+    # GraphRAG / GenAI if model complexity high + data variety high
+    {"when": [["Model Complexity", ">=", 8], ["Data Variety", ">=", 6]], "profile": "GraphRAG-GenAI"},
+    # streaming if real-time or RPS high
+    {"when": [["Real-Time Requirement", ">=", 7]], "profile": "RealTime-Streaming"},
+    {"when": [["rps", "in", ["high", "very_high"]]], "profile": "RealTime-Streaming"},
+    # big data profile
+    {"when": [["tb", "in", ["large", "huge"]]], "profile": "BigData-Lakehouse"},
+    {"when": [["Data Volume", ">=", 8]], "profile": "BigData-Lakehouse"},
+    # compliance
+    {"when": [["Security & Compliance", ">=", 8]], "profile": "Compliance-High"},
+    {"when": [["brief", "contains_any", ["health", "hipaa"]]], "profile": "Compliance-High"},
+    # ERP / SAP
+    {"when": [["Integration Needs", ">=", 8]], "profile": "ERP-Integrated"},
+    {"when": [["brief", "contains_any", ["sap"]]], "profile": "ERP-Integrated"},
+    # cost sensitive
+    {"when": [["Cost Sensitivity", ">=", 8]], "profile": "Cost-Optimized"},
+    # SLA constraints
+    {"when": [["sla", "in", ["slo_99_99"]]], "profile": "High-Availability"},
+    {"when": [["sla", "in", ["slo_99_95"]]], "profile": "HA-Redundant"},
+    # nothing else matched
+    {"when": [], "profile": "Baseline-RAG", "fallback": True},
+]
+
+def detect_profiles(params, brief_text, rps, tb, retention, sla):
+    return RULESET.profiles(params, brief_text, rps, tb, retention, sla)
+
+# --------------------------
+# Profile templates (deterministic rules)
+# --------------------------
+PROFILE_TEMPLATES = {
+    "GraphRAG-GenAI": {
+        "required": ["S3", "Glue", "Athena", "OpenSearch", "Neptune", "SageMaker", "Bedrock", "Step Functions", "API Gateway", "IAM", "KMS", "CloudWatch"],
+        "recommended": ["SageMaker Model Registry", "SageMaker Model Monitor", "ECS Fargate", "CloudFront", "Macie", "GuardDuty"]
+    },
+    "RealTime-Streaming": {
+        "required": ["Kinesis", "MSK", "Lambda", "DynamoDB", "API Gateway", "IAM", "CloudWatch", "SQS"],
+        "recommended": ["Glue", "S3", "OpenSearch", "SageMaker"]
+    },
+    "BigData-Lakehouse": {
+        "required": ["S3", "Glue", "Athena", "EMR", "Redshift", "IAM", "KMS"],
+        "recommended": ["Lake Formation", "Glue Data Catalog", "S3 Intelligent-Tiering"]
+    },
+    "Compliance-High": {
+        "required": ["IAM", "KMS", "VPC", "Macie", "GuardDuty", "CloudTrail", "S3 Object Lock"],
+        "recommended": ["AWS Config", "Lake Formation"]
+    },
+    "ERP-Integrated": {
+        "required": ["AppFlow", "Lambda", "API Gateway", "Step Functions", "S3"],
+        "recommended": ["DynamoDB", "Glue"]
+    },
+    "Cost-Optimized": {
+        "required": ["S3", "S3 Intelligent-Tiering", "Glue", "Athena"],
+        "recommended": ["Spot Instances", "SageMaker Batch Transform"]
+    },
+    "High-Availability": {
+        "required": ["Multi-AZ", "ECS Fargate", "ALB", "AutoScaling", "Route53", "CloudFront"],
+        "recommended": ["Provisioned Concurrency", "Multi-Region Replication"]
+    },
+    "HA-Redundant": {
+        "required": ["Multi-AZ", "AutoScaling", "Route53"],
+        "recommended": ["ALB", "Read Replicas"]
+    },
+    "Baseline-RAG": {
+        "required": ["S3", "Glue", "OpenSearch", "SageMaker", "API Gateway", "Lambda", "IAM", "CloudWatch"],
+        "recommended": ["SageMaker Model Registry", "SageMaker Model Monitor", "Step Functions"]
+    }
+}
+
+# Templates as (required, recommended) bitmasks; call compile_templates() again after editing PROFILE_TEMPLATES
+PROFILE_MASKS = {}
+
+def compile_templates():
+    PROFILE_MASKS.clear()
+    for p, tmpl in PROFILE_TEMPLATES.items():
+        PROFILE_MASKS[p] = (S(tmpl.get("required", [])), S(tmpl.get("recommended", [])))
+    compile_rules()
+
+RPS_SCALE_REQUIRED = S(["API Gateway", "AutoScaling", "ECS Fargate", "CloudFront"])
+RPS_SCALE_RECOMMENDED = S(["Provisioned Concurrency"])
+TB_LARGE_REQUIRED = S(["Redshift", "EMR", "Glue", "S3"])
+TB_LARGE_RECOMMENDED = S(["Parquet", "Partitioning", "S3 Intelligent-Tiering"])
+TB_MEDIUM_REQUIRED = S(["S3", "Glue", "Athena"])
+TB_SMALL_REQUIRED = S(["S3"])
+RETENTION_LONG_RECOMMENDED = S(["S3 Glacier", "S3 Lifecycle"])
+RETENTION_ARCHIVE_REQUIRED = S(["S3 Glacier", "S3 Object Lock"])
+SLA_9999_REQUIRED = S(["Multi-AZ", "Route53", "ECS Fargate"])
+SLA_9999_RECOMMENDED = S(["Multi-Region Replication"])
+SLA_9995_REQUIRED = S(["Multi-AZ", "AutoScaling"])
+COMPLEX_MODEL_REQUIRED = S(["SageMaker", "SageMaker Training", "SageMaker Model Registry", "SageMaker Model Monitor"])
+COMPLEX_MODEL_RECOMMENDED = S(["EC2 GPU", "SageMaker Distributed"])
+STORAGE_CORE = S(["S3"])
+COST_SAVING_RECOMMENDED = S(["Spot Instances", "S3 Intelligent-Tiering"])
+
+# Service rules on top of the profile templates (one rule per template is added by builtin_rules()).
+# Every fired rule adds its masks; recommended excludes anything already required.
+SERVICE_RULES = [
+    # Adjustments based on RPS: prefer autoscaling and managed endpoints
+    {"when": [["rps", "in", ["high", "very_high", "medium"]]], "required": RPS_SCALE_REQUIRED, "recommended": RPS_SCALE_RECOMMENDED},
+    # Adjustments based on dataset TB
+    {"when": [["tb", "in", ["large", "huge"]]], "required": TB_LARGE_REQUIRED, "recommended": TB_LARGE_RECOMMENDED},
+    {"when": [["tb", "in", ["medium"]]], "required": TB_MEDIUM_REQUIRED},
+    {"when": [["tb", "not_in", ["large", "huge", "medium"]]], "required": TB_SMALL_REQUIRED},
+    # retention
+    {"when": [["retention", "in", ["long"]]], "recommended": RETENTION_LONG_RECOMMENDED},
+    {"when": [["retention", "in", ["archive"]]], "required": RETENTION_ARCHIVE_REQUIRED},
+    # SLA
+    {"when": [["sla", "in", ["slo_99_99"]]], "required": SLA_9999_REQUIRED, "recommended": SLA_9999_RECOMMENDED},
+    {"when": [["sla", "in", ["slo_99_95"]]], "required": SLA_9995_REQUIRED},
+    # model complexity tuning
+    {"when": [["Model Complexity", ">=", 8]], "required": COMPLEX_MODEL_REQUIRED, "recommended": COMPLEX_MODEL_RECOMMENDED},
+    # ensure storage core
+    {"when": [], "required": STORAGE_CORE},
+    # cost sensitivity reductions
+    {"when": [["Cost Sensitivity", ">=", 8]], "recommended": COST_SAVING_RECOMMENDED},
+]
+
+# Compose required + recommended services deterministically from detected profiles and dropdowns.
+# Returns two ServiceSets (recommended excludes anything already required).
+def compose_services(profiles, rps, tb, retention, sla, params):
+    return RULESET.services(profiles, rps, tb, retention, sla, params)
+
+# --------------------------
+# Map to 20 ML components (deterministic coverage)
+# --------------------------
+ML_COMPONENTS = [
+    "Data Ingestion", "Data Storage", "Data Preprocessing", "Feature Engineering", "Data Labeling", "Data Versioning",
+    "Problem Statement", "Model Selection", "Model Training", "Hyperparameter Tuning", "Model Evaluation", "Model Registry",
+    "Model Packaging", "Model Deployment", "API/Serving Layer", "Inference Service", "Model Monitoring", "Feedback Loop",
+    "Orchestration", "Model Retraining"
+]
+
+GLUE = S(["Glue"])
+MODEL_REGISTRY = S(["SageMaker Model Registry"])
+
+ML_RULES = [
+    # Data / modeling / deployment stages that are always planned (retraining included either way)
+    {"when": [], "components": [
+        "Data Ingestion", "Data Storage", "Problem Statement", "Model Selection", "Model Training",
+        "Hyperparameter Tuning", "Model Evaluation", "Model Packaging", "Model Deployment", "API/Serving Layer",
+        "Inference Service", "Model Monitoring", "Feedback Loop", "Orchestration", "Model Retraining"]},
+    {"when": [["services", "has_any", GLUE]], "components": ["Data Preprocessing"]},
+    {"when": [["Data Variety", ">=", 4]], "components": ["Data Preprocessing"]},
+    {"when": [["Data Variety", ">=", 6]], "components": ["Feature Engineering"]},
+    {"when": [["tb", "in", ["large", "huge"]]], "components": ["Feature Engineering"]},
+    {"when": [["Automation (CI/CD)", ">=", 7]], "components": ["Data Versioning"]},
+    {"when": [["Model Complexity", ">=", 6]], "components": ["Data Labeling"]},
+    {"when": [["services", "has_any", MODEL_REGISTRY]], "components": ["Model Registry"]},
+    {"when": [["Automation (CI/CD)", ">=", 8]], "components": ["Model Registry"]},
+]
+
+# Returns every component, covered ones first, each group in ML_COMPONENTS order
+def map_ml_components(required_services, recommended_services, params, rps, tb, sla):
+    svc = ServiceSet.coerce(required_services).mask | ServiceSet.coerce(recommended_services).mask
+    return RULESET.ml_pipeline(svc, params, rps, tb, sla)
+
+# --------------------------
+# Build AWS architecture Graphviz (layered clusters) - deterministic, presentation-ready
+# --------------------------
+# edges (deterministic logical flow); drawn when both ends are in the architecture
+AWS_EDGES = [
+    ("Client", "API Gateway"),
+    ("API Gateway", "Lambda"),
+    ("Lambda", "Kinesis"),
+    ("Kinesis", "Glue"),
+    ("Glue", "S3"),
+    ("S3", "Athena"),
+    ("S3", "SageMaker"),
+    ("SageMaker", "SageMaker Model Registry"),
+    ("SageMaker Model Registry", "SageMaker Endpoints"),
+    ("SageMaker Endpoints", "API Gateway"),
+    ("Lambda", "CloudWatch"),
+    ("SageMaker", "SageMaker Model Monitor"),
+    ("Neptune", "Bedrock"),
+    ("OpenSearch", "Bedrock")
+]
+
+def build_aws_dot(required_services, recommended_services):
+    nodes = ServiceSet.coerce(required_services) | ServiceSet.coerce(recommended_services)
+    dot = [
+        "digraph FinalAWS {",
+        "rankdir=LR;",
+        'node [shape=rect, style="rounded,filled", fillcolor="#F2F4F8", fontsize=14];'
+    ]
+    dot.append('subgraph cluster_sources {label="Client & Sources"; style=filled; fillcolor="#FFFFFF"; "Client";}')
+    dot.append('subgraph cluster_storage {label="Storage & Catalog"; style=filled; fillcolor="#FFF8E6";')
+    for n in ["S3", "Redshift", "RDS", "Athena"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#FFF8E6"];')
+    dot.append("}")
+    dot.append('subgraph cluster_ingest {label="Ingestion & Stream"; style=filled; fillcolor="#F1F8E9";')
+    for n in ["Kinesis", "MSK", "DMS", "AppFlow"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F1F8E9"];')
+    dot.append("}")
+    dot.append('subgraph cluster_processing {label="Processing & ETL"; style=filled; fillcolor="#F0F7FF";')
+    for n in ["Glue", "EMR", "SageMaker Processing", "Glue DataBrew", "Athena"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F0F7FF"];')
+    dot.append("}")
+    dot.append('subgraph cluster_ml {label="ML & Model Ops"; style=filled; fillcolor="#F7F2FF";')
+    for n in ["SageMaker", "SageMaker Training", "SageMaker Model Registry", "SageMaker Endpoints", "SageMaker Model Monitor", "Bedrock", "Neptune", "OpenSearch"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F7F2FF"];')
+    dot.append("}")
+    dot.append('subgraph cluster_serving {label="Serving & API"; style=filled; fillcolor="#F2FFF6";')
+    for n in ["API Gateway", "Lambda", "ECS Fargate", "CloudFront", "Amplify", "AutoScaling", "ALB", "Route53"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F2FFF6"];')
+    dot.append("}")
+    dot.append('subgraph cluster_ops {label="Security & Observability"; style=filled; fillcolor="#FFF2F4";')
+    for n in ["IAM", "KMS", "Macie", "GuardDuty", "CloudWatch", "CodePipeline", "CloudTrail", "S3 Object Lock"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#FFF2F4"];')
+    dot.append("}")
+
+    for a, b in AWS_EDGES:
+        if (a == "Client" or a in nodes) and (b in nodes):
+            dot.append(f'"{a}" -> "{b}" [penwidth=1.2];')
+    dot.append("}")
+    return "\n".join(dot)
+
+# --------------------------
+# ML lifecycle diagram (20 components) clustered TB and deterministic highlighting
+# --------------------------
+def build_ml_dot(ml_components):
+    dot = [
+        "digraph MLFull {",
+        "rankdir=TB;",
+        'node [shape=rect, style="rounded,filled", fillcolor="#E8F0FE", fontsize=12];'
+    ]
+    dot.append('subgraph cluster_data { label="📂 Data Pipeline"; style=filled; fillcolor="#F1F8E9"; fontsize=14;')
+    for n in ["Data Ingestion","Data Storage","Data Preprocessing","Feature Engineering","Data Labeling","Data Versioning"]:
+        color = "#DFF4D8" if n in ml_components else "#FFF8E6"
+        dot.append(f'"{n}" [fillcolor="{color}"];')
+    dot.append("}")
+    dot.append('subgraph cluster_model { label="🤖 Model Dev & Training"; style=filled; fillcolor="#E3F2FD"; fontsize=14;')
+    for n in ["Problem Statement","Model Selection","Model Training","Hyperparameter Tuning","Model Evaluation","Model Registry"]:
+        color = "#DDEBF9" if n in ml_components else "#F8F8FF"
+        dot.append(f'"{n}" [fillcolor="{color}"];')
+    dot.append("}")
+    dot.append('subgraph cluster_deploy { label="🚀 Deployment & MLOps"; style=filled; fillcolor="#FFF3E0"; fontsize=14;')
+    for n in ["Model Packaging","Model Deployment","API/Serving Layer","Inference Service","Model Monitoring","Feedback Loop","Orchestration","Model Retraining"]:
+        color = "#FFF0D9" if n in ml_components else "#FFFCEA"
+        dot.append(f'"{n}" [fillcolor="{color}"];')
+    dot.append("}")
+    # connections
+    flow_pairs = [
+        ("Data Ingestion","Data Storage"),("Data Storage","Data Preprocessing"),("Data Preprocessing","Feature Engineering"),
+        ("Feature Engineering","Model Training"),("Model Training","Model Evaluation"),("Model Evaluation","Model Registry"),
+        ("Model Registry","Model Packaging"),("Model Packaging","Model Deployment"),("Model Deployment","API/Serving Layer"),
+        ("API/Serving Layer","Inference Service"),("Inference Service","Model Monitoring"),("Model Monitoring","Feedback Loop"),
+        ("Feedback Loop","Model Retraining")
+    ]
+    for a,b in flow_pairs:
+        dot.append(f'"{a}" -> "{b}" [penwidth=1.0];')
+    dot.append("}")
+    return "\n".join(dot)
+
+# --------------------------
+# Validation (strict checks influenced by deterministic dropdowns)
+# --------------------------
+SECURITY_SERVICES = S(["IAM","KMS","Macie","GuardDuty","VPC","S3 Object Lock"])
+STORAGE_SERVICES = S(["S3"])
+OBSERVABILITY_SERVICES = S(["CloudWatch","SageMaker Model Monitor","CloudTrail"])
+ORCHESTRATION_SERVICES = S(["Step Functions","CodePipeline","AutoScaling"])
+HIGH_RPS_SERVICES = S(["AutoScaling","ECS Fargate","Provisioned Concurrency","CloudFront"])
+BIG_DATA_SERVICES = S(["Redshift","EMR","Athena","Glue"])
+SLA_9999_SERVICES = S(["Multi-AZ","Route53"])
+SLA_9995_SERVICES = S(["Multi-AZ","AutoScaling"])
+
+# The first fired rule of each check decides it (later rules act as the else branch)
+CHECK_RULES = [
+    # Security presence
+    {"check": "Security", "when": [], "any": SECURITY_SERVICES},
+    # Storage resilience
+    {"check": "Storage", "when": [], "any": STORAGE_SERVICES},
+    # Monitoring & MLOps
+    {"check": "Observability", "when": [], "any": OBSERVABILITY_SERVICES},
+    # Orchestration
+    {"check": "Orchestration", "when": [], "any": ORCHESTRATION_SERVICES},
+    # High RPS readiness
+    {"check": "HighRPS", "when": [["rps", "in", ["high", "very_high"]]], "any": HIGH_RPS_SERVICES},
+    {"check": "HighRPS", "when": [["rps", "in", ["very_low", "low", "medium"]]], "pass": True},
+    # Big Data readiness
+    {"check": "BigData", "when": [["tb", "in", ["large", "huge"]]], "any": BIG_DATA_SERVICES},
+    {"check": "BigData", "when": [["tb", "in", ["tiny", "small", "medium"]]], "pass": True},
+    # SLA readiness
+    {"check": "SLA", "when": [["sla", "in", ["slo_99_99"]]], "all": SLA_9999_SERVICES},
+    {"check": "SLA", "when": [["sla", "in", ["slo_99_95"]]], "any": SLA_9995_SERVICES},
+    {"check": "SLA", "when": [], "pass": True},
+    # ML lifecycle coverage (training, registry, monitoring, deployment) in the returned pipeline list
+    {"check": "MLLifecycle", "when": [], "pipeline_all": ["Model Training", "Model Registry", "Model Monitoring", "Model Deployment"]},
+]
+
+def strict_checks(required, recommended, ml_components, rps, tb, retention, sla):
+    svc = ServiceSet.coerce(required).mask | ServiceSet.coerce(recommended).mask
+    return RULESET.checks(svc, ml_components, rps, tb, retention, sla)
+
+# compute a stricter confidence score with clear weights
+WEIGHTS = {"Security":0.22, "Storage":0.18, "Observability":0.15, "Orchestration":0.15, "HighRPS":0.10, "BigData":0.10, "SLA":0.05, "MLLifecycle":0.05}
+
+def confidence_score(checks):
+    score = 0.0
+    for k,w in WEIGHTS.items():
+        score += (1.0 if checks.get(k) else 0.0) * w * 100
+    return round(score,1)
+
+# remediation (strict), in check order
+REMEDIATION = {
+    "Security": "Add IAM, KMS, GuardDuty/Macie, VPC and S3 Object Lock for high compliance.",
+    "Storage": "Add S3 + lifecycle policies; ensure Glue Data Catalog and Lake Formation if dataset large.",
+    "Observability": "Add CloudWatch, CloudTrail and SageMaker Model Monitor.",
+    "Orchestration": "Add Step Functions, CodePipeline and Autoscaling for production workflows.",
+    "HighRPS": "Tune API Gateway + AutoScaling / CloudFront + provisioned concurrency for endpoints.",
+    "BigData": "Add Redshift / EMR / Athena and partitioned Parquet storage for TB-scale datasets.",
+    "SLA": "Add Multi-AZ, Route53 failover and multi-region replication for required SLAs.",
+    "MLLifecycle": "Ensure Model Registry + Model Monitor + automated retraining pipelines exist."
+}
+
+def remediation(checks):
+    return RULESET.remediation(checks)
+
+# role mapping (simple & deterministic)
+ROLE_MAP = {
+    "S3":"Data Engineering","Glue":"Data Engineering","Athena":"Analytics","Redshift":"Data Engineering",
+    "OpenSearch":"Search","Neptune":"Knowledge Engineering","SageMaker":"ML Platform","Bedrock":"ML Platform",
+    "Step Functions":"Platform/Orchestration","Kinesis":"Streaming","MSK":"Streaming","Lambda":"Backend",
+    "API Gateway":"Integration","CloudWatch":"Observability","KMS":"Security","IAM":"Security",
+    "Macie":"Security","GuardDuty":"Security","CodePipeline":"DevOps","ECS Fargate":"Platform Infra",
+    "EMR":"Data Engineering","SageMaker Model Monitor":"ML Platform"
+}
+
+def role_ownership(services):
+    return [(s, ROLE_MAP.get(s, "Platform / Engineering")) for s in services]
+
+# --------------------------
+# Rule set: built-in rules + installed rule packs, compiled into one indexed matcher
+# --------------------------
+RULE_PACKS = []
+RULESET = None
+
+def builtin_rules():
+    return {
+        "profiles": PROFILE_RULES,
+        "services": [{"when": [["profiles", "has", p]], "required": req, "recommended": rec}
+                     for p, (req, rec) in PROFILE_MASKS.items()] + SERVICE_RULES,
+        "ml_pipeline": ML_RULES,
+        "checks": CHECK_RULES,
+        "remediation": [{"when": [["checks", "failed", k]], "text": text} for k, text in REMEDIATION.items()],
+    }
+
+def compile_rules():
+    global RULESET
+    RULESET = RuleSet([builtin_rules()] + RULE_PACKS, components=ML_COMPONENTS, param_names=PARAM_NAMES)
+
+# Extra rules (dict of stage -> rules, see rules.py) are appended after the built-in ones.
+# Build equivalence tables / evaluators after installing packs: they derive their classes from RULESET.
+def add_rules(pack):
+    RULE_PACKS.append(pack)
+    try:
+        compile_rules()
+    except Exception:
+        RULE_PACKS.pop()
+        raise
+
+def load_rule_pack(path):
+    add_rules(load_pack(path))
+
+compile_templates()
+
+# --------------------------
+# One-call evaluation: inputs -> full deterministic report dict
+# --------------------------
+# report timestamp; SOURCE_DATE_EPOCH (seconds) pins it so identical inputs give byte-identical reports
+def timestamp():
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.utcfromtimestamp(int(epoch)).isoformat() + "Z"
+    return datetime.utcnow().isoformat() + "Z"
+
+def evaluate(params, rps, tb, retention, sla, brief=""):
+    profiles = detect_profiles(params, brief, rps, tb, retention, sla)
+    required, recommended = compose_services(profiles, rps, tb, retention, sla, params)
+    ml_pipeline = map_ml_components(required, recommended, params, rps, tb, sla)
+    checks = strict_checks(required, recommended, ml_pipeline, rps, tb, retention, sla)
+    score = confidence_score(checks)
+    # service names are only materialised here, at the output edge
+    required_services = list(required.names())
+    recommended_services = list(recommended.names())
+    return {
+        "generated_at": timestamp(),
+        "params": params,
+        "deterministic_inputs": {"RPS":rps,"DATA_TB":tb,"RETENTION":retention,"SLA":sla},
+        "brief": brief,
+        "profiles": sorted(list(profiles)),
+        "required_services": required_services,
+        "recommended_services": recommended_services,
+        "ml_pipeline": ml_pipeline,
+        "checks": checks,
+        "confidence": score,
+        "remediation": remediation(checks),
+        "sizing": sizing.size(required.mask | recommended.mask, rps, tb, retention, sla)
+    }
@@ -0,0 +1,326 @@
+# Precomputed equivalence-class lookup table for the decision engine.
+#
+# The engine rules (engine.RULESET, see rules.py) only ever compare sliders against a few
+# thresholds, test dropdowns against a few value sets and look for a few brief keywords.
+# derive_classes() reads those conditions from the compiled rule set, so every input collapses
+# into a small class key; EquivalenceTable evaluates each class once and answers queries with
+# an index lookup.
+#
+#   python eqtable.py build eqtable.bin     # precompute + serialise (memory-mappable)
+#   python eqtable.py info eqtable.bin
+#   python eqtable.py build eqtable.bin pack.json   # for a rule set with packs installed (cli / server --rules)
+#
+# The header records a fingerprint of the rules the table was built from; load() refuses a table whose
+# rules differ from engine.RULESET, since its outcomes would silently drop the packs' effects.
+
+import hashlib
+import itertools
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+import engine
+import sizing
+from services import REGISTRY
+
+RULE_STAGES = ["profiles", "services", "ml_pipeline", "checks"]
+DROPDOWNS = [
+    ("rps", "RPS", engine.RPS_OPTIONS),
+    ("tb", "DATA_TB", engine.DATA_TB_OPTIONS),
+    ("retention", "RETENTION", engine.RETENTION_OPTIONS),
+    ("sla", "SLA", engine.SLA_OPTIONS),
+]
+OUTCOME_FIELDS = ["profiles", "required_services", "recommended_services", "ml_pipeline", "checks", "confidence", "remediation"]
+
+MAGIC = b"AAEQTBL1"
+
+# outcomes are stored dictionary-encoded: every string becomes an index into one shared list
+def _encode_outcomes(outcomes):
+    strings, ids = [], {}
+    def sid(s):
+        if s not in ids:
+            ids[s] = len(strings)
+            strings.append(s)
+        return ids[s]
+    encoded = []
+    for o in outcomes:
+        encoded.append([
+            [sid(p) for p in o["profiles"]],
+            [sid(s) for s in o["required_services"]],
+            [sid(s) for s in o["recommended_services"]],
+            [sid(c) for c in o["ml_pipeline"]],
+            [[sid(k), int(v)] for k, v in o["checks"].items()],
+            o["confidence"],
+            [sid(r) for r in o["remediation"]],
+        ])
+    return strings, encoded
+
+def _decode_outcomes(strings, encoded):
+    outcomes = []
+    for profiles, req, rec, ml, checks, confidence, rem in encoded:
+        outcomes.append({
+            "profiles": [strings[i] for i in profiles],
+            "required_services": [strings[i] for i in req],
+            "recommended_services": [strings[i] for i in rec],
+            "ml_pipeline": [strings[i] for i in ml],
+            "checks": {strings[k]: bool(v) for k, v in checks},
+            "confidence": confidence,
+            "remediation": [strings[i] for i in rem],
+        })
+    return outcomes
+
+# --------------------------
+# Class derivation (reads the rule conditions from engine.RULESET)
+# --------------------------
+def _partition(values, subsets):
+    # coarsest partition of `values` (kept in option order) that no tested subset splits
+    classes = {}
+    for v in values:
+        signature = tuple(v in s for s in subsets)
+        classes.setdefault(signature, []).append(v)
+    return sorted(classes.values(), key=lambda c: values.index(c[0]))
+
+def derive_classes(stages=None):
+    reads = engine.RULESET.reads(stages or RULE_STAGES)
+
+    sliders = []
+    for name in engine.PARAM_NAMES:
+        bounds = sorted(t for t in reads["cuts"].get(name, ()) if engine.PARAM_MIN < t <= engine.PARAM_MAX)
+        # "increasing": every rule only ever tests `slider >= t`, so raising it can only switch rules on
+        sliders.append({"name": name, "cuts": bounds, "increasing": reads["directions"].get(name, set()) <= {"up"}})
+
+    dropdowns = []
+    for arg, key, options in DROPDOWNS:
+        values = [v for v, _ in options]
+        dropdowns.append({"name": key, "classes": _partition(values, reads["subsets"][arg])})
+
+    # keywords that only ever appear side by side in the same conditions are interchangeable
+    groups = {}
+    for kw, sites in reads["keyword_sites"].items():
+        groups.setdefault(frozenset(sites), []).append(kw)
+    brief_groups = sorted(sorted(g) for g in groups.values())
+
+    return {"sliders": sliders, "dropdowns": dropdowns, "brief_groups": brief_groups}
+
+# what a table's outcomes were computed from: the rules, check weights, inputs and their options
+def rules_fingerprint():
+    data = {
+        "rules": engine.RULESET.fingerprint(),
+        "weights": engine.WEIGHTS,
+        "params": [engine.PARAM_NAMES, engine.PARAM_MIN, engine.PARAM_MAX],
+        "dropdowns": [[v for v, _ in options] for _, _, options in DROPDOWNS],
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+# --------------------------
+# Class keys: inputs -> flat mixed-radix index over a class spec
+# --------------------------
+class ClassKeyer:
+    def __init__(self, spec):
+        self.spec = spec
+        radices = [len(s["cuts"]) + 1 for s in spec["sliders"]]
+        radices += [len(d["classes"]) for d in spec["dropdowns"]]
+        radices += [2] * len(spec["brief_groups"])
+        strides, stride = [], 1
+        for r in reversed(radices):
+            strides.append(stride)
+            stride *= r
+        strides.reverse()
+        self.size = stride
+        self.radices = radices
+
+        # per-value contribution to the flat index: slider value -> class * stride
+        self._slider_keys = []
+        for s, st in zip(spec["sliders"], strides):
+            if not s["cuts"]:
+                continue
+            lut = [0] * (engine.PARAM_MAX + 1)
+            for v in range(engine.PARAM_MIN, engine.PARAM_MAX + 1):
+                lut[v] = sum(1 for c in s["cuts"] if v >= c) * st
+            self._slider_keys.append((s["name"], lut))
+        n = len(spec["sliders"])
+        self._dropdown_keys = []
+        for d, st in zip(spec["dropdowns"], strides[n:]):
+            self._dropdown_keys.append({v: i * st for i, cls in enumerate(d["classes"]) for v in cls})
+        n += len(spec["dropdowns"])
+        self._brief_keys = list(zip(spec["brief_groups"], strides[n:]))
+
+    def key(self, params, rps, tb, retention, sla, brief=""):
+        k = 0
+        for name, lut in self._slider_keys:
+            k += lut[params[name]]
+        rps_k, tb_k, ret_k, sla_k = self._dropdown_keys
+        k += rps_k[rps] + tb_k[tb] + ret_k[retention] + sla_k[sla]
+        if brief:
+            brief_lower = brief.lower()
+            for keywords, st in self._brief_keys:
+                if any(kw in brief_lower for kw in keywords):
+                    k += st
+        return k
+
+    # flat index -> per-axis class numbers (sliders, dropdowns, brief groups)
+    def digits(self, k):
+        out = []
+        for r in reversed(self.radices):
+            k, d = divmod(k, r)
+            out.append(d)
+        out.reverse()
+        return out
+
+    # representative inputs of class k: the same ones EquivalenceTable.representatives() yields
+    def representative(self, k):
+        spec = self.spec
+        digits = self.digits(k)
+        n_sliders, n_dropdowns = len(spec["sliders"]), len(spec["dropdowns"])
+        params = {s["name"]: ([engine.PARAM_MIN] + s["cuts"])[d] for s, d in zip(spec["sliders"], digits)}
+        rps, tb, retention, sla = (dd["classes"][d][0] for dd, d in zip(spec["dropdowns"], digits[n_sliders:]))
+        flags = digits[n_sliders + n_dropdowns:]
+        brief = " ".join(g[0] for g, on in zip(spec["brief_groups"], flags) if on)
+        return params, rps, tb, retention, sla, brief
+
+# --------------------------
+# Table
+# --------------------------
+class EquivalenceTable:
+    def __init__(self, spec, outcomes, index, fingerprint=None):
+        self.spec = spec
+        self.fingerprint = fingerprint or rules_fingerprint()
+        self.outcomes = outcomes
+        self.index = index
+        self.keyer = ClassKeyer(spec)
+        self.key = self.keyer.key
+        self.size = self.keyer.size
+        self.radices = self.keyer.radices
+        # sizing reads the raw dropdown values, not just their classes, so it is computed per query
+        self._masks = [REGISTRY.mask(o["required_services"]) | REGISTRY.mask(o["recommended_services"]) for o in outcomes]
+
+    def lookup(self, params, rps, tb, retention, sla, brief=""):
+        return self.outcomes[self.index[self.key(params, rps, tb, retention, sla, brief)]]
+
+    # same report dict as engine.evaluate(), served from the table
+    def evaluate(self, params, rps, tb, retention, sla, brief=""):
+        oid = self.index[self.key(params, rps, tb, retention, sla, brief)]
+        outcome = self.outcomes[oid]
+        return {
+            "generated_at": engine.timestamp(),
+            "params": params,
+            "deterministic_inputs": {"RPS":rps,"DATA_TB":tb,"RETENTION":retention,"SLA":sla},
+            "brief": brief,
+            "profiles": list(outcome["profiles"]),
+            "required_services": list(outcome["required_services"]),
+            "recommended_services": list(outcome["recommended_services"]),
+            "ml_pipeline": list(outcome["ml_pipeline"]),
+            "checks": dict(outcome["checks"]),
+            "confidence": outcome["confidence"],
+            "remediation": list(outcome["remediation"]),
+            "sizing": sizing.size(self._masks[oid], rps, tb, retention, sla)
+        }
+
+    # representative inputs of every class, in flat-index order
+    def representatives(self):
+        spec = self.spec
+        axes = [[engine.PARAM_MIN] + s["cuts"] for s in spec["sliders"]]
+        axes += [[cls[0] for cls in d["classes"]] for d in spec["dropdowns"]]
+        axes += [[False, True]] * len(spec["brief_groups"])
+        n_sliders, n_dropdowns = len(spec["sliders"]), len(spec["dropdowns"])
+        for combo in itertools.product(*axes):
+            params = dict(zip(engine.PARAM_NAMES, combo[:n_sliders]))
+            rps, tb, retention, sla = combo[n_sliders:n_sliders + n_dropdowns]
+            flags = combo[n_sliders + n_dropdowns:]
+            brief = " ".join(g[0] for g, on in zip(spec["brief_groups"], flags) if on)
+            yield params, rps, tb, retention, sla, brief
+
+    @classmethod
+    def build(cls, spec=None, evaluate=None):
+        spec = spec or derive_classes()
+        evaluate = evaluate or engine.evaluate
+        outcomes, ids = [], {}
+        index = array("I")
+        table = cls(spec, outcomes, index)
+        for args in table.representatives():
+            report = evaluate(*args)
+            outcome = {f: report[f] for f in OUTCOME_FIELDS}
+            sig = json.dumps(outcome, sort_keys=True)
+            oid = ids.get(sig)
+            if oid is None:
+                oid = ids[sig] = len(outcomes)
+                outcomes.append(outcome)
+            index.append(oid)
+        if len(outcomes) <= 0xFFFF:
+            index = array("H", index)
+        return cls(spec, outcomes, index)
+
+    # --------------------------
+    # Serialisation: MAGIC | u32 header length | JSON header | pad to 8 | raw index array
+    # --------------------------
+    def save(self, path):
+        strings, encoded = _encode_outcomes(self.outcomes)
+        header = json.dumps({
+            "spec": self.spec,
+            "strings": strings,
+            "outcomes": encoded,
+            "typecode": self.index.typecode,
+            "itemsize": self.index.itemsize,
+            "size": self.size,
+            "rules": self.fingerprint,
+        }, separators=(",", ":")).encode("utf-8")
+        offset = len(MAGIC) + 4 + len(header)
+        pad = -offset % 8
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(b"\0" * pad)
+            if sys.byteorder != "little":
+                index = array(self.index.typecode, self.index)
+                index.byteswap()
+                f.write(index.tobytes())
+            else:
+                f.write(self.index.tobytes())
+
+    # check=False skips the rule fingerprint check (to inspect a stale table)
+    @classmethod
+    def load(cls, path, check=True):
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an equivalence table file")
+        (hlen,) = struct.unpack_from("<I", mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mm[start:start + hlen].decode("utf-8"))
+        if check and header.get("rules") != rules_fingerprint():
+            mm.close()
+            raise ValueError(f"{path} was built for different rules (rule packs, weights or options changed); "
+                             f"rebuild it with `python eqtable.py build {path} PACK.json ...` for the installed packs")
+        offset = start + hlen
+        offset += -offset % 8
+        nbytes = header["size"] * header["itemsize"]
+        if sys.byteorder != "little":
+            index = array(header["typecode"], mm[offset:offset + nbytes])
+            index.byteswap()
+        else:
+            index = memoryview(mm)[offset:offset + nbytes].cast(header["typecode"])
+        table = cls(header["spec"], _decode_outcomes(header["strings"], header["outcomes"]), index, header.get("rules", "none"))
+        table._mmap = mm
+        return table
+
+if __name__ == "__main__":
+    import time
+    if len(sys.argv) < 3 or sys.argv[1] not in ("build", "info"):
+        sys.exit("usage: python eqtable.py build|info <path> [PACK.json ...]")
+    cmd, path = sys.argv[1:3]
+    for pack in sys.argv[3:]:
+        engine.load_rule_pack(pack)
+    t0 = time.perf_counter()
+    if cmd == "build":
+        table = EquivalenceTable.build()
+        table.save(path)
+    else:
+        table = EquivalenceTable.load(path, check=False)
+    print(f"{cmd}: {time.perf_counter() - t0:.2f}s")
+    print(f"rules: {'current' if table.fingerprint == rules_fingerprint() else 'STALE (built for other rules)'}")
+    print(f"classes: {table.size} (radices {table.radices})")
+    print(f"distinct outcomes: {len(table.outcomes)}")
+    print(f"brief keyword groups: {table.spec['brief_groups']}")
@@ -0,0 +1,170 @@
+# Stage-level dependency tracking + memoisation for interactive reruns.
+#
+# Each pipeline stage is keyed only on what it actually reads: the equivalence classes (see
+# eqtable.derive_classes) of the sliders / dropdowns / brief keywords its own rules
+# compare, plus the outputs of its upstream stages. A widget change that no stage reads
+# (e.g. "User Experience") therefore hits every cache, and a change that only moves, say, the
+# Automation slider across 7 recomputes the ML mapping and what sits downstream of it.
+
+import threading
+from collections import OrderedDict
+from functools import partial
+
+import engine
+import sizing
+from eqtable import ClassKeyer, derive_classes
+from metrics import METRICS
+
+# stage -> (rule stage whose input reads are tracked, upstream stages)
+STAGES = {
+    "profiles": ("profiles", []),
+    "services": ("services", ["profiles"]),
+    "ml_pipeline": ("ml_pipeline", ["services"]),
+    "checks": ("checks", ["services", "ml_pipeline"]),
+    "score": (None, ["checks"]),
+    "aws_dot": (None, ["services"]),
+    "ml_dot": (None, ["ml_pipeline"]),
+    "roles": (None, ["services"]),
+}
+
+# stage -> metrics.py stage name it is timed under
+STAGE_METRICS = {
+    "profiles": "profile_detection",
+    "services": "service_composition",
+    "ml_pipeline": "ml_mapping",
+    "checks": "compliance_checks",
+    "score": "confidence_scoring",
+    "aws_dot": "aws_dot_building",
+    "ml_dot": "ml_dot_building",
+    "roles": "role_mapping",
+}
+
+def stage_reads(stage):
+    # human-readable view of the inputs a stage depends on directly
+    rule_stage, _ = STAGES[stage]
+    if rule_stage is None:
+        return []
+    spec = derive_classes([rule_stage])
+    reads = [s["name"] for s in spec["sliders"] if s["cuts"]]
+    reads += [d["name"] for d in spec["dropdowns"] if len(d["classes"]) > 1]
+    reads += ["brief"] if spec["brief_groups"] else []
+    return reads
+
+class _LRU:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is not None:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+class IncrementalEvaluator:
+    # Thread-safe, so one instance can be shared by every session of a Streamlit server. The lock only
+    # guards the cache lookups / inserts; stages compute outside it, so sessions run concurrently (two
+    # sessions missing the same key at once both compute it, with identical results).
+    def __init__(self, maxsize=4096, metrics=METRICS):
+        self.metrics = metrics
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._ruleset = None
+        self._keyers = None
+        self._caches = None
+        self.hits = 0
+        self.misses = 0
+
+    def _keyers_for_rules(self):
+        # class keys and cached outputs belong to one engine.RULESET: a rule pack install replaces
+        # it, and then both are rebuilt
+        ruleset = engine.RULESET
+        with self._lock:
+            if ruleset is not self._ruleset:
+                self._keyers = {stage: ClassKeyer(derive_classes([rs])) for stage, (rs, _) in STAGES.items() if rs}
+                self._caches = {stage: _LRU(self.maxsize) for stage in STAGES}
+                self._ruleset = ruleset
+            return self._keyers, self._caches
+
+    def _stage(self, caches, recomputed, stage, key, compute):
+        cache = caches[stage]
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                self.hits += 1
+        if value is None:
+            with self.metrics.stage(STAGE_METRICS[stage]):
+                value = compute()
+            with self._lock:
+                self.misses += 1
+                cache.put(key, value)
+            recomputed.append(stage)
+            self.metrics.inc("cache_misses", cache="stage", stage=stage)
+        else:
+            self.metrics.inc("cache_hits", cache="stage", stage=stage)
+        return value
+
+    # returns {stage: output}; "recomputed" lists the stages that missed their cache on this call.
+    # counter: the metric this run counts under (what-if neighbour runs use their own)
+    def run(self, params, rps, tb, retention, sla, brief="", counter="evaluations"):
+        inputs = (params, rps, tb, retention, sla, brief)
+        self.metrics.inc(counter)
+        keyers, caches = self._keyers_for_rules()
+        k = {stage: keyer.key(*inputs) for stage, keyer in keyers.items()}
+        recomputed = []
+        stage = partial(self._stage, caches, recomputed)
+        profiles = stage("profiles", k["profiles"],
+            lambda: frozenset(engine.detect_profiles(params, brief, rps, tb, retention, sla)))
+        required, recommended = stage("services", (profiles, k["services"]),
+            lambda: engine.compose_services(profiles, rps, tb, retention, sla, params))
+        svc_key = (required.mask, recommended.mask)
+        ml_pipeline = stage("ml_pipeline", (svc_key, k["ml_pipeline"]),
+            lambda: tuple(engine.map_ml_components(required, recommended, params, rps, tb, sla)))
+        checks = stage("checks", (svc_key, ml_pipeline, k["checks"]),
+            lambda: engine.strict_checks(required, recommended, ml_pipeline, rps, tb, retention, sla))
+        check_key = tuple(checks.items())
+        score = stage("score", check_key,
+            lambda: (engine.confidence_score(checks), tuple(engine.remediation(checks))))
+        aws_dot = stage("aws_dot", svc_key, lambda: engine.build_aws_dot(required, recommended))
+        ml_dot = stage("ml_dot", ml_pipeline, lambda: engine.build_ml_dot(ml_pipeline))
+        roles = stage("roles", svc_key,
+            lambda: tuple(engine.role_ownership(list(required.names()) + list(recommended.names()))))
+        return {
+            "profiles": profiles,
+            "required": required,
+            "recommended": recommended,
+            "ml_pipeline": ml_pipeline,
+            "checks": checks,
+            "confidence": score[0],
+            "remediation": score[1],
+            "aws_dot": aws_dot,
+            "ml_dot": ml_dot,
+            "roles": roles,
+            "recomputed": recomputed,
+        }
+
+    # same report dict as engine.evaluate()
+    def report(self, outputs, params, rps, tb, retention, sla, brief=""):
+        return {
+            "generated_at": engine.timestamp(),
+            "params": params,
+            "deterministic_inputs": {"RPS":rps,"DATA_TB":tb,"RETENTION":retention,"SLA":sla},
+            "brief": brief,
+            "profiles": sorted(outputs["profiles"]),
+            "required_services": list(outputs["required"].names()),
+            "recommended_services": list(outputs["recommended"].names()),
+            "ml_pipeline": list(outputs["ml_pipeline"]),
+            "checks": dict(outputs["checks"]),
+            "confidence": outputs["confidence"],
+            "remediation": list(outputs["remediation"]),
+            "sizing": sizing.size(outputs["required"].mask | outputs["recommended"].mask, rps, tb, retention, sla)
+        }
+
+    def evaluate(self, params, rps, tb, retention, sla, brief=""):
+        outputs = self.run(params, rps, tb, retention, sla, brief)
+        return self.report(outputs, params, rps, tb, retention, sla, brief)
@@ -0,0 +1,214 @@
+# Latency-budget simulation of the synchronous request path through a generated architecture.
+#
+# The path is taken from the diagram's own edges (engine.AWS_EDGES) plus the request-time calls
+# the diagram leaves implicit (CALL_EDGES), walked from "Client" through the services present in the
+# architecture that have a HOPS profile. Services without a profile (Glue, S3, CloudWatch, ...) are
+# asynchronous and end the walk. Routing hops ("route": "first") forward to their first present
+# successor only; compute hops call every present successor, one after the other.
+#
+# Every hop is an M/M/c-style queue: service time is lognormal (from p50 / p99), c servers come from
+# the profile, from the capacity sizing (sizing.py) or are unbounded, and the queueing delay is
+# Erlang-C at the design RPS of the chosen RPS class. A Monte Carlo over n requests (NumPy, seeded, so
+# the same inputs always give the same numbers) sums the hops into end-to-end p50 / p95 / p99, which
+# are compared with the p99 budget of the chosen SLA. A hop at or above 100% utilisation saturates
+# the path: percentiles are then reported as None.
+#
+# HOPS, CALL_EDGES and P99_BUDGET_MS are plain data and meant to be edited; call reset() afterwards.
+
+import math
+
+import engine
+import sizing
+from services import REGISTRY
+
+# "servers": int, None (no concurrency limit) or [sizing service, metric, servers per unit]
+# "max_servers" / "max_rps": sizing.LIMITS key that caps the servers (concurrency / throttle quota)
+HOPS = {
+    "API Gateway": {"p50_ms": 8, "p99_ms": 35, "servers": None, "max_rps": "api_gateway_account_rps", "route": "first"},
+    "ALB": {"p50_ms": 2, "p99_ms": 10, "servers": None, "route": "first"},
+    "Lambda": {"p50_ms": 30, "p99_ms": 250, "servers": ["Lambda", "concurrency", 1], "max_servers": "lambda_account_concurrency"},
+    "ECS Fargate": {"p50_ms": 25, "p99_ms": 150, "servers": ["ECS Fargate", "tasks", 8]},
+    "Kinesis": {"p50_ms": 15, "p99_ms": 80, "servers": ["Kinesis", "shards", 20]},
+    "DynamoDB": {"p50_ms": 5, "p99_ms": 25, "servers": None},
+    "OpenSearch": {"p50_ms": 30, "p99_ms": 180, "servers": ["OpenSearch", "data_nodes", 12]},
+    "Neptune": {"p50_ms": 20, "p99_ms": 120, "servers": 64},
+    "SageMaker": {"p50_ms": 60, "p99_ms": 400, "servers": 200},
+    "Bedrock": {"p50_ms": 700, "p99_ms": 2500, "servers": 400},
+}
+
+# request-time calls the architecture diagram does not draw
+CALL_EDGES = [
+    ("Client", "ALB"),
+    ("API Gateway", "ECS Fargate"),
+    ("ALB", "ECS Fargate"),
+    ("Lambda", "DynamoDB"),
+    ("Lambda", "OpenSearch"),
+    ("Lambda", "Neptune"),
+    ("Lambda", "SageMaker"),
+    ("Lambda", "Bedrock"),
+    ("ECS Fargate", "DynamoDB"),
+    ("ECS Fargate", "OpenSearch"),
+    ("ECS Fargate", "Neptune"),
+    ("ECS Fargate", "SageMaker"),
+    ("ECS Fargate", "Bedrock"),
+]
+
+# end-to-end p99 the SLA tier implies (None: no latency objective)
+P99_BUDGET_MS = {"best_effort": None, "slo_99_9": 3000, "slo_99_95": 2500, "slo_99_99": 2000}
+
+SAMPLES = 1_000_000
+
+# --------------------------
+# Path
+# --------------------------
+_paths = {}
+
+def serving_path(mask):
+    path = _paths.get(mask)
+    if path is None:
+        if len(_paths) >= 65536:
+            _paths.clear()
+        path = _paths[mask] = _walk(mask)
+    return list(path)
+
+def _walk(mask):
+    present = {s for s in HOPS if mask & REGISTRY.bit(s)}
+    successors = {}
+    for a, b in engine.AWS_EDGES + CALL_EDGES:
+        if b in present and b not in successors.setdefault(a, []):
+            successors[a].append(b)
+    path, stack = [], ["Client"]
+    seen = set(stack)
+    while stack:
+        node = stack.pop()
+        if node != "Client":
+            path.append(node)
+        nxt = [b for b in successors.get(node, []) if b not in seen]
+        if node == "Client" or HOPS[node].get("route") == "first":
+            nxt = nxt[:1]
+        seen.update(nxt)
+        stack.extend(reversed(nxt))
+    return tuple(path)
+
+# --------------------------
+# Per-hop queue parameters
+# --------------------------
+def _lognormal(hop):
+    mu = math.log(hop["p50_ms"])
+    sigma = max(math.log(hop["p99_ms"] / hop["p50_ms"]), 0.0) / 2.3263478740408408
+    return mu, sigma, math.exp(mu + sigma * sigma / 2)
+
+def _capacity(hop, sized, mean_ms):
+    # fractional servers: sized units * per-unit concurrency, capped by the hop's quotas
+    c = hop["servers"]
+    if isinstance(c, list):
+        svc, metric, per_unit = c
+        c = sized.get(svc, {}).get(metric, 0) * per_unit
+    if hop.get("max_servers"):
+        cap = sizing.LIMITS[hop["max_servers"]]
+        c = cap if c is None else min(c, cap)
+    if hop.get("max_rps"):
+        cap = sizing.LIMITS[hop["max_rps"]] * mean_ms / 1000
+        c = cap if c is None else min(c, cap)
+    return c
+
+def _servers(hop, sized, mean_ms):
+    # whole servers, rounded down: a cap is a limit (API Gateway: 10k RPS * 10.08 ms = 100.8 -> 100 servers)
+    c = _capacity(hop, sized, mean_ms)
+    return None if c is None else max(1, math.floor(c))
+
+def _saturation_rps(hop, sized, mean_ms):
+    # clamped to the throttle quota, so a throttled hop saturates exactly at its quota (10k RPS, not the
+    # 9920 RPS of 100 whole servers nor the 10019 RPS of 101)
+    c = _capacity(hop, sized, mean_ms)
+    if c is None:
+        return None
+    rps = max(c, 1) * 1000 / mean_ms
+    if hop.get("max_rps"):
+        rps = min(rps, sizing.LIMITS[hop["max_rps"]])
+    return round(rps, 1)
+
+def erlang_c(c, a):
+    # probability an arrival waits in an M/M/c queue with offered load a (Erlang B recursion)
+    b = 1.0
+    for k in range(1, c + 1):
+        b = a * b / (k + a * b)
+    rho = a / c
+    return b / (1 - rho * (1 - b))
+
+# --------------------------
+# Simulation
+# --------------------------
+_memo = {}
+
+def _simulate(path, params, rps, budget, n, seed):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    total = np.zeros(n, dtype=np.float64)
+    hops, saturated = {}, False
+    for svc, (mu, sigma, mean_ms, c, saturation) in zip(path, params):
+        hop = {"servers": c, "mean_ms": round(mean_ms, 2)}
+        if c is None:
+            hop.update(utilisation=0.0, saturation_rps=None)
+        else:
+            a = rps * mean_ms / 1000
+            hop.update(utilisation=round(a / c, 4), saturation_rps=saturation)
+            saturated |= a >= c
+        hops[svc] = hop
+        if saturated:
+            continue
+        total += np.exp(rng.standard_normal(n) * sigma + mu)
+        if c is not None and rps > 0:
+            wait = erlang_c(c, a)
+            if wait > 1e-9:
+                # waiting time given a wait is exponential with rate c*mu - lambda
+                waiting = rng.random(n) < wait
+                total[waiting] += rng.exponential(1000 / (c * 1000 / mean_ms - rps), int(waiting.sum()))
+    limits = [(h["saturation_rps"], svc) for svc, h in hops.items() if h["saturation_rps"] is not None]
+    saturation_rps, bottleneck = min(limits) if limits else (None, None)
+    if saturated or not path:
+        p50 = p95 = p99 = None
+    else:
+        p50, p95, p99 = (round(float(v), 1) for v in np.percentile(total, [50, 95, 99]))
+    return {
+        "path": list(path),
+        "rps": rps,
+        "samples": n,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "p99_budget_ms": budget,
+        "within_budget": None if budget is None else (p99 is not None and p99 <= budget),
+        "saturated": saturated,
+        "bottleneck": bottleneck,
+        "saturation_rps": saturation_rps,
+        "hops": hops,
+    }
+
+# service mask (required | recommended) + dropdown values -> the report's "latency" section
+def simulate(mask, rps, tb, retention, sla, n=SAMPLES, seed=0):
+    sized = sizing.size(mask, rps, tb, retention, sla)["services"]
+    path = tuple(serving_path(mask))
+    params = []
+    for svc in path:
+        hop = HOPS[svc]
+        mu, sigma, mean_ms = _lognormal(hop)
+        params.append((mu, sigma, mean_ms, _servers(hop, sized, mean_ms), _saturation_rps(hop, sized, mean_ms)))
+    design_rps = sizing.DEMAND["rps"][rps]
+    key = (path, tuple(params), design_rps, P99_BUDGET_MS[sla], n, seed)
+    out = _memo.get(key)
+    if out is None:
+        out = _simulate(path, params, design_rps, P99_BUDGET_MS[sla], n, seed)
+        if len(_memo) >= 4096:
+            _memo.clear()
+        _memo[key] = out
+    return dict(out, path=list(out["path"]), hops={svc: dict(h) for svc, h in out["hops"].items()})
+
+def simulate_report(report, n=SAMPLES, seed=0):
+    mask = REGISTRY.mask(report["required_services"]) | REGISTRY.mask(report["recommended_services"])
+    d = report["deterministic_inputs"]
+    return simulate(mask, d["RPS"], d["DATA_TB"], d["RETENTION"], d["SLA"], n, seed)
+
+def reset():
+    _memo.clear()
+    _paths.clear()
@@ -0,0 +1,182 @@
+# Per-stage timing / allocation instrumentation + counters, exposed as Prometheus text.
+#
+#   with METRICS.stage("service_composition"):
+#       ...
+#   METRICS.inc("cache_hits", cache="stage")
+#   METRICS.prometheus()            # text exposition format
+#   METRICS.serve(9108)             # optional background /metrics endpoint
+#
+# Each stage keeps a bounded window of recent samples (wall seconds + net allocated memory blocks,
+# from sys.getallocatedblocks) for p50/p95, plus lifetime count / sum totals.
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+STAGES = [
+    "profile_detection",
+    "service_composition",
+    "ml_mapping",
+    "compliance_checks",
+    "confidence_scoring",
+    "aws_dot_building",
+    "ml_dot_building",
+    "role_mapping",
+    "latency_simulation",
+    "graph_rendering",
+    "report_serialisation",
+    "rerun",
+]
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+def _escape(value):
+    # label values escape backslash, double quote and newline (text exposition format)
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels):
+    # labels in the given order
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+class Metrics:
+    def __init__(self, window=512, prefix="architect"):
+        self.window = window
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = {}
+        self._counters = {}
+        self._gauges = {}
+
+    @contextmanager
+    def stage(self, name):
+        blocks = sys.getallocatedblocks()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, sys.getallocatedblocks() - blocks)
+
+    def observe(self, name, seconds, blocks=0):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._totals[name] = [0, 0.0, 0]
+            samples.append((seconds, blocks))
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += blocks
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def counter(self, name, **labels):
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def summary(self):
+        # {stage: {count, p50_ms, p95_ms, mean_ms, alloc_blocks_p50}} over the recent window
+        with self._lock:
+            snapshot = {name: list(s) for name, s in self._samples.items()}
+        out = {}
+        for name in sorted(snapshot, key=lambda n: STAGES.index(n) if n in STAGES else len(STAGES)):
+            seconds = [s for s, _ in snapshot[name]]
+            blocks = [b for _, b in snapshot[name]]
+            out[name] = {
+                "count": len(seconds),
+                "p50_ms": percentile(seconds, 0.5) * 1e3,
+                "p95_ms": percentile(seconds, 0.95) * 1e3,
+                "mean_ms": sum(seconds) / len(seconds) * 1e3,
+                "alloc_blocks_p50": percentile(blocks, 0.5),
+            }
+        return out
+
+    def prometheus(self):
+        p = self.prefix
+        with self._lock:
+            snapshot = {name: list(s) for name, s in self._samples.items()}
+            totals = {name: list(t) for name, t in self._totals.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        lines = [
+            f"# HELP {p}_stage_seconds Wall time per pipeline stage (quantiles over the recent window).",
+            f"# TYPE {p}_stage_seconds summary",
+        ]
+        for name, samples in snapshot.items():
+            seconds = [s for s, _ in samples]
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f"{p}_stage_seconds{_labels({'stage': name, 'quantile': q})} {percentile(seconds, q):.9f}")
+            count, total, _ = totals[name]
+            lines.append(f"{p}_stage_seconds_sum{_labels({'stage': name})} {total:.9f}")
+            lines.append(f"{p}_stage_seconds_count{_labels({'stage': name})} {count}")
+        # net blocks can be negative (a stage may free more than it allocates), so a summary, not a counter
+        lines.append(f"# HELP {p}_stage_alloc_blocks Net memory blocks allocated per stage run (quantiles over the recent window).")
+        lines.append(f"# TYPE {p}_stage_alloc_blocks summary")
+        for name, samples in snapshot.items():
+            blocks = [b for _, b in samples]
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f"{p}_stage_alloc_blocks{_labels({'stage': name, 'quantile': q})} {percentile(blocks, q)}")
+            count, _, total = totals[name]
+            lines.append(f"{p}_stage_alloc_blocks_sum{_labels({'stage': name})} {total}")
+            lines.append(f"{p}_stage_alloc_blocks_count{_labels({'stage': name})} {count}")
+        for names, kind, suffix in ((counters, "counter", "_total"), (gauges, "gauge", "")):
+            seen = set()
+            for (name, labels), value in sorted(names.items()):
+                metric = f"{p}_{name}{suffix}"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} {kind}")
+                    seen.add(metric)
+                lines.append(f"{metric}{_labels(dict(labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # atomic replace so a scraper never reads a half-written file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+# process-wide default registry
+METRICS = Metrics()
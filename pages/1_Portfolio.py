@@ -0,0 +1,125 @@
+# Portfolio tab: upload a CSV of projects, evaluate them all in one batch (portfolio.py) and browse
+# the aggregates. Only the current table page is materialised, and diagrams render for the selected
+# row only, so the page stays responsive with 10k projects.
+
+import math
+
+import altair as alt
+import streamlit as st
+
+import engine
+import portfolio
+from widgets import show_diagram
+
+st.set_page_config(page_title="Portfolio — AI Architect with AWS Components", layout="wide")
+st.title("📊 Portfolio — evaluate many projects at once")
+st.caption("Upload a CSV with one project per row. Columns (all optional, empty cells take the UI defaults): "
+           + ", ".join(portfolio.COLUMNS) + ".")
+
+uploaded = st.file_uploader("Projects CSV", type=["csv"])
+# the upload widget resets when switching pages; keep the last upload for this session
+if uploaded is not None:
+    st.session_state["portfolio_csv"] = uploaded.getvalue()
+data = st.session_state.get("portfolio_csv")
+st.download_button("Download CSV template", ",".join(f'"{c}"' if "," in c else c for c in portfolio.COLUMNS) + "\n",
+                   file_name="portfolio_template.csv", mime="text/csv")
+if data is None:
+    st.stop()
+
+# evaluated once per distinct upload, shared read-only across sessions
+@st.cache_resource(max_entries=8, show_spinner="Evaluating portfolio…")
+def load_portfolio(data):
+    names, args, errors = portfolio.read_csv(data.decode("utf-8-sig"))
+    return portfolio.Portfolio(names, args), errors
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def results_csv(data):
+    return load_portfolio(data)[0].to_csv()
+
+try:
+    result, errors = load_portfolio(data)
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+if errors:
+    with st.expander(f"⚠️ {len(errors)} rows skipped"):
+        st.dataframe([{"line": line, "error": message} for line, message in errors[:1000]], hide_index=True)
+if not len(result):
+    st.warning("No valid project rows in this CSV.")
+    st.stop()
+
+cols = st.columns(4)
+cols[0].metric("Projects", f"{len(result):,}")
+cols[1].metric("Mean confidence", f"{result.confidence.mean():.1f}%")
+cols[2].metric("All checks passed", f"{(result.confidence == 100).mean():.0%}")
+cols[3].metric("Services in use", len(result.services))
+
+# --------------------------
+# Aggregates
+# --------------------------
+st.markdown("### 🗺️ Service usage by profile")
+usage = result.service_usage()
+heat = result.heatmap()
+sid = {s: i for i, s in enumerate(result.services)}
+st.altair_chart(
+    alt.Chart(alt.Data(values=[
+        {"service": s, "profile": p, "share": round(float(heat[sid[s], j]), 3), "projects": req + rec}
+        for s, req, rec in usage for j, p in enumerate(result.profiles)
+    ])).mark_rect().encode(
+        x=alt.X("profile:N", title=None),
+        y=alt.Y("service:N", sort=[s for s, _, _ in usage], title=None),
+        color=alt.Color("share:Q", title="share of profile", scale=alt.Scale(scheme="blues")),
+        tooltip=["service:N", "profile:N", alt.Tooltip("share:Q", format=".0%"), "projects:Q"],
+    ).properties(height=max(200, 16 * len(usage))),
+    width="stretch",
+)
+
+col_profiles, col_confidence = st.columns(2)
+with col_profiles:
+    st.markdown("#### Profile frequencies")
+    st.altair_chart(alt.Chart(alt.Data(values=[
+        {"profile": p, "projects": c} for p, c in result.profile_frequencies().items()
+    ])).mark_bar().encode(x="projects:Q", y=alt.Y("profile:N", sort="-x", title=None)), width="stretch")
+with col_confidence:
+    st.markdown("#### Confidence distribution")
+    st.altair_chart(alt.Chart(alt.Data(values=[
+        {"confidence": f"{v:g}%", "value": v, "projects": c} for v, c in result.confidence_histogram().items()
+    ])).mark_bar().encode(x=alt.X("confidence:N", sort=alt.SortField("value")), y="projects:Q"),
+        width="stretch")
+
+st.markdown("#### Most common remediation items")
+top = result.top_remediation()
+if top:
+    st.dataframe([{"remediation": text, "projects": count} for text, count in top], hide_index=True)
+else:
+    st.write("Every project passes every check.")
+
+# --------------------------
+# Projects table (one page at a time) + diagrams for the selected row
+# --------------------------
+st.markdown("### 📋 Projects")
+col_sort, col_size, col_page = st.columns(3)
+sort = col_sort.selectbox("Sort by", ["input", "confidence", "name"])
+page_size = col_size.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+pages = max(1, math.ceil(len(result) / page_size))
+page = col_page.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+indices = result.order(sort)[(page - 1) * page_size:page * page_size]
+table = st.dataframe(result.rows(indices), hide_index=True, on_select="rerun", selection_mode="single-row",
+                     key="portfolio_table")
+st.download_button("Download all results (CSV)", results_csv(data), file_name="portfolio_results.csv", mime="text/csv")
+
+selected = table.selection.rows
+if not selected:
+    st.caption("Select a row to see that project's architecture diagrams.")
+else:
+    i = int(indices[selected[0]])
+    report = result.report(i)
+    st.markdown(f"#### {result.names[i]} — {report['confidence']}% confidence")
+    st.write("Profiles:", ", ".join(report["profiles"]))
+    for text in report["remediation"]:
+        st.warning(text)
+    st.markdown("##### AWS architecture")
+    show_diagram(engine.build_aws_dot(report["required_services"], report["recommended_services"]),
+                 f"portfolio_aws_{i}")
+    st.markdown("##### ML pipeline")
+    show_diagram(engine.build_ml_dot(report["ml_pipeline"]), f"portfolio_ml_{i}")
@@ -0,0 +1,241 @@
+# Portfolio evaluation: a CSV of project requirement rows -> columnar results + aggregates.
+#
+#   python portfolio.py projects.csv [-o results.csv]      # prints the aggregates as JSON
+#
+# CSV: one header row, one project per row. Columns (any order, all optional):
+#   name, the 10 slider names (1..10), RPS, DATA_TB, RETENTION, SLA, brief
+# Empty cells take the UI defaults, and values are validated like cli.py specs; a row that does not
+# parse is reported with its line number and skipped.
+#
+# With the built-in rules the whole portfolio goes through batch.evaluate_batch in one vectorised
+# pass (10k rows in milliseconds); with rule packs installed it falls back to engine.evaluate per row.
+# Either way results are kept columnar (bool matrices over services / profiles / checks), so the
+# aggregates are array reductions and a table page only materialises the rows it shows. report(i)
+# builds the full report of one row on demand (for its diagrams).
+
+import argparse
+import csv
+import io
+import json
+import sys
+from collections import Counter
+
+import numpy as np
+
+import batch
+import engine
+from cli import DROPDOWN_SPECS, parse_spec
+from services import REGISTRY
+
+DROPDOWNS = [key for key, _, _ in DROPDOWN_SPECS]
+COLUMNS = ["name"] + engine.PARAM_NAMES + DROPDOWNS + ["brief"]
+
+# --------------------------
+# CSV -> validated rows
+# --------------------------
+def read_csv(text):
+    # -> (names, args, errors): args are engine.evaluate argument tuples, errors [(line, message)]
+    reader = csv.DictReader(io.StringIO(text))
+    unknown = [c for c in reader.fieldnames or [] if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown CSV columns {unknown}; expected some of {COLUMNS}")
+    names, args, errors = [], [], []
+    for record in reader:
+        line = reader.line_num
+        try:
+            spec = {"params": {}}
+            for key, value in record.items():
+                value = (value or "").strip()
+                if key is None or not value or key == "name":
+                    continue
+                if key in DROPDOWNS or key == "brief":
+                    spec[key] = value
+                else:
+                    try:
+                        spec["params"][key] = int(value)
+                    except ValueError:
+                        raise ValueError(f"param {key!r} must be an integer, got {value!r}") from None
+            args.append(parse_spec(spec))
+            names.append((record.get("name") or "").strip() or f"row {line}")
+        except ValueError as e:
+            errors.append((line, str(e)))
+    return names, args, errors
+
+# --------------------------
+# Evaluation
+# --------------------------
+class Portfolio:
+    def __init__(self, names, args):
+        self.names, self.args = names, args
+        n = len(args)
+        self.confidence = np.zeros(n, dtype=np.float64)
+        if engine.RULE_PACKS:
+            self._evaluate_reports()
+        else:
+            self._evaluate_batch()
+        # services used by at least one project, in registry order
+        used = self.required.any(axis=1) | self.recommended.any(axis=1)
+        self.services = [s for s, u in zip(self.services, used) if u]
+        self.required, self.recommended = self.required[used], self.recommended[used]
+
+    def _evaluate_batch(self):
+        args = self.args
+        params = {name: np.fromiter((a[0][name] for a in args), dtype=np.int8, count=len(args))
+                  for name in engine.PARAM_NAMES}
+        codes = [batch.dropdown_codes(options, [a[1 + j] for a in args])
+                 for j, (_, options, _) in enumerate(DROPDOWN_SPECS)]
+        result = batch.evaluate_batch(params, *codes, briefs=[a[5] for a in args] if args else None)
+        self.profiles = list(batch.PROFILES)
+        self.profile_hits = np.array([(result["profiles"] >> np.uint16(i)) & 1 for i in range(len(self.profiles))],
+                                     dtype=bool).reshape(len(self.profiles), len(args))
+        self.services = list(REGISTRY.names)
+        self.required = self._unpack(result["required"])
+        self.recommended = self._unpack(result["recommended"])
+        self.checks = list(batch.CHECKS)
+        self.passed = np.array([result["checks"][k] for k in self.checks], dtype=bool).reshape(len(self.checks), len(args))
+        self.confidence = result["confidence"]
+        # remediation depends only on which checks failed: one engine call per distinct pattern
+        self.remediation = Counter()
+        bits, counts = np.unique(result["check_bits"], return_counts=True)
+        for b, count in zip(bits.tolist(), counts.tolist()):
+            for text in engine.remediation({k: bool(b >> i & 1) for i, k in enumerate(self.checks)}):
+                self.remediation[text] += count
+
+    def _unpack(self, words):
+        # (words, n) uint64 service masks -> (services, n) bool
+        out = np.zeros((len(self.services), words.shape[1]), dtype=bool)
+        for sid in range(len(self.services)):
+            out[sid] = (words[sid >> 6] >> np.uint64(sid & 63)) & np.uint64(1)
+        return out
+
+    def _evaluate_reports(self):
+        reports = [engine.evaluate(*a) for a in self.args]
+        n = len(reports)
+        self.profiles = list(dict.fromkeys(p for r in reports for p in r["profiles"]))
+        self.checks = list(dict.fromkeys(k for r in reports for k in r["checks"]))
+        pids = {p: i for i, p in enumerate(self.profiles)}
+        cids = {k: i for i, k in enumerate(self.checks)}
+        self.profile_hits = np.zeros((len(self.profiles), n), dtype=bool)
+        self.passed = np.zeros((len(self.checks), n), dtype=bool)
+        self.remediation = Counter()
+        tiers = []
+        for j, r in enumerate(reports):
+            for p in r["profiles"]:
+                self.profile_hits[pids[p], j] = True
+            for k, ok in r["checks"].items():
+                self.passed[cids[k], j] = ok
+            self.confidence[j] = r["confidence"]
+            self.remediation.update(r["remediation"])
+            tiers.append((REGISTRY.ids_of(REGISTRY.mask(r["required_services"])),
+                          REGISTRY.ids_of(REGISTRY.mask(r["recommended_services"]))))
+        self.services = list(REGISTRY.names)
+        self.required = np.zeros((len(self.services), n), dtype=bool)
+        self.recommended = np.zeros((len(self.services), n), dtype=bool)
+        for j, (req, rec) in enumerate(tiers):
+            self.required[list(req), j] = True
+            self.recommended[list(rec), j] = True
+
+    def __len__(self):
+        return len(self.args)
+
+    # --------------------------
+    # Aggregates
+    # --------------------------
+    def service_usage(self):
+        # [(service, projects requiring it, projects recommending it)], most used first
+        req, rec = self.required.sum(axis=1), self.recommended.sum(axis=1)
+        rows = [(s, int(a), int(b)) for s, a, b in zip(self.services, req, rec)]
+        return sorted(rows, key=lambda r: (-(r[1] + r[2]), r[0]))
+
+    def heatmap(self):
+        # share of each profile's projects that use each service: (services x profiles) float array
+        used = (self.required | self.recommended).astype(np.float64)
+        hits = self.profile_hits.astype(np.float64)
+        totals = hits.sum(axis=1)
+        return used @ hits.T / np.maximum(totals, 1)
+
+    def profile_frequencies(self):
+        return dict(sorted(zip(self.profiles, self.profile_hits.sum(axis=1).tolist()), key=lambda kv: (-kv[1], kv[0])))
+
+    def confidence_histogram(self):
+        values, counts = np.unique(self.confidence, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    def top_remediation(self, k=10):
+        return self.remediation.most_common(k)
+
+    def summary(self):
+        return {
+            "projects": len(self),
+            "mean_confidence": round(float(self.confidence.mean()), 1) if len(self) else None,
+            "profiles": self.profile_frequencies(),
+            "confidence": self.confidence_histogram(),
+            "services": {s: {"required": a, "recommended": b} for s, a, b in self.service_usage()},
+            "remediation": dict(self.top_remediation()),
+        }
+
+    # --------------------------
+    # Rows
+    # --------------------------
+    def order(self, by="input"):
+        if by == "confidence":
+            return np.argsort(self.confidence, kind="stable")
+        if by == "name":
+            return np.array(sorted(range(len(self)), key=self.names.__getitem__), dtype=np.int64)
+        return np.arange(len(self))
+
+    def rows(self, indices):
+        # table rows for the given row indices only
+        out = []
+        for i in indices:
+            i = int(i)
+            params, rps, tb, retention, sla, brief = self.args[i]
+            out.append({
+                "name": self.names[i],
+                "confidence": float(self.confidence[i]),
+                "profiles": ", ".join(p for p, hit in zip(self.profiles, self.profile_hits[:, i]) if hit),
+                "required": int(self.required[:, i].sum()),
+                "recommended": int(self.recommended[:, i].sum()),
+                "failed checks": ", ".join(k for k, ok in zip(self.checks, self.passed[:, i]) if not ok),
+                "RPS": rps, "DATA_TB": tb, "RETENTION": retention, "SLA": sla,
+            })
+        return out
+
+    def report(self, i):
+        return engine.evaluate(*self.args[i])
+
+    def to_csv(self):
+        out = io.StringIO()
+        rows = self.rows(range(len(self)))
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else ["name"])
+        writer.writeheader()
+        writer.writerows(rows)
+        return out.getvalue()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Evaluate a CSV portfolio of projects and print the aggregates.")
+    ap.add_argument("input", help="CSV file ('-' for stdin)")
+    ap.add_argument("-o", "--output", default=None, help="also write one result row per project to this CSV")
+    ap.add_argument("--rules", action="append", default=[], help="extra JSON rule pack (see rules.py); repeatable")
+    args = ap.parse_args(argv)
+    for path in args.rules:
+        try:
+            engine.load_rule_pack(path)
+        except (OSError, ValueError) as e:
+            ap.error(f"{path}: {e}")
+    text = sys.stdin.read() if args.input == "-" else open(args.input, encoding="utf-8").read()
+    try:
+        names, rows, errors = read_csv(text)
+    except ValueError as e:
+        ap.error(str(e))
+    for line, message in errors:
+        print(f"line {line}: {message}", file=sys.stderr)
+    result = Portfolio(names, rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            f.write(result.to_csv())
+    json.dump(result.summary(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,535 @@
+# Declarative rule engine: decision rules are plain data, compiled into per-stage indexes.
+#
+# A rule pack is a dict of stage -> list of rules (JSON-compatible, see load_pack()):
+#   {"profiles": [{"when": [["Model Complexity", ">=", 8], ["Data Variety", ">=", 6]], "profile": "GraphRAG-GenAI"}],
+#    "services": [{"when": [["profiles", "has", "GraphRAG-GenAI"]], "required": ["Neptune"], "recommended": []}]}
+#
+# A rule fires when every condition in "when" holds ("when": [] always fires). Conditions are triples:
+#   ["Model Complexity", ">=", 8]            slider; ops >=, <=, ==
+#   ["rps", "in", ["high", "very_high"]]     dropdown rps / tb / retention / sla; ops in, not_in
+#   ["brief", "contains_any", ["sap"]]       case-insensitive substring of the brief
+#   ["profiles", "has", "ERP-Integrated"]    detected profile
+#   ["services", "has_any", ["Glue"]]        required or recommended service (names or a registry mask)
+#   ["checks", "failed", "Security"]         check outcome
+# Effects per stage:
+#   profiles     "profile": name; "fallback": true fires only when no other profile rule did
+#   services     "required" / "recommended": service names or a registry mask
+#   ml_pipeline  "components": [names]
+#   checks       "check": name plus one of "any" / "all": services, "pipeline_all": components, "pass": bool;
+#                the first fired rule of each check decides it, a check with no fired rule fails
+#   remediation  "text": str
+#
+# Matching never walks the rule list. Every distinct condition in a stage is an atom; each input
+# value (slider value, dropdown value, profile, failed check) maps to the pre-ORed effects of the
+# single-condition rules it satisfies plus the multi-condition rules it contributes to, computed
+# once per value and memoised. Brief keywords go through one keyword regex and services through
+# per-service postings. Multi-condition rules fire when their counter reaches their atom count, so
+# a match costs one lookup per input value plus the conditions it actually satisfies.
+
+import hashlib
+import json
+import re
+from operator import getitem, itemgetter
+
+from services import REGISTRY, ServiceSet
+
+STAGES = ["profiles", "services", "ml_pipeline", "checks", "remediation"]
+DROPDOWN_FIELDS = ["rps", "tb", "retention", "sla"]
+SLIDER_OPS = (">=", "<=", "==")
+
+# the inputs each stage's engine function receives, and so the only fields its rules may test
+STAGE_FIELDS = {
+    "profiles": {"slider", "rps", "tb", "retention", "sla", "brief"},
+    "services": {"slider", "rps", "tb", "retention", "sla", "profiles"},
+    "ml_pipeline": {"slider", "rps", "tb", "sla", "services"},
+    "checks": {"rps", "tb", "retention", "sla", "services"},
+    "remediation": {"checks"},
+}
+_FIELD_OPS = {"brief": "contains_any", "profiles": "has", "services": "has_any", "checks": "failed"}
+_EFFECT_KEYS = {"profiles": "profile", "ml_pipeline": "components", "checks": "check", "remediation": "text"}
+
+def merge_packs(*packs):
+    merged = {stage: [] for stage in STAGES}
+    for pack in packs:
+        unknown = set(pack) - set(STAGES)
+        if unknown:
+            raise ValueError(f"unknown rule stages {sorted(unknown)}; expected some of {STAGES}")
+        for stage, rules in pack.items():
+            for rule in rules:
+                if not isinstance(rule, dict):
+                    raise ValueError(f"{stage}: rule {rule!r} is not an object")
+                key = _EFFECT_KEYS.get(stage)
+                if key and key not in rule:
+                    raise ValueError(f"{stage}: rule {rule!r} needs a {key!r} entry")
+            merged[stage].extend(rules)
+    return merged
+
+def load_pack(path):
+    with open(path, encoding="utf-8") as f:
+        pack = json.load(f)
+    merge_packs(pack)
+    return pack
+
+def _mask(value):
+    # packs may name services the catalog has not seen yet: compiling a rule interns its names
+    if not value:
+        return 0
+    return ServiceSet.coerce(value).mask if isinstance(value, (ServiceSet, int)) else ServiceSet.of(value).mask
+
+def _condition(stage, cond, param_names):
+    # -> (kind, field, op, value) with value normalised for the index
+    if not isinstance(cond, (list, tuple)) or len(cond) != 3:
+        raise ValueError(f"{stage}: condition {cond!r} is not a [field, op, value] triple")
+    field, op, value = cond
+    if field in DROPDOWN_FIELDS:
+        kind = field
+        if op not in ("in", "not_in"):
+            raise ValueError(f"{stage}: {field} supports 'in' / 'not_in', not {op!r}")
+        value = frozenset([value] if isinstance(value, str) else value)
+    elif field in _FIELD_OPS:
+        kind = field
+        if op != _FIELD_OPS[field]:
+            raise ValueError(f"{stage}: {field} supports {_FIELD_OPS[field]!r}, not {op!r}")
+        if field == "brief":
+            value = tuple(sorted({kw.lower() for kw in ([value] if isinstance(value, str) else value)}))
+            if not all(value):
+                raise ValueError(f"{stage}: brief keywords must be non-empty")
+        elif field == "services":
+            value = _mask(value)
+    else:
+        kind = "slider"
+        if param_names is not None and field not in param_names:
+            raise ValueError(f"{stage}: unknown field {field!r}")
+        if op not in SLIDER_OPS or isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{stage}: slider condition {cond!r} must be [name, >=|<=|==, int]")
+    if kind not in STAGE_FIELDS[stage]:
+        raise ValueError(f"{stage} rules cannot test {field!r}")
+    return kind, field, op, value
+
+def _test(op, value, x):
+    if op == ">=":
+        return x >= value
+    if op == "<=":
+        return x <= value
+    if op == "==":
+        return x == value
+    if op == "not_in":
+        return x not in value
+    # in / has / failed
+    return x in value if isinstance(value, frozenset) else x == value
+
+# One compiled condition against plain inputs, without the index. inputs: "params" dict, the four
+# dropdown values by field, "brief" (lowercased), "profiles" set, "services" mask, "failed" check set.
+def holds(condition, inputs):
+    kind, field, op, value = condition
+    if kind == "slider":
+        return _test(op, value, inputs["params"][field])
+    if kind in DROPDOWN_FIELDS:
+        return _test(op, value, inputs[kind])
+    if kind == "brief":
+        return any(kw in inputs["brief"] for kw in value)
+    if kind == "profiles":
+        return value in inputs["profiles"]
+    if kind == "services":
+        return inputs["services"] & value != 0
+    return value in inputs["failed"]
+
+def trie(words):
+    root = {}
+    for w in words:
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = w
+    return root
+
+def trie_pattern(node):
+    # prefix-factored alternation: the regex engine branches per character instead of per keyword,
+    # and the greedy optional groups report the longest keyword at each position
+    alts = [re.escape(ch) + trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    group = alts[0] if len(alts) == 1 and "" not in node else "(?:" + "|".join(alts) + ")"
+    return group + "?" if "" in node else group
+
+def _contained(root, word):
+    # every keyword occurring inside `word`, by walking the trie from each position
+    out = set()
+    for i in range(len(word)):
+        node = root
+        for ch in word[i:]:
+            node = node.get(ch)
+            if node is None:
+                break
+            if "" in node:
+                out.add(node[""])
+    return out
+
+def _getter(keys):
+    # always returns a tuple, whatever the number of keys
+    if len(keys) > 1:
+        return itemgetter(*keys)
+    if keys:
+        key = keys[0]
+        return lambda obj: (obj[key],)
+    return lambda obj: ()
+
+class _StageIndex:
+    # Every rule's effect is one int, so any set of fired rules reduces to an OR of effects. Union
+    # stages encode their payload (profile / service / component bits); ordered stages (checks,
+    # remediation) encode 1 << rule position and are decoded lowest bit first.
+    def __init__(self, stage):
+        self.stage = stage
+        self.effects = []       # rule position -> effect
+        self.need = []          # rule position -> number of distinct atoms
+        self.always = 0         # OR of the effects of rules without conditions
+        self.atoms = {}         # (field, op, value) -> atom id
+        self.atom_rules = []    # atom id -> [rule positions]
+        self.fields = {}        # single-valued field -> [(op, value, atom id)]
+        self.keywords = {}      # brief keyword -> [atom ids]
+        self.services = {}      # service id -> [atom ids]
+        self.services_mask = 0
+        # Values of a field that satisfy the same atoms form one class. Per field: value -> class id
+        # (memoised) and class id -> (OR of the single-atom rules it fires, multi-atom rules it feeds).
+        self._class_memo = {}
+        self._class_pairs = {}
+        self._class_ids = {}
+        self._combo_memo = {}   # tuple of input class ids -> (effect, unfinished multi-atom entries)
+        self._atom_hits = []    # atom id -> (single-atom effect, multi-atom rule positions)
+        self._keyword_re = None
+        self._keyword_hits = {} # keyword -> (single-atom effect, atoms with multi-atom rules)
+
+    def add(self, conditions, effect):
+        pos = len(self.effects)
+        self.effects.append(effect)
+        atom_ids = set()
+        for kind, field, op, value in conditions:
+            key = (field, op, value)
+            aid = self.atoms.get(key)
+            if aid is None:
+                aid = self.atoms[key] = len(self.atom_rules)
+                self.atom_rules.append([])
+                if kind == "brief":
+                    for kw in value:
+                        self.keywords.setdefault(kw, []).append(aid)
+                elif kind == "services":
+                    for sid in REGISTRY.ids_of(value):
+                        self.services.setdefault(sid, []).append(aid)
+                else:
+                    self.fields.setdefault(field, []).append((op, value, aid))
+            if aid not in atom_ids:
+                atom_ids.add(aid)
+                self.atom_rules[aid].append(pos)
+        self.need.append(len(atom_ids))
+        if not atom_ids:
+            self.always |= effect
+
+    def finish(self):
+        self.services_mask = sum(1 << sid for sid in self.services)
+        self._atom_hits = [self._pair([aid]) for aid in range(len(self.atom_rules))]
+        for field in self.fields:
+            self._class_memo[field] = {}
+            self._class_pairs[field] = []
+            self._class_ids[field] = {}
+        sliders = [f for f in self.fields if f not in DROPDOWN_FIELDS and f not in _FIELD_OPS]
+        dropdowns = [i for i, f in enumerate(DROPDOWN_FIELDS) if f in self.fields]
+        self._slider_get = _getter(sliders)
+        self._dropdown_get = _getter(dropdowns)
+        self._input_fields = sliders + [DROPDOWN_FIELDS[i] for i in dropdowns]
+        self._input_memos = [self._class_memo[f] for f in self._input_fields]
+        self._input_pairs = [self._class_pairs[f] for f in self._input_fields]
+        if self.keywords:
+            root = trie(self.keywords)
+            # the regex reports the longest keyword at each position, so each keyword also carries
+            # the atoms of the shorter keywords it contains
+            self._keyword_re = re.compile("(?=(" + trie_pattern(root) + "))")
+            for kw in self.keywords:
+                atoms = {aid for k in _contained(root, kw) for aid in self.keywords[k]}
+                effect = 0
+                for aid in atoms:
+                    effect |= self._atom_hits[aid][0]
+                self._keyword_hits[kw] = (effect, tuple(aid for aid in atoms if self._atom_hits[aid][1]))
+
+    def _pair(self, atom_ids):
+        effect, multi = 0, []
+        for aid in atom_ids:
+            for r in self.atom_rules[aid]:
+                if self.need[r] == 1:
+                    effect |= self.effects[r]
+                else:
+                    multi.append(r)
+        return effect, tuple(multi)
+
+    def _classify(self, field, x):
+        memo = self._class_memo[field]
+        cid = memo.get(x)
+        if cid is None:
+            pair = self._pair([aid for op, value, aid in self.fields[field] if _test(op, value, x)])
+            ids = self._class_ids[field]
+            cid = ids.get(pair)
+            if cid is None:
+                cid = ids[pair] = len(self._class_pairs[field])
+                self._class_pairs[field].append(pair)
+            if len(memo) >= 4096:
+                memo.clear()
+            memo[x] = cid
+        return cid
+
+    def _count(self, multi, acc):
+        # fire the multi-atom rules whose counters fill up; returns (acc, entries of unfinished rules)
+        counts = {}
+        need = self.need
+        for r in multi:
+            counts[r] = counts.get(r, 0) + 1
+        done = [r for r, c in counts.items() if c == need[r]]
+        for r in done:
+            acc |= self.effects[r]
+        return acc, tuple(r for r in multi if counts[r] != need[r])
+
+    def _inputs(self, classes):
+        acc, multi = self.always, []
+        for pairs, cid in zip(self._input_pairs, classes):
+            effect, m = pairs[cid]
+            acc |= effect
+            multi.extend(m)
+        result = self._count(multi, acc) if multi else (acc, ())
+        if len(self._combo_memo) >= 4096:
+            self._combo_memo.clear()
+        self._combo_memo[classes] = result
+        return result
+
+    # params: slider values; dropdowns: (rps, tb, retention, sla); values: other [(field, value)] inputs.
+    # Returns the OR of every fired rule's effect.
+    def match(self, params=None, dropdowns=(), values=(), brief="", svc=0):
+        keys = self._slider_get(params) + self._dropdown_get(dropdowns)
+        try:
+            classes = tuple(map(getitem, self._input_memos, keys))
+        except KeyError:
+            classes = tuple(self._classify(f, x) for f, x in zip(self._input_fields, keys))
+        found = self._combo_memo.get(classes)
+        acc, pending = found if found is not None else self._inputs(classes)
+
+        multi = []
+        for field, x in values:
+            memo = self._class_memo.get(field)
+            if memo is not None:
+                cid = memo.get(x)
+                effect, m = self._class_pairs[field][cid if cid is not None else self._classify(field, x)]
+                acc |= effect
+                multi.extend(m)
+        atoms = ()
+        if brief and self._keyword_re is not None:
+            atoms = set()
+            for kw in self._keyword_re.findall(brief.lower()):
+                effect, with_multi = self._keyword_hits[kw]
+                acc |= effect
+                atoms.update(with_multi)
+        svc &= self.services_mask
+        if svc:
+            atoms = set(atoms)
+            for sid in _bits(svc):
+                atoms.update(self.services[sid])
+        for aid in atoms:
+            effect, m = self._atom_hits[aid]
+            acc |= effect
+            multi.extend(m)
+        if multi:
+            acc = self._count(list(pending) + multi, acc)[0]
+        return acc
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class RuleSet:
+    # packs: one rule pack or a list of them, merged in order; components: canonical ML component order
+    def __init__(self, packs, components=(), param_names=None):
+        rules = merge_packs(*([packs] if isinstance(packs, dict) else packs))
+        self.rules = rules
+        # names -> bit positions (dicts keep first-seen order)
+        self._profile_ids = {}
+        fallbacks = {}
+        for rule in rules["profiles"]:
+            self._profile_ids.setdefault(rule["profile"], len(self._profile_ids))
+            if rule.get("fallback"):
+                fallbacks[rule["profile"]] = True
+        self._component_ids = {c: i for i, c in enumerate(dict.fromkeys(components))}
+        for rule in rules["ml_pipeline"]:
+            for c in rule["components"]:
+                self._component_ids.setdefault(c, len(self._component_ids))
+        self.profile_names = list(self._profile_ids)
+        self.fallback_profiles = list(fallbacks)
+        self.components = list(self._component_ids)
+        self.check_names = []
+        service_masks = [(_mask(rule.get("required")), _mask(rule.get("recommended"))) for rule in rules["services"]]
+        # services effect = required | recommended << width (every rule mask fits below width once interned)
+        self._width = len(REGISTRY)
+        self._check_rules = {}
+        self._verdicts = []
+        self._ml_lists = {}
+        self._check_memo = {}
+        self._remediation_memo = {}
+
+        self.index = {stage: _StageIndex(stage) for stage in STAGES}
+        # compiled conditions per rule, in rule order (for holds(): rule-by-rule evaluation)
+        self.conditions = {stage: [] for stage in STAGES}
+        for stage in STAGES:
+            idx = self.index[stage]
+            for pos, rule in enumerate(rules[stage]):
+                conditions = [_condition(stage, c, param_names) for c in rule.get("when", [])]
+                self.conditions[stage].append(conditions)
+                if stage == "services":
+                    req, rec = service_masks[pos]
+                    effect = req | rec << self._width
+                else:
+                    effect = self._effect(stage, pos, rule)
+                idx.add(conditions, effect)
+            idx.finish()
+        self._profile_sets = {}
+        # services any check rule looks at, and the checks decided by the ML pipeline instead
+        self._check_services = 0
+        for kind, operand in self._verdicts:
+            if kind in ("any", "all"):
+                self._check_services |= operand
+
+    def _effect(self, stage, pos, rule):
+        if stage == "profiles":
+            offset = len(self.profile_names) if rule.get("fallback") else 0
+            return 1 << (self._profile_ids[rule["profile"]] + offset)
+        if stage == "ml_pipeline":
+            return sum(1 << self._component_ids[c] for c in set(rule["components"]))
+        if stage == "checks":
+            name = rule["check"]
+            if name not in self._check_rules:
+                self.check_names.append(name)
+                self._check_rules[name] = 0
+            self._check_rules[name] |= 1 << pos
+            kinds = [k for k in ("any", "all", "pipeline_all", "pass") if k in rule]
+            if len(kinds) != 1:
+                raise ValueError(f"check rule for {name!r} needs exactly one of any / all / pipeline_all / pass")
+            kind = kinds[0]
+            self._verdicts.append((kind, _mask(rule[kind]) if kind in ("any", "all") else rule[kind]))
+            return 1 << pos
+        return 1 << pos
+
+    # --------------------------
+    # Stages (same signatures and results as the engine functions they back)
+    # --------------------------
+    def profiles(self, params, brief_text, rps, tb, retention, sla):
+        fired = self.index["profiles"].match(params, (rps, tb, retention, sla), brief=brief_text)
+        n = len(self.profile_names)
+        bits = fired & ((1 << n) - 1) or fired >> n
+        names = self._profile_sets.get(bits)
+        if names is None:
+            names = frozenset(self.profile_names[i] for i in _bits(bits))
+            if len(self._profile_sets) >= 4096:
+                self._profile_sets.clear()
+            self._profile_sets[bits] = names
+        return set(names)
+
+    def services(self, profiles, rps, tb, retention, sla, params):
+        fired = self.index["services"].match(params, (rps, tb, retention, sla), [("profiles", p) for p in profiles])
+        required = fired & ((1 << self._width) - 1)
+        return ServiceSet(required), ServiceSet((fired >> self._width) & ~required)
+
+    def ml_pipeline(self, svc, params, rps, tb, sla):
+        covered = self.index["ml_pipeline"].match(params, (rps, tb, None, sla), svc=svc)
+        ordered = self._ml_lists.get(covered)
+        if ordered is None:
+            ordered = tuple(c for i, c in enumerate(self.components) if covered >> i & 1)
+            ordered += tuple(c for i, c in enumerate(self.components) if not covered >> i & 1)
+            if len(self._ml_lists) >= 4096:
+                self._ml_lists.clear()
+            self._ml_lists[covered] = ordered
+        return list(ordered)
+
+    def checks(self, svc, ml_components, rps, tb, retention, sla):
+        fired = self.index["checks"].match(None, (rps, tb, retention, sla), svc=svc)
+        key = (fired, svc & self._check_services)
+        decided = self._check_memo.get(key)
+        if decided is None:
+            # verdicts that only depend on fired rules + services; pipeline checks stay open
+            decided, pipeline = {}, []
+            for name in self.check_names:
+                hit = fired & self._check_rules[name]
+                kind, operand = self._verdicts[(hit & -hit).bit_length() - 1] if hit else ("pass", False)
+                if kind == "any":
+                    decided[name] = svc & operand != 0
+                elif kind == "all":
+                    decided[name] = svc & operand == operand
+                elif kind == "pipeline_all":
+                    decided[name] = None
+                    pipeline.append((name, operand))
+                else:
+                    decided[name] = bool(operand)
+            decided = (decided, tuple(pipeline))
+            if len(self._check_memo) >= 4096:
+                self._check_memo.clear()
+            self._check_memo[key] = decided
+        out = dict(decided[0])
+        for name, components in decided[1]:
+            out[name] = all(x in ml_components for x in components)
+        return out
+
+    def remediation(self, checks):
+        failed = tuple(k for k, ok in checks.items() if not ok)
+        texts = self._remediation_memo.get(failed)
+        if texts is None:
+            fired = self.index["remediation"].match(values=[("checks", k) for k in failed])
+            texts = tuple(self.rules["remediation"][r]["text"] for r in _bits(fired))
+            if len(self._remediation_memo) >= 4096:
+                self._remediation_memo.clear()
+            self._remediation_memo[failed] = texts
+        return list(texts)
+
+    # --------------------------
+    # What the rules read, for equivalence-class derivation (eqtable.derive_classes)
+    # --------------------------
+    def reads(self, stages=None):
+        cuts, directions = {}, {}
+        subsets = {field: [] for field in DROPDOWN_FIELDS}
+        keyword_sites = {}
+        for stage in stages or STAGES:
+            idx = self.index[stage]
+            for (field, op, value), aid in idx.atoms.items():
+                if field in subsets:
+                    subsets[field].append(set(value))
+                elif field == "brief":
+                    for kw in value:
+                        keyword_sites.setdefault(kw, set()).add((stage, aid))
+                elif field not in _FIELD_OPS:
+                    cuts.setdefault(field, set()).update(
+                        (value,) if op == ">=" else (value + 1,) if op == "<=" else (value, value + 1))
+                    directions.setdefault(field, set()).add({">=": "up", "<=": "down"}.get(op, "eq"))
+        return {"cuts": cuts, "directions": directions, "subsets": subsets, "keyword_sites": keyword_sites}
+
+    def size(self):
+        return {stage: len(idx.effects) for stage, idx in self.index.items()}
+
+    # content hash of the merged rules, service masks spelled out as names (for artefacts built from them)
+    def fingerprint(self):
+        def names(value):
+            return sorted(value) if isinstance(value, (list, tuple)) else list(REGISTRY.names_of(_mask(value)))
+        data = {"components": self.components}
+        for stage in STAGES:
+            out = data[stage] = []
+            for rule in self.rules[stage]:
+                rule = dict(rule)
+                for key in ("required", "recommended", "any", "all"):
+                    if key in rule:
+                        rule[key] = names(rule[key])
+                rule["when"] = [[f, op, names(v) if f == "services" else sorted(v) if isinstance(v, (set, frozenset)) else v]
+                                for f, op, v in rule.get("when", [])]
+                out.append(rule)
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        sys.exit("usage: python rules.py PACK.json [PACK.json ...]   # validate rule packs against the engine")
+    import engine
+    for path in sys.argv[1:]:
+        engine.load_rule_pack(path)
+    print(f"rules per stage: {engine.RULESET.size()}")
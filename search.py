@@ -0,0 +1,190 @@
+# Inverse search: the least-demanding inputs that still produce a set of target checks / services.
+#
+#   python search.py --pass SLA HighRPS --include Neptune Bedrock --min-confidence 90
+#   python search.py --include Redshift --cost-weights weights.json --with-recommended
+#
+# Objectives (both minimised, Pareto front returned):
+#   cost   - number of required services, or the sum of per-service weights (optionally incl. recommended)
+#   demand - how far the inputs sit from the bottom of every control (slider - 1 + dropdown option index)
+#
+# The search never enumerates the 10^10 slider grid. Inputs are reduced to their equivalence
+# classes (eqtable.derive_classes) and each class is represented by its smallest value, which is
+# always the least demanding member. A depth-first branch-and-bound then fixes the dropdowns first
+# and the sliders one at a time. It relies on the structure of detect_profiles / compose_services:
+# with the dropdowns fixed, every slider rule is an upward threshold (`slider >= t`) that only ever
+# adds profiles or services. Setting the still-open sliders to their minimum therefore gives a
+# lower bound on the final service set, and setting them to their maximum gives an upper bound.
+# The one exception is a fallback profile (Baseline-RAG), which only fires when nothing else does;
+# the bounds account for it. Subtrees whose service upper bound misses a required service are pruned, and so are
+# subtrees whose (cost, demand) lower bound is already dominated by a solution found earlier.
+
+import argparse
+import json
+import sys
+
+import engine
+from eqtable import derive_classes
+from services import REGISTRY
+
+DROPDOWN_AXES = [
+    ("RPS", engine.RPS_OPTIONS),
+    ("DATA_TB", engine.DATA_TB_OPTIONS),
+    ("RETENTION", engine.RETENTION_OPTIONS),
+    ("SLA", engine.SLA_OPTIONS),
+]
+
+class _Cost:
+    def __init__(self, weights=None, include_recommended=False):
+        self.weights = weights
+        self.include_recommended = include_recommended
+
+    def services(self, required, recommended):
+        return required.mask | recommended.mask if self.include_recommended else required.mask
+
+    def __call__(self, mask):
+        if self.weights is None:
+            return mask.bit_count()
+        return sum(self.weights.get(REGISTRY.names[i], 1.0) for i in REGISTRY.ids_of(mask))
+
+def _dominates(a, b):
+    return a[0] <= b[0] and a[1] <= b[1]
+
+class InverseSearch:
+    def __init__(self, must_pass=(), must_include=(), min_confidence=None, cost_weights=None,
+                 include_recommended=False, brief=""):
+        self.must_pass = list(must_pass)
+        self.min_confidence = min_confidence
+        self.brief = brief
+        self.cost = _Cost(cost_weights, include_recommended)
+        unknown = [name for name in must_include if name not in REGISTRY.ids]
+        if unknown:
+            raise ValueError(f"unknown services {unknown}")
+        self.must_include = REGISTRY.mask(must_include)
+
+        spec = derive_classes()
+        not_increasing = [s["name"] for s in spec["sliders"] if not s["increasing"]]
+        if not_increasing:
+            raise ValueError(f"inverse search needs upward slider thresholds; not monotone: {not_increasing}")
+        unknown = [c for c in self.must_pass if c not in engine.WEIGHTS]
+        if unknown:
+            raise ValueError(f"unknown checks {unknown}; expected some of {list(engine.WEIGHTS)}")
+        # one representative (the class minimum) per slider / dropdown class, lowest first
+        self.slider_axes = [(s["name"], [engine.PARAM_MIN] + s["cuts"]) for s in spec["sliders"] if s["cuts"]]
+        self.dropdown_axes = []
+        for (key, options), d in zip(DROPDOWN_AXES, spec["dropdowns"]):
+            order = [v for v, _ in options]
+            self.dropdown_axes.append((key, [(cls[0], order.index(cls[0])) for cls in d["classes"]]))
+        # fallback profiles (Baseline-RAG) only fire when nothing else does, so they bound the top end only
+        self.fallbacks = set(engine.RULESET.fallback_profiles)
+        self.nodes = 0
+        self.leaves = 0
+
+    def _services(self, params, dropdowns, fallbacks=None):
+        rps, tb, retention, sla = dropdowns
+        profiles = engine.detect_profiles(params, self.brief, rps, tb, retention, sla)
+        if fallbacks == "drop":
+            profiles -= self.fallbacks
+        elif fallbacks == "add":
+            profiles |= self.fallbacks
+        return engine.compose_services(profiles, rps, tb, retention, sla, params)
+
+    def _bounds(self, fixed, dropdowns):
+        # lower / upper bound on the cost-relevant service mask and the full service mask
+        low = {name: fixed.get(name, engine.PARAM_MIN) for name in engine.PARAM_NAMES}
+        high = {name: fixed.get(name, engine.PARAM_MAX) for name in engine.PARAM_NAMES}
+        req_lo, rec_lo = self._services(low, dropdowns, fallbacks="drop")
+        req_hi, rec_hi = self._services(high, dropdowns, fallbacks="add")
+        upper_all = req_hi.mask | rec_hi.mask
+        return self.cost(self.cost.services(req_lo, rec_lo)), upper_all
+
+    def _insert(self, front, point):
+        if any(_dominates(p["objective"], point["objective"]) for p in front):
+            return
+        front[:] = [p for p in front if not _dominates(point["objective"], p["objective"])]
+        front.append(point)
+
+    def _leaf(self, front, fixed, dropdowns, demand):
+        self.leaves += 1
+        params = {name: fixed.get(name, engine.PARAM_MIN) for name in engine.PARAM_NAMES}
+        rps, tb, retention, sla = dropdowns
+        report = engine.evaluate(params, rps, tb, retention, sla, self.brief)
+        if not all(report["checks"][c] for c in self.must_pass):
+            return
+        if self.min_confidence is not None and report["confidence"] < self.min_confidence:
+            return
+        required, recommended = self._services(params, dropdowns)
+        if (required.mask | recommended.mask) & self.must_include != self.must_include:
+            return
+        cost = self.cost(self.cost.services(required, recommended))
+        self._insert(front, {"objective": (cost, demand), "report": report})
+
+    def _descend(self, front, fixed, dropdowns, depth, demand):
+        self.nodes += 1
+        cost_lb, upper = self._bounds(fixed, dropdowns)
+        if upper & self.must_include != self.must_include:
+            return
+        if any(_dominates(p["objective"], (cost_lb, demand)) for p in front):
+            return
+        if depth == len(self.slider_axes):
+            self._leaf(front, fixed, dropdowns, demand)
+            return
+        name, values = self.slider_axes[depth]
+        for v in values:
+            fixed[name] = v
+            self._descend(front, fixed, dropdowns, depth + 1, demand + v - engine.PARAM_MIN)
+        del fixed[name]
+
+    def _dropdowns(self, front, chosen, demand):
+        if len(chosen) == len(self.dropdown_axes):
+            self._descend(front, {}, tuple(chosen), 0, demand)
+            return
+        _, classes = self.dropdown_axes[len(chosen)]
+        for value, level in classes:
+            self._dropdowns(front, chosen + [value], demand + level)
+
+    def run(self):
+        front = []
+        self._dropdowns(front, [], 0)
+        front.sort(key=lambda p: p["objective"])
+        return [
+            {
+                "cost": p["objective"][0],
+                "demand": p["objective"][1],
+                "params": p["report"]["params"],
+                "deterministic_inputs": p["report"]["deterministic_inputs"],
+                "required_services": p["report"]["required_services"],
+                "recommended_services": p["report"]["recommended_services"],
+                "checks": p["report"]["checks"],
+                "confidence": p["report"]["confidence"],
+            }
+            for p in front
+        ]
+
+def search(must_pass=(), must_include=(), min_confidence=None, cost_weights=None, include_recommended=False, brief=""):
+    return InverseSearch(must_pass, must_include, min_confidence, cost_weights, include_recommended, brief).run()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Find the least-demanding inputs that meet target checks and services.")
+    ap.add_argument("--pass", dest="must_pass", nargs="*", default=[], help=f"checks that must pass: {' '.join(engine.WEIGHTS)}")
+    ap.add_argument("--include", nargs="*", default=[], help="services that must appear (required or recommended)")
+    ap.add_argument("--min-confidence", type=float, default=None)
+    ap.add_argument("--cost-weights", default=None, help="JSON file of {service: weight}; default counts services")
+    ap.add_argument("--with-recommended", action="store_true", help="cost recommended services too")
+    ap.add_argument("--brief", default="")
+    args = ap.parse_args(argv)
+
+    weights = None
+    if args.cost_weights:
+        with open(args.cost_weights, encoding="utf-8") as f:
+            weights = json.load(f)
+    try:
+        s = InverseSearch(args.must_pass, args.include, args.min_confidence, weights, args.with_recommended, args.brief)
+    except ValueError as e:
+        ap.error(str(e))
+    results = s.run()
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    print(f"{len(results)} Pareto-minimal configuration(s); {s.nodes} nodes / {s.leaves} leaves explored", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+# Local HTTP service for the engine: asyncio, standard library only.
+#
+#   python server.py --port 8080 [--workers 2] [--cache-size 4096] [--table eqtable.bin] [--rules pack.json]
+#
+#   POST /evaluate   spec            -> the engine report (what cli.py writes per line)
+#   POST /report     spec            -> the app's report: the engine report + the simulated "latency" section
+#   POST /dot        spec            -> {"aws": DOT, "ml": DOT}, the two diagrams the app draws
+#   POST /batch      {"specs": [spec, ...], "endpoint": "evaluate" | "report" | "dot"}  (or a bare list)
+#                                    -> one result per spec, in order; a bad spec gives {"error": ..., "index": i}
+#   GET  /health, /stats (cache counters), /metrics (Prometheus text)
+#
+# A spec is a cli.py input line: {"params": {...}, "RPS": ..., "DATA_TB": ..., "RETENTION": ..., "SLA": ...,
+# "brief": ...}; missing values take the UI defaults. "documents" is refused: the server does not read
+# local files on behalf of clients (send the document tags in the brief instead).
+#
+# Responses are cached as encoded bytes in a bounded LRU keyed on the canonical inputs (the validated
+# sliders, dropdowns and brief), so equal specs written differently share an entry; a cached report keeps
+# the generated_at of its first evaluation. Cache hits are answered straight from the protocol callback.
+# Misses run on a small thread pool so the loop keeps serving hits meanwhile, and identical requests that
+# arrive while one is being computed wait for that computation instead of starting their own.
+# Connections are HTTP/1.1 keep-alive; pipelined requests are answered in order.
+
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import engine
+import latency
+from cli import parse_spec
+from metrics import METRICS
+
+MAX_BODY = 16 << 20
+MAX_BATCH = 10000
+ENDPOINTS = ["evaluate", "report", "dot"]
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+          413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented"}
+
+class LRUCache:
+    def __init__(self, size):
+        self.size = size
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key):
+        # lookup that neither counts nor refreshes recency
+        return self._data.get(key)
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _error(message):
+    return json.dumps({"error": message}).encode("utf-8")
+
+# --------------------------
+# Engine side: canonical keys, cache, coalescing
+# --------------------------
+class EngineService:
+    def __init__(self, cache_size=4096, workers=1, evaluate=None, latency_samples=latency.SAMPLES):
+        self.cache = LRUCache(cache_size)
+        self.evaluate = evaluate or engine.evaluate
+        self.latency_samples = latency_samples
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="engine")
+        self.inflight = {}
+        self.coalesced = 0
+        self.requests = dict.fromkeys(ENDPOINTS + ["batch"], 0)
+
+    def parse(self, spec):
+        # -> (cache key, engine.evaluate arguments); ValueError on a bad spec
+        if not isinstance(spec, dict):
+            raise ValueError("a spec must be a JSON object")
+        if spec.get("documents"):
+            raise ValueError("documents are not read over HTTP; put their tags in the brief")
+        args = parse_spec(spec)
+        params, rps, tb, retention, sla, brief = args
+        return (tuple(params[name] for name in engine.PARAM_NAMES), rps, tb, retention, sla, brief), args
+
+    def compute(self, endpoint, args):
+        report = self.evaluate(*args)
+        if endpoint == "dot":
+            out = {"aws": engine.build_aws_dot(report["required_services"], report["recommended_services"]),
+                   "ml": engine.build_ml_dot(report["ml_pipeline"])}
+        else:
+            out = report
+            if endpoint == "report":
+                with METRICS.stage("latency_simulation"):
+                    out["latency"] = latency.simulate_report(report, self.latency_samples)
+        with METRICS.stage("report_serialisation"):
+            return json.dumps(out).encode("utf-8")
+
+    def cached(self, endpoint, key):
+        return self.cache.get((endpoint, key))
+
+    async def get(self, endpoint, key, args):
+        body = self.cache.get((endpoint, key))
+        if body is not None:
+            return body
+        return await self.fill(endpoint, key, args)
+
+    # a cache miss: join the identical computation in flight, or start it
+    async def fill(self, endpoint, key, args):
+        full = (endpoint, key)
+        body = self.cache.peek(full)
+        if body is not None:
+            return body
+        pending = self.inflight.get(full)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        loop = asyncio.get_running_loop()
+        pending = self.inflight[full] = loop.create_future()
+        try:
+            body = await loop.run_in_executor(self.pool, self.compute, endpoint, args)
+        except Exception as e:
+            pending.set_exception(e)
+            pending.exception()  # retrieved: nobody may be waiting
+            raise
+        else:
+            self.cache.put(full, body)
+            pending.set_result(body)
+            return body
+        finally:
+            del self.inflight[full]
+
+    async def batch(self, endpoint, specs):
+        async def one(i, spec):
+            try:
+                key, args = self.parse(spec)
+            except ValueError as e:
+                return json.dumps({"error": str(e), "index": i}).encode("utf-8")
+            except Exception as e:
+                return json.dumps({"error": f"{type(e).__name__}: {e}", "index": i}).encode("utf-8")
+            try:
+                return await self.get(endpoint, key, args)
+            except Exception as e:
+                return json.dumps({"error": f"{type(e).__name__}: {e}", "index": i}).encode("utf-8")
+        bodies = await asyncio.gather(*(one(i, spec) for i, spec in enumerate(specs)))
+        return b"[" + b",".join(bodies) + b"]"
+
+    def stats(self):
+        return {"cache_entries": len(self.cache), "cache_size": self.cache.size, "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses, "coalesced": self.coalesced, "inflight": len(self.inflight),
+                "requests": dict(self.requests)}
+
+    # -> (status, body, content type), or an awaitable of it when the answer has to be computed
+    def handle(self, method, path, body):
+        route = path.split("?", 1)[0].rstrip("/") or "/"
+        name = route[1:]
+        if method == "GET":
+            if route == "/health":
+                return 200, b'{"status":"ok"}', "application/json"
+            if route == "/stats":
+                return 200, json.dumps(self.stats()).encode("utf-8"), "application/json"
+            if route == "/metrics":
+                for k, v in self.stats().items():
+                    if not isinstance(v, dict):
+                        METRICS.set_gauge(f"server_{k}", v)
+                for endpoint, n in self.requests.items():
+                    METRICS.set_gauge("server_requests", n, endpoint=endpoint)
+                return 200, METRICS.prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+            if name in ENDPOINTS or name == "batch":
+                return 405, _error(f"use POST {route}"), "application/json"
+            return 404, _error(f"no route {route}"), "application/json"
+        if method != "POST":
+            return 405, _error(f"method {method} not allowed"), "application/json"
+        if name not in ENDPOINTS and name != "batch":
+            return 404, _error(f"no route {route}"), "application/json"
+        self.requests[name] += 1
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            return 400, _error(f"invalid JSON: {e}"), "application/json"
+        if name == "batch":
+            return self._batch(payload)
+        try:
+            key, args = self.parse(payload)
+        except ValueError as e:
+            return 400, _error(str(e)), "application/json"
+        except Exception as e:
+            return 500, _error(f"{type(e).__name__}: {e}"), "application/json"
+        hit = self.cached(name, key)
+        if hit is not None:
+            return 200, hit, "application/json"
+        return self._compute(name, key, args)
+
+    def _batch(self, payload):
+        endpoint = "evaluate"
+        if isinstance(payload, dict):
+            endpoint = payload.get("endpoint", endpoint)
+            payload = payload.get("specs")
+        if not isinstance(payload, list):
+            return 400, _error('expected {"specs": [...]} or a JSON list of specs'), "application/json"
+        if endpoint not in ENDPOINTS:
+            return 400, _error(f"endpoint must be one of {ENDPOINTS}"), "application/json"
+        if len(payload) > MAX_BATCH:
+            return 413, _error(f"at most {MAX_BATCH} specs per batch"), "application/json"
+        return self._respond_batch(endpoint, payload)
+
+    async def _respond_batch(self, endpoint, specs):
+        try:
+            return 200, await self.batch(endpoint, specs), "application/json"
+        except Exception as e:
+            return 500, _error(f"{type(e).__name__}: {e}"), "application/json"
+
+    async def _compute(self, endpoint, key, args):
+        try:
+            return 200, await self.fill(endpoint, key, args), "application/json"
+        except Exception as e:
+            return 500, _error(f"{type(e).__name__}: {e}"), "application/json"
+
+# --------------------------
+# HTTP/1.1 on asyncio.Protocol
+# --------------------------
+def _response(status, body, content_type, keep_alive):
+    head = (f"HTTP/1.1 {status} {STATUS.get(status, '')}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n" + ("" if keep_alive else "Connection: close\r\n") + "\r\n")
+    return head.encode("latin-1") + body
+
+class HTTPProtocol(asyncio.Protocol):
+    def __init__(self, service):
+        self.service = service
+        self.buffer = bytearray()
+        self.busy = False
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+    def data_received(self, data):
+        self.buffer += data
+        if not self.busy:
+            self._process()
+
+    def _parse(self):
+        # one complete request off the buffer -> (method, path, body, keep_alive), None if incomplete
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self.buffer) > 65536:
+                raise HTTPError(413, "request head too large")
+            return None
+        lines = bytes(self.buffer[:end]).decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3:
+            raise HTTPError(400, "malformed request line")
+        method, path, version = parts
+        headers = {}
+        for line in lines[1:]:
+            k, _, v = line.partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(501, "chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "bad Content-Length") from None
+        if length < 0:
+            raise HTTPError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, f"body over {MAX_BODY} bytes")
+        if len(self.buffer) < end + 4 + length:
+            return None
+        body = bytes(self.buffer[end + 4:end + 4 + length])
+        del self.buffer[:end + 4 + length]
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, path, body, keep_alive
+
+    def _process(self):
+        while not self.busy and self.transport is not None:
+            try:
+                request = self._parse()
+            except HTTPError as e:
+                self._send(e.status, _error(str(e)), "application/json", False)
+                return
+            if request is None:
+                return
+            method, path, body, keep_alive = request
+            try:
+                result = self.service.handle(method, path, body)
+            except Exception as e:
+                result = 500, _error(f"{type(e).__name__}: {e}"), "application/json"
+            if isinstance(result, tuple):
+                self._send(*result, keep_alive)
+            else:
+                # computed answer: stop reading so pipelined requests keep their order
+                self.busy = True
+                self.transport.pause_reading()
+                asyncio.ensure_future(result).add_done_callback(partial(self._done, keep_alive))
+
+    def _done(self, keep_alive, task):
+        self.busy = False
+        if self.transport is None:
+            return
+        # the handlers answer their own errors; anything escaping them still gets a response
+        if task.cancelled():
+            result = 500, _error("request cancelled"), "application/json"
+        elif task.exception() is not None:
+            e = task.exception()
+            result = 500, _error(f"{type(e).__name__}: {e}"), "application/json"
+        else:
+            result = task.result()
+        self._send(*result, keep_alive)
+        if self.transport is not None:
+            self.transport.resume_reading()
+            self._process()
+
+    def _send(self, status, body, content_type, keep_alive):
+        self.transport.write(_response(status, body, content_type, keep_alive))
+        if not keep_alive:
+            self.transport.close()
+            self.transport = None
+
+async def serve(host="127.0.0.1", port=8080, service=None):
+    service = service or EngineService()
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: HTTPProtocol(service), host, port)
+    print(f"serving on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve evaluate / report / dot / batch over HTTP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--workers", type=int, default=1, help="threads computing cache misses")
+    ap.add_argument("--cache-size", type=int, default=4096, help="LRU response cache entries (0 = off)")
+    ap.add_argument("--latency-samples", type=int, default=latency.SAMPLES, help="simulated requests for /report")
+    ap.add_argument("--table", default=None, help="serve from a prebuilt equivalence table (see eqtable.py)")
+    ap.add_argument("--rules", action="append", default=[], help="extra JSON rule pack (see rules.py); repeatable")
+    args = ap.parse_args(argv)
+    for path in args.rules:
+        try:
+            engine.load_rule_pack(path)
+        except (OSError, ValueError) as e:
+            ap.error(f"{path}: {e}")
+    evaluate = None
+    if args.table:
+        import eqtable
+        try:
+            evaluate = eqtable.EquivalenceTable.load(args.table).evaluate
+        except (OSError, ValueError) as e:
+            ap.error(f"{args.table}: {e}")
+    service = EngineService(args.cache_size, args.workers, evaluate, args.latency_samples)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
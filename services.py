@@ -0,0 +1,134 @@
+# Interned AWS service catalog + integer-bitmask service sets.
+# Every service name gets a small integer ID; a set of services is one Python int with those bits set,
+# so unions, differences and "any of / all of" checks are single bit operations. Names only come back
+# out (alphabetically sorted, like the original sorted() lists) at the output edge.
+
+class ServiceRegistry:
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        self._sorted_cache = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        sid = self.ids.get(name)
+        if sid is None:
+            sid = self.ids[name] = len(self.names)
+            self.names.append(name)
+            # sort order may change for masks touching the new name
+            self._sorted_cache.clear()
+        return sid
+
+    def bit(self, name):
+        return 1 << self.intern(name)
+
+    def mask(self, names):
+        m = 0
+        for name in names:
+            m |= 1 << self.intern(name)
+        return m
+
+    # like mask(), but only for names already interned: unknown names raise ValueError instead of growing the catalog
+    def lookup(self, names):
+        m = 0
+        unknown = []
+        for name in names:
+            sid = self.ids.get(name)
+            if sid is None:
+                unknown.append(name)
+            else:
+                m |= 1 << sid
+        if unknown:
+            raise ValueError(f"unknown services {unknown}")
+        return m
+
+    def ids_of(self, mask):
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(low.bit_length() - 1)
+            mask ^= low
+        return out
+
+    # sorted tuple of names for a mask (memoised: a handful of distinct masks dominate real traffic)
+    def names_of(self, mask):
+        names = self._sorted_cache.get(mask)
+        if names is None:
+            names = tuple(sorted(self.names[i] for i in self.ids_of(mask)))
+            if len(self._sorted_cache) >= 65536:
+                self._sorted_cache.clear()
+            self._sorted_cache[mask] = names
+        return names
+
+    def __len__(self):
+        return len(self.names)
+
+REGISTRY = ServiceRegistry()
+
+class ServiceSet:
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def of(cls, names):
+        return cls(REGISTRY.mask(names))
+
+    # accept a ServiceSet, a raw mask or any iterable of known service names (of() is the one that interns)
+    @classmethod
+    def coerce(cls, value):
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, int):
+            return cls(value)
+        return cls(REGISTRY.lookup(value))
+
+    def names(self):
+        return REGISTRY.names_of(self.mask)
+
+    def any_of(self, mask):
+        return (self.mask & mask) != 0
+
+    def all_of(self, mask):
+        return (self.mask & mask) == mask
+
+    def __or__(self, other):
+        return ServiceSet(self.mask | ServiceSet.coerce(other).mask)
+
+    def __and__(self, other):
+        return ServiceSet(self.mask & ServiceSet.coerce(other).mask)
+
+    def __sub__(self, other):
+        return ServiceSet(self.mask & ~ServiceSet.coerce(other).mask)
+
+    def __xor__(self, other):
+        return ServiceSet(self.mask ^ ServiceSet.coerce(other).mask)
+
+    def __contains__(self, name):
+        sid = REGISTRY.ids.get(name)
+        return sid is not None and (self.mask >> sid) & 1 == 1
+
+    def __iter__(self):
+        return iter(REGISTRY.names_of(self.mask))
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __eq__(self, other):
+        if isinstance(other, ServiceSet):
+            return self.mask == other.mask
+        if isinstance(other, (list, tuple, set, frozenset)):
+            # an unknown name is in no ServiceSet
+            return all(name in REGISTRY.ids for name in other) and self.mask == REGISTRY.lookup(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.mask)
+
+    def __repr__(self):
+        return f"ServiceSet({list(self.names())!r})"
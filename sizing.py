@@ -0,0 +1,229 @@
+# Capacity sizing: turns the RPS / dataset TB / retention / SLA choices into concrete numbers for
+# the services an architecture actually uses (Kinesis shards, MSK partitions, Lambda concurrency,
+# OpenSearch shards / nodes, Redshift / EMR nodes, S3 / Glacier GB-months, ...).
+#
+# Both tables are plain dicts and meant to be edited (or overridden with load_table(path)):
+#   DEMAND  - what each dropdown option stands for (design peak RPS, dataset TB, retention months,
+#             replica count per SLA)
+#   LIMITS  - per-unit throughput / storage limits, minimum footprints and account quotas
+# Call reset() after editing either dict in place.
+#
+# The formulas are written once (_formulas) over plain numbers or NumPy arrays: size() sizes one
+# report and is memoised per (service mask, dropdowns); size_columns() sizes whole portfolios at once.
+
+import json
+import math
+
+from services import REGISTRY
+
+DEMAND = {
+    "rps": {"very_low": 10, "low": 100, "medium": 1000, "high": 10000, "very_high": 50000},
+    "tb": {"tiny": 0.1, "small": 1, "medium": 10, "large": 100, "huge": 500},
+    "retention_months": {"short": 1, "medium": 6, "long": 36, "archive": 84},
+    "replicas": {"best_effort": 0, "slo_99_9": 1, "slo_99_95": 1, "slo_99_99": 2},
+}
+
+LIMITS = {
+    # traffic shape
+    "headroom": 1.3,                      # size for peak RPS x headroom
+    "event_kb": 1.0,                      # average request / stream record size
+    # streaming
+    "kinesis_shard_rps": 1000,            # records/s per shard (write)
+    "kinesis_shard_mb_s": 1.0,            # MB/s per shard (write)
+    "msk_partition_mb_s": 5.0,
+    "msk_min_partitions": 6,
+    "msk_replication": 3,
+    "msk_broker_mb_s": 40.0,
+    "msk_broker_partitions": 1000,        # partition replicas per broker
+    "msk_min_brokers": 3,
+    # serving
+    "lambda_duration_ms": 200,
+    "provisioned_fraction": 0.5,          # share of peak concurrency kept warm
+    "fargate_task_rps": 200,
+    "fargate_min_tasks": 2,
+    # search / analytics
+    "opensearch_index_ratio": 0.1,        # indexed GB (chunks + vectors) per GB of raw data
+    "opensearch_shard_gb": 40,
+    "opensearch_node_gb": 1536,
+    "opensearch_free_space": 0.25,
+    "opensearch_shards_per_node": 1000,
+    "redshift_compression": 0.33,
+    "redshift_node_tb": 32,               # ra3.xlplus managed storage
+    "redshift_min_nodes": 2,
+    "emr_daily_scan_fraction": 0.1,       # share of the dataset processed per daily batch
+    "emr_node_gb_per_hour": 100,
+    "emr_batch_window_hours": 4,
+    "emr_min_core_nodes": 2,
+    # storage
+    "s3_standard_months": 3,              # lifecycle transition to Glacier after this
+    # account / domain quotas (exceeding one becomes a warning, not an error)
+    "api_gateway_account_rps": 10000,
+    "lambda_account_concurrency": 1000,
+    "kinesis_account_shards": 500,
+    "opensearch_domain_nodes": 80,
+    "redshift_cluster_nodes": 128,
+}
+
+# (service, metric) pairs in report order
+METRICS = [
+    ("API Gateway", "peak_rps"),
+    ("Kinesis", "shards"),
+    ("MSK", "partitions"),
+    ("MSK", "brokers"),
+    ("Lambda", "concurrency"),
+    ("Lambda", "provisioned_concurrency"),
+    ("ECS Fargate", "tasks"),
+    ("OpenSearch", "primary_shards"),
+    ("OpenSearch", "replicas"),
+    ("OpenSearch", "data_nodes"),
+    ("Redshift", "nodes"),
+    ("EMR", "core_nodes"),
+    ("S3", "gb_months"),
+    ("S3 Glacier", "gb_months"),
+]
+SIZED_SERVICES = list(dict.fromkeys(svc for svc, _ in METRICS))
+# services that change another service's numbers without being sized themselves
+MODIFIERS = ["Provisioned Concurrency", "Multi-Region Replication"]
+
+# (service, metric, LIMITS key)
+QUOTAS = [
+    ("API Gateway", "peak_rps", "api_gateway_account_rps"),
+    ("Lambda", "concurrency", "lambda_account_concurrency"),
+    ("Kinesis", "shards", "kinesis_account_shards"),
+    ("OpenSearch", "data_nodes", "opensearch_domain_nodes"),
+    ("Redshift", "nodes", "redshift_cluster_nodes"),
+]
+
+# --------------------------
+# Formulas: d = demand quantities, has = service -> 0/1; scalars or arrays alike
+# --------------------------
+def _formulas(d, has, ceil, maximum):
+    L = LIMITS
+    peak = d["rps"] * L["headroom"]
+    mb_s = peak * L["event_kb"] / 1024
+    gb = d["tb"] * 1024
+    replicas = d["replicas"]
+
+    concurrency = maximum(1, ceil(peak * L["lambda_duration_ms"] / 1000))
+    partitions = maximum(L["msk_min_partitions"], ceil(mb_s / L["msk_partition_mb_s"]))
+    brokers = maximum(L["msk_min_brokers"], maximum(
+        ceil(mb_s * L["msk_replication"] / L["msk_broker_mb_s"]),
+        ceil(partitions * L["msk_replication"] / L["msk_broker_partitions"])))
+
+    index_gb = gb * L["opensearch_index_ratio"]
+    primary_shards = maximum(1, ceil(index_gb / L["opensearch_shard_gb"]))
+    data_nodes = maximum(replicas + 1, maximum(
+        ceil(index_gb * (replicas + 1) * (1 + L["opensearch_free_space"]) / L["opensearch_node_gb"]),
+        ceil(primary_shards * (replicas + 1) / L["opensearch_shards_per_node"])))
+
+    # with Glacier in the design, data older than s3_standard_months moves there
+    cold_months = has["S3 Glacier"] * maximum(0, d["retention_months"] - L["s3_standard_months"])
+    copies = 1 + has["Multi-Region Replication"]
+
+    return {
+        ("API Gateway", "peak_rps"): ceil(peak),
+        ("Kinesis", "shards"): maximum(ceil(peak / L["kinesis_shard_rps"]), ceil(mb_s / L["kinesis_shard_mb_s"])),
+        ("MSK", "partitions"): partitions,
+        ("MSK", "brokers"): brokers,
+        ("Lambda", "concurrency"): concurrency,
+        ("Lambda", "provisioned_concurrency"): has["Provisioned Concurrency"] * ceil(concurrency * L["provisioned_fraction"]),
+        ("ECS Fargate", "tasks"): maximum(L["fargate_min_tasks"], ceil(peak / L["fargate_task_rps"])),
+        ("OpenSearch", "primary_shards"): primary_shards,
+        ("OpenSearch", "replicas"): replicas,
+        ("OpenSearch", "data_nodes"): data_nodes,
+        ("Redshift", "nodes"): maximum(L["redshift_min_nodes"], ceil(d["tb"] * L["redshift_compression"] / L["redshift_node_tb"])),
+        ("EMR", "core_nodes"): maximum(L["emr_min_core_nodes"], ceil(
+            gb * L["emr_daily_scan_fraction"] / (L["emr_node_gb_per_hour"] * L["emr_batch_window_hours"]))),
+        ("S3", "gb_months"): ceil(gb * (d["retention_months"] - cold_months) * copies),
+        ("S3 Glacier", "gb_months"): ceil(gb * cold_months),
+    }
+
+def demand(rps, tb, retention, sla):
+    return {
+        "rps": DEMAND["rps"][rps],
+        "tb": DEMAND["tb"][tb],
+        "retention_months": DEMAND["retention_months"][retention],
+        "replicas": DEMAND["replicas"][sla],
+    }
+
+# float products like 0.1 * 3 must not round up a whole unit
+def _ceil(x):
+    return math.ceil(round(x, 6))
+
+# --------------------------
+# One report
+# --------------------------
+_memo = {}
+
+def _size(mask, rps, tb, retention, sla):
+    key = (mask, rps, tb, retention, sla)
+    out = _memo.get(key)
+    if out is None:
+        d = demand(rps, tb, retention, sla)
+        has = {s: int(bool(mask & REGISTRY.bit(s))) for s in SIZED_SERVICES + MODIFIERS}
+        values = _formulas(d, has, _ceil, max)
+        services = {}
+        for (svc, metric), v in values.items():
+            if has[svc]:
+                services.setdefault(svc, {})[metric] = int(v)
+        warnings = [
+            f"{svc} {metric} {services[svc][metric]} exceeds {limit} ({LIMITS[limit]})"
+            for svc, metric, limit in QUOTAS
+            if svc in services and services[svc][metric] > LIMITS[limit]
+        ]
+        out = (d, services, warnings)
+        if len(_memo) >= 65536:
+            _memo.clear()
+        _memo[key] = out
+    return out
+
+# service mask (required | recommended) + dropdown values -> the report's "sizing" section
+def size(mask, rps, tb, retention, sla):
+    d, services, warnings = _size(mask, rps, tb, retention, sla)
+    return {
+        "demand": dict(d),
+        "services": {svc: dict(m) for svc, m in services.items()},
+        "warnings": list(warnings),
+    }
+
+# --------------------------
+# Portfolios: columnar demand arrays + presence arrays -> one int64 array per metric
+# --------------------------
+def size_columns(d, has):
+    # d: {demand key: array}, has: {service: bool array} for SIZED_SERVICES + MODIFIERS.
+    # Returns ({(service, metric): int64 array, 0 where the service is absent},
+    #          {LIMITS quota key: bool array, True where that quota is exceeded}).
+    import numpy as np
+    present = {s: np.asarray(v).astype(np.int64) for s, v in has.items()}
+    values = _formulas({k: np.asarray(v, dtype=np.float64) for k, v in d.items()}, present,
+                       lambda x: np.ceil(np.round(x, 6)), np.maximum)
+    columns = {(svc, metric): v.astype(np.int64) * present[svc] for (svc, metric), v in values.items()}
+    over = {limit: columns[(svc, metric)] > LIMITS[limit] for svc, metric, limit in QUOTAS}
+    return columns, over
+
+# --------------------------
+# Editing the tables
+# --------------------------
+def reset():
+    _memo.clear()
+
+# JSON file {"demand": {"rps": {"very_high": 80000}, ...}, "limits": {"lambda_duration_ms": 120, ...}}
+def load_table(path):
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+    unknown = set(table) - {"demand", "limits"}
+    if unknown:
+        raise ValueError(f"unknown sizing table sections {sorted(unknown)}")
+    for name, values in table.get("demand", {}).items():
+        if name not in DEMAND:
+            raise ValueError(f"unknown demand {name!r}; expected one of {list(DEMAND)}")
+        bad = set(values) - set(DEMAND[name])
+        if bad:
+            raise ValueError(f"unknown {name} options {sorted(bad)}")
+    bad = set(table.get("limits", {})) - set(LIMITS)
+    if bad:
+        raise ValueError(f"unknown limits {sorted(bad)}")
+    for name, values in table.get("demand", {}).items():
+        DEMAND[name].update(values)
+    LIMITS.update(table.get("limits", {}))
+    reset()
@@ -0,0 +1,617 @@
+# Append-only local report store: SQLite (stdlib only), columnar rows + bitmap indexes.
+#
+#   python store.py add reports.db reports.jsonl --project acme-rag
+#   python store.py query reports.db --service Neptune --sla slo_99_99 --confidence-below 80
+#   python store.py diff reports.db acme-rag@3 acme-rag@4        # or two report ids
+#   python store.py get reports.db 42
+#   python store.py info reports.db
+#
+# Each report becomes one row of small integers and blobs:
+#   - names (services, profiles, checks, dropdown options, params, briefs, projects) are dictionary-encoded
+#     into the `names` table; profiles / required / recommended / checks / failed checks are bitmasks over
+#     those ids, sliders are packed 4 bits each into one integer, generated_at is an integer timestamp;
+#   - everything else (ml_pipeline, remediation, sizing, latency, ...) is JSON, delta-encoded against the
+#     project's current keyframe (a full copy every KEYFRAME_EVERY runs): unchanged sections are dropped and
+#     the rest is zlib-compressed with the keyframe's JSON as preset dictionary, so a section that barely
+#     changed between runs costs a few bytes.
+# get() returns the stored report exactly (same keys, order and values).
+#
+# Queries never scan rows. The `bitmaps` table keeps one bitmap per (kind, key) - service, required service,
+# profile, reported check, failed check, dropdown value, confidence value, project - split into 2^16-report
+# segments.
+# A query ANDs the bitmaps of its filters (cached in memory as Python ints), so it costs a few big-int
+# operations whatever the number of stored reports.
+
+import argparse
+import json
+import sqlite3
+import sys
+import zlib
+from datetime import datetime, timezone
+
+SEGMENT_BITS = 16
+KEYFRAME_EVERY = 64
+DROPDOWNS = ["RPS", "DATA_TB", "RETENTION", "SLA"]
+DROPDOWN_COLUMNS = ["rps", "tb", "retention", "sla"]
+_EPOCH = datetime(1970, 1, 1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS names (
+    kind TEXT NOT NULL, id INTEGER NOT NULL, name TEXT NOT NULL,
+    PRIMARY KEY (kind, id), UNIQUE (kind, name)
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE,
+    runs INTEGER NOT NULL DEFAULT 0, keyframe INTEGER
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    project INTEGER NOT NULL,
+    run INTEGER NOT NULL,
+    generated_at INTEGER,
+    params INTEGER,
+    rps INTEGER, tb INTEGER, retention INTEGER, sla INTEGER,
+    brief INTEGER,
+    profiles BLOB, required BLOB, recommended BLOB, checks BLOB, failed BLOB,
+    confidence REAL,
+    base INTEGER,
+    delta BLOB
+);
+CREATE INDEX IF NOT EXISTS reports_project_run ON reports (project, run);
+CREATE TABLE IF NOT EXISTS bitmaps (
+    kind TEXT NOT NULL, key TEXT NOT NULL, seg INTEGER NOT NULL, bits BLOB NOT NULL,
+    PRIMARY KEY (kind, key, seg)
+) WITHOUT ROWID;
+"""
+
+def _to_blob(mask):
+    return mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+
+def _from_blob(blob):
+    return int.from_bytes(blob, "little") if blob else 0
+
+def _check_keys(checks):
+    return [("check", name) for name in checks] + [("failed", name) for name, ok in checks.items() if not ok]
+
+def _bit_ids(mask):
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+def _ids(bits, limit=None):
+    # set bit positions of a (possibly huge) int, lowest first, skipping zero 64-bit words
+    out = []
+    data = memoryview(bits.to_bytes(((bits.bit_length() + 63) // 64) * 8, "little")).cast("Q")
+    for w, word in enumerate(data):
+        if word:
+            base = w << 6
+            for b in _bit_ids(word):
+                out.append(base + b)
+                if limit is not None and len(out) >= limit:
+                    return out
+    return out
+
+def _timestamp(value):
+    # generated_at as integer microseconds, only when it formats back to the identical string
+    if not isinstance(value, str) or not value.endswith("Z"):
+        return None
+    try:
+        dt = datetime.fromisoformat(value[:-1])
+    except ValueError:
+        return None
+    if dt.tzinfo is not None or dt.isoformat() + "Z" != value:
+        return None
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+def _format_timestamp(us):
+    return datetime.fromtimestamp(us / 1_000_000, timezone.utc).replace(tzinfo=None, microsecond=us % 1_000_000).isoformat() + "Z"
+
+class ReportStore:
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self._load_names()
+        self._bitmaps = {}
+        self._keyframes = {}
+        self._seen = self._max_id()
+
+    def close(self):
+        self.db.close()
+
+    # --------------------------
+    # Dictionary encoding
+    # --------------------------
+    def _load_names(self):
+        self._names, self._lists = {}, {}
+        for kind, nid, name in self.db.execute("SELECT kind, id, name FROM names ORDER BY kind, id"):
+            self._names.setdefault(kind, {})[name] = nid
+            self._lists.setdefault(kind, []).append(name)
+
+    def _id(self, kind, name):
+        ids = self._names.setdefault(kind, {})
+        nid = ids.get(name)
+        if nid is None:
+            nid = ids[name] = len(ids)
+            self._lists.setdefault(kind, []).append(name)
+            self.db.execute("INSERT INTO names (kind, id, name) VALUES (?, ?, ?)", (kind, nid, name))
+        return nid
+
+    def _mask(self, kind, names):
+        ids, m = self._names.get(kind, {}), 0
+        for name in names:
+            nid = ids.get(name)
+            m |= 1 << (self._id(kind, name) if nid is None else nid)
+        return m
+
+    def _names_of(self, kind, mask):
+        names = self._lists.get(kind, [])
+        return [names[i] for i in _bit_ids(mask)]
+
+    def _max_id(self):
+        return self.db.execute("SELECT COALESCE(MAX(id), 0) FROM reports").fetchone()[0]
+
+    # --------------------------
+    # Encoding one report
+    # --------------------------
+    def _encode(self, report):
+        # -> (column values, rest dict, index keys)
+        rest = {"__keys__": list(report)}
+        cols = {}
+        keys = []
+
+        ts = _timestamp(report.get("generated_at"))
+        cols["generated_at"] = ts
+        if ts is None and "generated_at" in report:
+            rest["generated_at"] = report["generated_at"]
+
+        params = report.get("params")
+        packed = None
+        if isinstance(params, dict) and len(params) <= 14 and all(
+                type(v) is int and 0 <= v <= 15 for v in params.values()):
+            ids = [self._id("param", name) for name in params]
+            if ids == list(range(len(ids))):
+                packed = sum(v << (4 * i) for i, v in enumerate(params.values())) | (len(ids) << 56)
+        cols["params"] = packed
+        if packed is None and "params" in report:
+            rest["params"] = params
+
+        inputs = report.get("deterministic_inputs")
+        if isinstance(inputs, dict) and list(inputs) == DROPDOWNS and all(isinstance(v, str) for v in inputs.values()):
+            for key, col in zip(DROPDOWNS, DROPDOWN_COLUMNS):
+                cols[col] = self._id(key, inputs[key])
+                keys.append((key, inputs[key]))
+        else:
+            cols.update(dict.fromkeys(DROPDOWN_COLUMNS))
+            if "deterministic_inputs" in report:
+                rest["deterministic_inputs"] = inputs
+
+        brief = report.get("brief")
+        cols["brief"] = self._id("brief", brief) if isinstance(brief, str) else None
+        if cols["brief"] is None and "brief" in report:
+            rest["brief"] = brief
+
+        # name lists are stored as masks and decoded sorted, so only sorted lists of names qualify
+        for field, col, kind in (("profiles", "profiles", "profile"), ("required_services", "required", "service"),
+                                 ("recommended_services", "recommended", "service")):
+            value = report.get(field)
+            if isinstance(value, list) and all(isinstance(v, str) for v in value) and value == sorted(set(value)):
+                cols[col] = self._mask(kind, value)
+            else:
+                cols[col] = None
+                if field in report:
+                    rest[field] = value
+        if cols["profiles"] is not None:
+            keys += [("profile", p) for p in report["profiles"]]
+        services = set()
+        for col, field in (("required", "required_services"), ("recommended", "recommended_services")):
+            if cols[col] is not None:
+                services.update(report[field])
+        keys += [("service", s) for s in services]
+        if cols["required"] is not None:
+            keys += [("required", s) for s in report["required_services"]]
+
+        checks = report.get("checks")
+        if isinstance(checks, dict) and all(type(v) is bool for v in checks.values()):
+            ids = [self._id("check", name) for name in checks]
+            if ids == sorted(ids):
+                cols["checks"] = sum(1 << i for i in ids)
+                cols["failed"] = sum(1 << i for i, ok in zip(ids, checks.values()) if not ok)
+            else:
+                cols["checks"] = cols["failed"] = None
+                rest["checks"] = checks
+            keys += _check_keys(checks)
+        else:
+            cols["checks"] = cols["failed"] = None
+            if "checks" in report:
+                rest["checks"] = checks
+
+        confidence = report.get("confidence")
+        if type(confidence) is float:
+            cols["confidence"] = confidence
+            keys.append(("confidence", repr(confidence)))
+        else:
+            cols["confidence"] = None
+            if "confidence" in report:
+                rest["confidence"] = confidence
+
+        columnar = {"generated_at", "params", "deterministic_inputs", "brief", "profiles", "required_services",
+                    "recommended_services", "checks", "confidence"}
+        for k, v in report.items():
+            if k not in columnar:
+                rest[k] = v
+        return cols, rest, keys
+
+    def _decode(self, row):
+        (rid, project, run, generated_at, params, rps, tb, retention, sla, brief, profiles, required,
+         recommended, checks, failed, confidence, base, delta) = row
+        if base is None:
+            rest = json.loads(zlib.decompress(delta))
+        else:
+            base_rest, zdict = self._keyframe(base)
+            rest = {}
+            if delta:
+                d = zlib.decompressobj(zdict=zdict)
+                rest = json.loads(d.decompress(delta) + d.flush())
+            full = dict(base_rest)
+            for k in rest.pop("__removed__", []):
+                full.pop(k, None)
+            full.update(rest)
+            rest = full
+        values = {}
+        if generated_at is not None:
+            values["generated_at"] = _format_timestamp(generated_at)
+        if params is not None:
+            n = params >> 56
+            names = self._lists["param"]
+            values["params"] = {names[i]: params >> (4 * i) & 15 for i in range(n)}
+        if rps is not None:
+            values["deterministic_inputs"] = {
+                key: self._lists[key][code] for key, code in zip(DROPDOWNS, (rps, tb, retention, sla))}
+        if brief is not None:
+            values["brief"] = self._lists["brief"][brief]
+        for field, blob, kind in (("profiles", profiles, "profile"), ("required_services", required, "service"),
+                                  ("recommended_services", recommended, "service")):
+            if blob is not None:
+                values[field] = sorted(self._names_of(kind, _from_blob(blob)))
+        if checks is not None:
+            failed_mask = _from_blob(failed)
+            values["checks"] = {self._lists["check"][i]: not failed_mask >> i & 1 for i in _bit_ids(_from_blob(checks))}
+        if confidence is not None:
+            values["confidence"] = confidence
+        values.update((k, v) for k, v in rest.items() if k != "__keys__")
+        return {k: values[k] for k in rest["__keys__"]}
+
+    # keyframe id -> (rest dict, its JSON: the zlib preset dictionary of the deltas against it)
+    def _keyframe(self, rid):
+        cached = self._keyframes.get(rid)
+        if cached is None:
+            (delta,) = self.db.execute("SELECT delta FROM reports WHERE id = ?", (rid,)).fetchone()
+            raw = zlib.decompress(delta)
+            cached = self._cache_keyframe(rid, json.loads(raw), raw)
+        return cached
+
+    def _cache_keyframe(self, rid, rest, raw):
+        if len(self._keyframes) >= 256:
+            self._keyframes.clear()
+        self._keyframes[rid] = (rest, raw)
+        return rest, raw
+
+    # --------------------------
+    # Appending
+    # --------------------------
+    def add(self, report, project="default"):
+        return self.add_many([report], project)[0]
+
+    def add_many(self, reports, project="default"):
+        # one transaction; returns the new report ids
+        try:
+            return self._add_many(reports, project)
+        except BaseException:
+            # rolled back: the name ids, keyframes and bitmap bits cached while encoding were never written
+            self._load_names()
+            self._keyframes.clear()
+            self._bitmaps.clear()
+            raise
+
+    def _add_many(self, reports, project):
+        pending = {}
+        rows = []
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._refresh()
+            self.db.execute("INSERT OR IGNORE INTO projects (name) VALUES (?)", (project,))
+            pid, runs, keyframe = self.db.execute(
+                "SELECT id, runs, keyframe FROM projects WHERE name = ?", (project,)).fetchone()
+            rid = self._max_id()
+            for report in reports:
+                rid += 1
+                runs += 1
+                cols, rest, keys = self._encode(report)
+                if keyframe is None or (runs - 1) % KEYFRAME_EVERY == 0:
+                    base, keyframe = None, rid
+                    raw = json.dumps(rest, separators=(",", ":")).encode("utf-8")
+                    self._cache_keyframe(rid, rest, raw)
+                    delta = zlib.compress(raw)
+                else:
+                    # sections equal to the keyframe's are dropped; the changed ones compress
+                    # against the keyframe's JSON, so near-identical sections cost a few bytes
+                    base = keyframe
+                    base_rest, zdict = self._keyframe(keyframe)
+                    payload = {k: v for k, v in rest.items() if k not in base_rest or base_rest[k] != v}
+                    removed = [k for k in base_rest if k not in rest]
+                    if removed:
+                        payload["__removed__"] = removed
+                    delta = None
+                    if payload:
+                        c = zlib.compressobj(zdict=zdict)
+                        delta = c.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8")) + c.flush()
+                rows.append((rid, pid, runs, cols["generated_at"], cols["params"], cols["rps"], cols["tb"],
+                             cols["retention"], cols["sla"], cols["brief"],
+                             *(None if cols[c] is None else _to_blob(cols[c])
+                               for c in ("profiles", "required", "recommended", "checks", "failed")),
+                             cols["confidence"], base, delta))
+                keys += [("all", ""), ("project", project)]
+                for key in keys:
+                    ids = pending.get(key)
+                    if ids is None:
+                        ids = pending[key] = []
+                    ids.append(rid)
+            self.db.executemany("INSERT INTO reports VALUES (" + ",".join("?" * 18) + ")", rows)
+            self.db.execute("UPDATE projects SET runs = ?, keyframe = ? WHERE id = ?", (runs, keyframe, pid))
+            self._flush_bitmaps(pending)
+            self._seen = rid
+        return [r[0] for r in rows]
+
+    # pending: (kind, key) -> new report ids; merged into the stored segments (and any cached bitmap)
+    def _flush_bitmaps(self, pending):
+        low = (1 << SEGMENT_BITS) - 1
+        for (kind, key), ids in pending.items():
+            segments = {}
+            for rid in ids:
+                buf = segments.get(rid >> SEGMENT_BITS)
+                if buf is None:
+                    buf = segments[rid >> SEGMENT_BITS] = bytearray(1 << (SEGMENT_BITS - 3))
+                buf[(rid & low) >> 3] |= 1 << (rid & 7)
+            for seg, buf in segments.items():
+                bits = int.from_bytes(buf, "little")
+                found = self.db.execute("SELECT bits FROM bitmaps WHERE kind = ? AND key = ? AND seg = ?",
+                                        (kind, key, seg)).fetchone()
+                merged = bits | (_from_blob(found[0]) if found else 0)
+                self.db.execute("INSERT OR REPLACE INTO bitmaps (kind, key, seg, bits) VALUES (?, ?, ?, ?)",
+                                (kind, key, seg, _to_blob(merged)))
+                cached = self._bitmaps.get((kind, key))
+                if cached is not None:
+                    self._bitmaps[(kind, key)] = cached | bits << (seg << SEGMENT_BITS)
+        if any(kind == "confidence" for kind, _ in pending):
+            self._bitmaps.pop(("confidence", None), None)
+
+    def _refresh(self):
+        # another connection appended since we cached: drop caches built from the old state
+        latest = self._max_id()
+        if latest != self._seen:
+            self._bitmaps.clear()
+            self._load_names()
+            self._seen = latest
+
+    # --------------------------
+    # Reading
+    # --------------------------
+    def get(self, rid):
+        self._refresh()
+        row = self.db.execute("SELECT * FROM reports WHERE id = ?", (rid,)).fetchone()
+        if row is None:
+            raise KeyError(f"no report {rid}")
+        return self._decode(row)
+
+    def run_id(self, project, run):
+        found = self.db.execute(
+            "SELECT r.id FROM reports r JOIN projects p ON p.id = r.project WHERE p.name = ? AND r.run = ?",
+            (project, run)).fetchone()
+        if found is None:
+            raise KeyError(f"no run {run} of project {project!r}")
+        return found[0]
+
+    def runs(self, project):
+        return self.db.execute(
+            "SELECT r.run, r.id FROM reports r JOIN projects p ON p.id = r.project WHERE p.name = ? ORDER BY r.run",
+            (project,)).fetchall()
+
+    def _bitmap(self, kind, key):
+        bits = self._bitmaps.get((kind, key))
+        if bits is None:
+            bits = 0
+            for seg, blob in self.db.execute("SELECT seg, bits FROM bitmaps WHERE kind = ? AND key = ?", (kind, key)):
+                bits |= _from_blob(blob) << (seg << SEGMENT_BITS)
+            self._bitmaps[(kind, key)] = bits
+        return bits
+
+    def _confidence_bitmap(self, at_least, below):
+        values = self._bitmaps.get(("confidence", None))
+        if values is None:
+            values = [float(k) for (k,) in self.db.execute("SELECT DISTINCT key FROM bitmaps WHERE kind = 'confidence'")]
+            self._bitmaps[("confidence", None)] = values
+        bits = 0
+        for v in values:
+            if (at_least is None or v >= at_least) and (below is None or v < below):
+                bits |= self._bitmap("confidence", repr(v))
+        return bits
+
+    # every filter narrows the result; list-valued filters on dropdowns mean "any of"
+    def _match(self, services=(), required=(), profiles=(), failed=(), passed=(), rps=None, tb=None,
+               retention=None, sla=None, project=None, confidence_at_least=None, confidence_below=None):
+        self._refresh()
+        bits = self._bitmap("all", "")
+        for kind, names in (("service", services), ("required", required), ("profile", profiles), ("failed", failed)):
+            for name in names:
+                bits &= self._bitmap(kind, name)
+        # passed: reported and not failed (a report without the check does not match)
+        for name in passed:
+            bits &= self._bitmap("check", name) & ~self._bitmap("failed", name)
+        for kind, value in (("RPS", rps), ("DATA_TB", tb), ("RETENTION", retention), ("SLA", sla)):
+            if value is not None:
+                any_of = 0
+                for v in [value] if isinstance(value, str) else value:
+                    any_of |= self._bitmap(kind, v)
+                bits &= any_of
+        if project is not None:
+            bits &= self._bitmap("project", project)
+        if confidence_at_least is not None or confidence_below is not None:
+            bits &= self._confidence_bitmap(confidence_at_least, confidence_below)
+        return bits
+
+    def query(self, limit=None, **filters):
+        return _ids(self._match(**filters), limit)
+
+    def count(self, **filters):
+        return self._match(**filters).bit_count()
+
+    # --------------------------
+    # Diff
+    # --------------------------
+    def diff(self, a, b):
+        ra, rb = self.get(a), self.get(b)
+        out = {"a": a, "b": b}
+        inputs = {}
+        for name in sorted(set(ra.get("params", {})) | set(rb.get("params", {}))):
+            va, vb = ra.get("params", {}).get(name), rb.get("params", {}).get(name)
+            if va != vb:
+                inputs[name] = [va, vb]
+        for key in DROPDOWNS:
+            va, vb = ra.get("deterministic_inputs", {}).get(key), rb.get("deterministic_inputs", {}).get(key)
+            if va != vb:
+                inputs[key] = [va, vb]
+        if ra.get("brief") != rb.get("brief"):
+            inputs["brief"] = [ra.get("brief"), rb.get("brief")]
+        out["inputs"] = inputs
+        pa, pb = set(ra.get("profiles", [])), set(rb.get("profiles", []))
+        out["profiles_gained"], out["profiles_lost"] = sorted(pb - pa), sorted(pa - pb)
+        sa = set(ra.get("required_services", [])) | set(ra.get("recommended_services", []))
+        sb = set(rb.get("required_services", [])) | set(rb.get("recommended_services", []))
+        out["services_gained"], out["services_lost"] = sorted(sb - sa), sorted(sa - sb)
+        req_a, req_b = set(ra.get("required_services", [])), set(rb.get("required_services", []))
+        out["services_retiered"] = sorted((req_a ^ req_b) & sa & sb)
+        ca, cb = ra.get("checks", {}), rb.get("checks", {})
+        out["checks_flipped"] = {k: [ca.get(k), cb.get(k)] for k in list(ca) + [k for k in cb if k not in ca]
+                                 if ca.get(k) != cb.get(k)}
+        if isinstance(ra.get("confidence"), (int, float)) and isinstance(rb.get("confidence"), (int, float)):
+            out["confidence_delta"] = round(rb["confidence"] - ra["confidence"], 1)
+        skip = {"generated_at", "params", "deterministic_inputs", "brief", "profiles", "required_services",
+                "recommended_services", "checks", "confidence"}
+        out["sections_changed"] = [k for k in list(ra) + [k for k in rb if k not in ra]
+                                   if k not in skip and ra.get(k) != rb.get(k)]
+        return out
+
+    def info(self):
+        reports = self._max_id()
+        projects = self.db.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+        keyframes = self.db.execute("SELECT COUNT(*) FROM reports WHERE base IS NULL").fetchone()[0]
+        bitmaps = self.db.execute("SELECT COUNT(DISTINCT kind || ':' || key), COALESCE(SUM(LENGTH(bits)), 0) FROM bitmaps").fetchone()
+        page_size = self.db.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.db.execute("PRAGMA page_count").fetchone()[0]
+        return {"reports": reports, "projects": projects, "keyframes": keyframes, "bitmaps": bitmaps[0],
+                "bitmap_bytes": bitmaps[1], "file_bytes": page_size * pages}
+
+# --------------------------
+# CLI
+# --------------------------
+def _ref(store, text):
+    # report id, or project@run
+    if "@" in text:
+        project, run = text.rsplit("@", 1)
+        return store.run_id(project, int(run))
+    return int(text)
+
+def _read_reports(path):
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            if line.strip():
+                report = json.loads(line)
+                if "error" not in report:
+                    yield report
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Append-only report store: add, query, diff.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("add", help="append reports from a JSONL file (cli.py output)")
+    p.add_argument("db")
+    p.add_argument("input", nargs="?", default="-")
+    p.add_argument("--project", default="default")
+    p.add_argument("--batch", type=int, default=10000)
+    p = sub.add_parser("query", help="ids (or reports) matching every filter")
+    p.add_argument("db")
+    p.add_argument("--service", action="append", default=[], help="required or recommended; repeatable")
+    p.add_argument("--required", action="append", default=[])
+    p.add_argument("--profile", action="append", default=[])
+    p.add_argument("--failed", action="append", default=[], help="check that failed")
+    p.add_argument("--passed", action="append", default=[], help="check that passed")
+    for name in ("rps", "tb", "retention", "sla"):
+        p.add_argument(f"--{name}", action="append", default=None, help="any of; repeatable")
+    p.add_argument("--project", default=None)
+    p.add_argument("--confidence-at-least", type=float, default=None)
+    p.add_argument("--confidence-below", type=float, default=None)
+    p.add_argument("--limit", type=int, default=None)
+    p.add_argument("--count", action="store_true", help="print the number of matches only")
+    p.add_argument("--full", action="store_true", help="print the matching reports as JSONL")
+    p = sub.add_parser("diff", help="differences between two reports (id or project@run)")
+    p.add_argument("db")
+    p.add_argument("a")
+    p.add_argument("b")
+    p = sub.add_parser("get", help="print one stored report")
+    p.add_argument("db")
+    p.add_argument("ref")
+    p = sub.add_parser("info", help="store statistics")
+    p.add_argument("db")
+    args = ap.parse_args(argv)
+
+    store = ReportStore(args.db)
+    try:
+        if args.cmd == "add":
+            n, batch = 0, []
+            for report in _read_reports(args.input):
+                batch.append(report)
+                if len(batch) >= args.batch:
+                    n += len(store.add_many(batch, args.project))
+                    batch = []
+            if batch:
+                n += len(store.add_many(batch, args.project))
+            print(f"{n} reports added to {args.project!r}", file=sys.stderr)
+        elif args.cmd == "query":
+            filters = dict(services=args.service, required=args.required, profiles=args.profile, failed=args.failed,
+                           passed=args.passed, rps=args.rps, tb=args.tb, retention=args.retention, sla=args.sla,
+                           project=args.project, confidence_at_least=args.confidence_at_least,
+                           confidence_below=args.confidence_below)
+            if args.count:
+                print(store.count(**filters))
+            else:
+                for rid in store.query(limit=args.limit, **filters):
+                    print(json.dumps(dict(store.get(rid), store_id=rid)) if args.full else rid)
+        elif args.cmd == "diff":
+            try:
+                a, b = _ref(store, args.a), _ref(store, args.b)
+                json.dump(store.diff(a, b), sys.stdout, indent=2)
+            except (KeyError, ValueError) as e:
+                ap.error(str(e.args[0]))
+            sys.stdout.write("\n")
+        elif args.cmd == "get":
+            try:
+                json.dump(store.get(_ref(store, args.ref)), sys.stdout, indent=2)
+            except (KeyError, ValueError) as e:
+                ap.error(str(e.args[0]))
+            sys.stdout.write("\n")
+        else:
+            json.dump(store.info(), sys.stdout, indent=2)
+            sys.stdout.write("\n")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
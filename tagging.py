@@ -0,0 +1,194 @@
+# Requirement-document tagging: one streaming pass over a txt / markdown document that counts
+# dictionary terms and turns them into tags for profile detection.
+#
+#   python tagging.py requirements.md [more.md ...] [--dictionary terms.json] [--min-count 2]
+#
+# DICTIONARY maps a tag to the terms that signal it ({"hipaa": ["hipaa", "phi", ...]}); load_dictionary()
+# merges in a JSON file of the same shape (thousands of terms are fine); code changing DICTIONARY
+# directly calls dictionary_changed() so default_tagger() rebuilds. Terms match case-insensitively and
+# as whole words. Tags feed detect_profiles through the brief the rules read: tag_brief() joins the tags
+# seen at least min_count times, so a tag named like a rule keyword ("health", "hipaa", "sap") fires the
+# same rules a brief mentioning it would, and rule packs can key on any other tag the same way. Reports
+# keep the brief as typed and list those tags under "tags" (see apply_tags()).
+#
+# Matching: all terms compile into one trie-factored regex (rules.trie_pattern) that reports the longest
+# term at each word start; the shorter terms on the same trie path are added from a per-term prefix
+# chain. The per-character cost is bounded by the trie's branching (the alphabet), not by the number of
+# terms, and runs inside the regex engine. Documents are read in fixed-size chunks with a carry of one
+# longest-term's worth of characters, so memory is O(chunk + dictionary) whatever the document size.
+
+import argparse
+import io
+import itertools
+import json
+import re
+import sys
+
+from rules import trie, trie_pattern
+
+DICTIONARY = {
+    "health": ["health", "healthcare", "clinical", "patient", "patients", "hospital", "ehr", "emr", "fhir", "hl7",
+               "medical record", "medical records", "diagnosis", "telehealth"],
+    "hipaa": ["hipaa", "phi", "protected health information", "hitech", "baa", "business associate agreement"],
+    "sap": ["sap", "s/4hana", "s4hana", "sap hana", "sap bw", "abap", "idoc", "bapi", "sap erp"],
+    "pci": ["pci", "pci dss", "pci-dss", "cardholder data", "primary account number"],
+    "gdpr": ["gdpr", "data subject", "right to erasure", "dpia", "data protection officer"],
+    "sox": ["sox", "sarbanes-oxley", "sarbanes oxley"],
+    "finance": ["banking", "bank", "trading", "payments", "ledger", "aml", "kyc", "fraud detection"],
+    "streaming": ["real-time", "real time", "streaming", "event stream", "clickstream", "kafka", "kinesis"],
+    "genai": ["llm", "large language model", "rag", "retrieval augmented generation", "embeddings",
+              "vector search", "knowledge graph", "generative ai", "genai"],
+}
+
+MIN_COUNT = 1
+CHUNK_SIZE = 1 << 20
+
+def load_dictionary(path):
+    with open(path, encoding="utf-8") as f:
+        extra = json.load(f)
+    if not isinstance(extra, dict) or not all(isinstance(v, list) for v in extra.values()):
+        raise ValueError(f"{path}: expected a JSON object of tag -> [terms]")
+    for tag, terms in extra.items():
+        if not all(isinstance(t, str) and t.strip() for t in terms):
+            raise ValueError(f"{path}: terms of {tag!r} must be non-empty strings")
+        DICTIONARY.setdefault(tag, [])
+        DICTIONARY[tag] += [t for t in terms if t not in DICTIONARY[tag]]
+    dictionary_changed()
+
+def _word(ch):
+    return ch.isalnum() or ch == "_"
+
+class Tagger:
+    def __init__(self, dictionary=None):
+        dictionary = DICTIONARY if dictionary is None else dictionary
+        self.term_tags = {}
+        for tag, terms in dictionary.items():
+            for term in terms:
+                term = term.strip().lower()
+                if term:
+                    self.term_tags.setdefault(term, set()).add(tag)
+        self.max_len = max(map(len, self.term_tags), default=0)
+        self._re = None
+        if self.term_tags:
+            root = trie(self.term_tags)
+            # a term may start at a word start, or anywhere if it starts with a symbol
+            self._re = re.compile(r"(?=(?:(?<!\w)|(?=\W))(" + trie_pattern(root) + "))")
+            # longest match -> every term on its trie path that also ends on a word boundary there
+            self._chains = {term: self._chain(root, term) for term in self.term_tags}
+
+    def _chain(self, root, term):
+        node, out = root, []
+        for i, ch in enumerate(term):
+            node = node[ch]
+            if "" in node:
+                # whole-word: a term ending in a word character needs a non-word character (or the end) after it
+                out.append((node[""], i + 1, _word(ch)))
+        return out
+
+    def _scan_buffer(self, buf, start, limit, final, terms):
+        n = len(buf)
+        chains, count = self._chains, terms.get
+        for m in self._re.finditer(buf, start):
+            i = m.start()
+            if i >= limit:
+                break
+            for term, length, needs_boundary in chains[m.group(1)]:
+                if needs_boundary:
+                    j = i + length
+                    if j < n:
+                        ch = buf[j]
+                        if ch.isalnum() or ch == "_":
+                            continue
+                    elif not final:
+                        continue
+                terms[term] = count(term, 0) + 1
+
+    # stream: text file object or str; returns {"tags": {tag: count}, "terms": {term: count}, "chars": n}
+    def scan(self, stream, chunk_size=CHUNK_SIZE):
+        if isinstance(stream, str):
+            stream = io.StringIO(stream)
+        terms, chars = {}, 0
+        # carry: one character of left context + the tail that could still start a term
+        carry, start = "", 0
+        keep = self.max_len + 1
+        for chunk in itertools.chain(iter(lambda: stream.read(chunk_size), ""), [""]):
+            final = not chunk
+            chars += len(chunk)
+            buf = carry + chunk.lower()
+            limit = len(buf) if final else max(start, len(buf) - keep)
+            if self._re is not None:
+                self._scan_buffer(buf, start, limit, final, terms)
+            carry = buf[max(0, limit - 1):]
+            start = min(1, limit)
+        tags = {}
+        for term, count in terms.items():
+            for tag in self.term_tags[term]:
+                tags[tag] = tags.get(tag, 0) + count
+        return {"tags": dict(sorted(tags.items())), "terms": dict(sorted(terms.items())), "chars": chars}
+
+def merge(results):
+    tags, terms, chars = {}, {}, 0
+    for r in results:
+        for k, v in r["tags"].items():
+            tags[k] = tags.get(k, 0) + v
+        for k, v in r["terms"].items():
+            terms[k] = terms.get(k, 0) + v
+        chars += r["chars"]
+    return {"tags": dict(sorted(tags.items())), "terms": dict(sorted(terms.items())), "chars": chars}
+
+# tags seen at least min_count times
+def brief_tags(tags, min_count=None):
+    min_count = MIN_COUNT if min_count is None else min_count
+    return [tag for tag, count in sorted(tags.items()) if count >= min_count]
+
+# ... as words appended to the brief the rules read
+def tag_brief(brief, tags, min_count=None):
+    words = brief_tags(tags, min_count)
+    return " ".join([brief] + words if brief else words)
+
+# a report evaluated on tag_brief(brief, tags): restore the typed brief, list the tags that reached the rules
+def apply_tags(report, brief, tags, min_count=None):
+    report["brief"] = brief
+    report["tags"] = brief_tags(tags, min_count)
+    return report
+
+_tagger = None
+_tagger_version = None
+_version = 0
+
+def dictionary_changed():
+    global _version
+    _version += 1
+
+# shared Tagger for the current DICTIONARY (rebuilt after dictionary_changed())
+def default_tagger():
+    global _tagger, _tagger_version
+    if _tagger is None or _tagger_version != _version:
+        _tagger, _tagger_version = Tagger(), _version
+    return _tagger
+
+def scan_file(path, tagger=None, chunk_size=CHUNK_SIZE):
+    tagger = tagger or default_tagger()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return tagger.scan(f, chunk_size)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Tag requirement documents with dictionary terms.")
+    ap.add_argument("documents", nargs="+", help="txt / markdown files ('-' for stdin)")
+    ap.add_argument("--dictionary", action="append", default=[], help="extra JSON {tag: [terms]}; repeatable")
+    ap.add_argument("--min-count", type=int, default=MIN_COUNT, help="occurrences before a tag reaches the brief")
+    args = ap.parse_args(argv)
+    for path in args.dictionary:
+        try:
+            load_dictionary(path)
+        except (OSError, ValueError) as e:
+            ap.error(str(e))
+    tagger = default_tagger()
+    results = [tagger.scan(sys.stdin) if p == "-" else scan_file(p, tagger) for p in args.documents]
+    result = merge(results)
+    result["brief"] = tag_brief("", result["tags"], args.min_count)
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# The decision logic of app.py as it was before engine.py existed, copied verbatim (only the Streamlit
+# calls around it dropped). tests/test_engine.py checks engine.evaluate against it; do not edit.
+
+def detect_profiles(params, brief_text, rps, tb, retention, sla):
+    profiles = set()
+
+    # GraphRAG / GenAI if model complexity high + data variety high
+    if params["Model Complexity"] >= 8 and params["Data Variety"] >= 6:
+        profiles.add("GraphRAG-GenAI")
+
+    # streaming if real-time or RPS high
+    if params["Real-Time Requirement"] >= 7 or rps in ("high", "very_high"):
+        profiles.add("RealTime-Streaming")
+
+    # big data profile
+    if tb in ("large", "huge") or params["Data Volume"] >= 8:
+        profiles.add("BigData-Lakehouse")
+
+    # compliance
+    if params["Security & Compliance"] >= 8 or "health" in brief_text.lower() or "hipaa" in brief_text.lower():
+        profiles.add("Compliance-High")
+
+    # ERP / SAP
+    if params["Integration Needs"] >= 8 or "sap" in brief_text.lower():
+        profiles.add("ERP-Integrated")
+
+    # cost sensitive
+    if params["Cost Sensitivity"] >= 8:
+        profiles.add("Cost-Optimized")
+
+    # SLA constraints
+    if sla == "slo_99_99":
+        profiles.add("High-Availability")
+    elif sla == "slo_99_95":
+        profiles.add("HA-Redundant")
+
+    if not profiles:
+        profiles.add("Baseline-RAG")
+
+    return profiles
+
+PROFILE_TEMPLATES = {
+    "GraphRAG-GenAI": {
+        "required": ["S3", "Glue", "Athena", "OpenSearch", "Neptune", "SageMaker", "Bedrock", "Step Functions", "API Gateway", "IAM", "KMS", "CloudWatch"],
+        "recommended": ["SageMaker Model Registry", "SageMaker Model Monitor", "ECS Fargate", "CloudFront", "Macie", "GuardDuty"]
+    },
+    "RealTime-Streaming": {
+        "required": ["Kinesis", "MSK", "Lambda", "DynamoDB", "API Gateway", "IAM", "CloudWatch", "SQS"],
+        "recommended": ["Glue", "S3", "OpenSearch", "SageMaker"]
+    },
+    "BigData-Lakehouse": {
+        "required": ["S3", "Glue", "Athena", "EMR", "Redshift", "IAM", "KMS"],
+        "recommended": ["Lake Formation", "Glue Data Catalog", "S3 Intelligent-Tiering"]
+    },
+    "Compliance-High": {
+        "required": ["IAM", "KMS", "VPC", "Macie", "GuardDuty", "CloudTrail", "S3 Object Lock"],
+        "recommended": ["AWS Config", "Lake Formation"]
+    },
+    "ERP-Integrated": {
+        "required": ["AppFlow", "Lambda", "API Gateway", "Step Functions", "S3"],
+        "recommended": ["DynamoDB", "Glue"]
+    },
+    "Cost-Optimized": {
+        "required": ["S3", "S3 Intelligent-Tiering", "Glue", "Athena"],
+        "recommended": ["Spot Instances", "SageMaker Batch Transform"]
+    },
+    "High-Availability": {
+        "required": ["Multi-AZ", "ECS Fargate", "ALB", "AutoScaling", "Route53", "CloudFront"],
+        "recommended": ["Provisioned Concurrency", "Multi-Region Replication"]
+    },
+    "HA-Redundant": {
+        "required": ["Multi-AZ", "AutoScaling", "Route53"],
+        "recommended": ["ALB", "Read Replicas"]
+    },
+    "Baseline-RAG": {
+        "required": ["S3", "Glue", "OpenSearch", "SageMaker", "API Gateway", "Lambda", "IAM", "CloudWatch"],
+        "recommended": ["SageMaker Model Registry", "SageMaker Model Monitor", "Step Functions"]
+    }
+}
+
+def compose_services(profiles, rps, tb, retention, sla, params):
+    required = set()
+    recommended = set()
+    for p in profiles:
+        tmpl = PROFILE_TEMPLATES.get(p, {})
+        required.update(tmpl.get("required", []))
+        recommended.update(tmpl.get("recommended", []))
+
+    # Adjustments based on RPS
+    if rps in ("high", "very_high", "medium"):
+        # prefer autoscaling and managed endpoints
+        required.update(["API Gateway", "AutoScaling", "ECS Fargate", "CloudFront"])
+        recommended.update(["Provisioned Concurrency"])
+
+    # Adjustments based on dataset TB
+    if tb in ("large", "huge"):
+        required.update(["Redshift", "EMR", "Glue", "S3"])
+        recommended.update(["Parquet", "Partitioning", "S3 Intelligent-Tiering"])
+    elif tb == "medium":
+        required.update(["S3", "Glue", "Athena"])
+    else:
+        required.update(["S3"])
+
+    # retention
+    if retention == "long":
+        recommended.update(["S3 Glacier", "S3 Lifecycle"])
+    elif retention == "archive":
+        required.update(["S3 Glacier", "S3 Object Lock"])
+
+    # SLA
+    if sla == "slo_99_99":
+        required.update(["Multi-AZ", "Route53", "ECS Fargate"])
+        recommended.update(["Multi-Region Replication"])
+    elif sla == "slo_99_95":
+        required.update(["Multi-AZ", "AutoScaling"])
+
+    # model complexity tuning
+    if params["Model Complexity"] >= 8:
+        required.update(["SageMaker", "SageMaker Training", "SageMaker Model Registry", "SageMaker Model Monitor"])
+        recommended.update(["EC2 GPU", "SageMaker Distributed"])
+
+    # ensure storage core
+    required.add("S3")
+
+    # cost sensitivity reductions
+    if params["Cost Sensitivity"] >= 8:
+        recommended.update(["Spot Instances", "S3 Intelligent-Tiering"])
+
+    return sorted(required), sorted(recommended - required)
+
+ML_COMPONENTS = [
+    "Data Ingestion", "Data Storage", "Data Preprocessing", "Feature Engineering", "Data Labeling", "Data Versioning",
+    "Problem Statement", "Model Selection", "Model Training", "Hyperparameter Tuning", "Model Evaluation", "Model Registry",
+    "Model Packaging", "Model Deployment", "API/Serving Layer", "Inference Service", "Model Monitoring", "Feedback Loop",
+    "Orchestration", "Model Retraining"
+]
+
+def map_ml_components(required_services, recommended_services, params, rps, tb, sla):
+    svc = set(required_services) | set(recommended_services)
+    covered = set()
+
+    # Data stage
+    covered.add("Data Ingestion")
+    covered.add("Data Storage")
+    if "Glue" in svc or params["Data Variety"] >= 4:
+        covered.add("Data Preprocessing")
+    if params["Data Variety"] >= 6 or tb in ("large","huge"):
+        covered.add("Feature Engineering")
+    if params["Automation (CI/CD)"] >= 7:
+        covered.add("Data Versioning")
+    if params["Model Complexity"] >= 6:
+        covered.add("Data Labeling")
+
+    # Modeling stage
+    covered.add("Problem Statement")
+    covered.add("Model Selection")
+    covered.add("Model Training")
+    covered.add("Hyperparameter Tuning")
+    covered.add("Model Evaluation")
+    if "SageMaker Model Registry" in svc or params["Automation (CI/CD)"] >= 8:
+        covered.add("Model Registry")
+
+    # Packaging & Deployment
+    covered.add("Model Packaging")
+    covered.add("Model Deployment")
+    covered.add("API/Serving Layer")
+    covered.add("Inference Service")
+    covered.add("Model Monitoring")
+    covered.add("Feedback Loop")
+    covered.add("Orchestration")
+
+    # Retraining (deterministic: if long retention or frequent data, plan retraining)
+    if params["Real-Time Requirement"] >= 7 or rps in ("high", "very_high"):
+        covered.add("Model Retraining")
+    else:
+        covered.add("Model Retraining")
+
+    # Return deterministic ordering matching ML_COMPONENTS
+    return [c for c in ML_COMPONENTS if c in covered] + [c for c in ML_COMPONENTS if c not in covered]
+
+def build_aws_dot(required_services, recommended_services):
+    nodes = required_services + recommended_services
+    dot = [
+        "digraph FinalAWS {",
+        "rankdir=LR;",
+        'node [shape=rect, style="rounded,filled", fillcolor="#F2F4F8", fontsize=14];'
+    ]
+    dot.append('subgraph cluster_sources {label="Client & Sources"; style=filled; fillcolor="#FFFFFF"; "Client";}')
+    dot.append('subgraph cluster_storage {label="Storage & Catalog"; style=filled; fillcolor="#FFF8E6";')
+    for n in ["S3", "Redshift", "RDS", "Athena"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#FFF8E6"];')
+    dot.append("}")
+    dot.append('subgraph cluster_ingest {label="Ingestion & Stream"; style=filled; fillcolor="#F1F8E9";')
+    for n in ["Kinesis", "MSK", "DMS", "AppFlow"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F1F8E9"];')
+    dot.append("}")
+    dot.append('subgraph cluster_processing {label="Processing & ETL"; style=filled; fillcolor="#F0F7FF";')
+    for n in ["Glue", "EMR", "SageMaker Processing", "Glue DataBrew", "Athena"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F0F7FF"];')
+    dot.append("}")
+    dot.append('subgraph cluster_ml {label="ML & Model Ops"; style=filled; fillcolor="#F7F2FF";')
+    for n in ["SageMaker", "SageMaker Training", "SageMaker Model Registry", "SageMaker Endpoints", "SageMaker Model Monitor", "Bedrock", "Neptune", "OpenSearch"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F7F2FF"];')
+    dot.append("}")
+    dot.append('subgraph cluster_serving {label="Serving & API"; style=filled; fillcolor="#F2FFF6";')
+    for n in ["API Gateway", "Lambda", "ECS Fargate", "CloudFront", "Amplify", "AutoScaling", "ALB", "Route53"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#F2FFF6"];')
+    dot.append("}")
+    dot.append('subgraph cluster_ops {label="Security & Observability"; style=filled; fillcolor="#FFF2F4";')
+    for n in ["IAM", "KMS", "Macie", "GuardDuty", "CloudWatch", "CodePipeline", "CloudTrail", "S3 Object Lock"]:
+        if n in nodes:
+            dot.append(f'"{n}" [fillcolor="#FFF2F4"];')
+    dot.append("}")
+
+    # edges (deterministic logical flow)
+    edges = [
+        ('"Client"', '"API Gateway"'),
+        ('"API Gateway"', '"Lambda"'),
+        ('"Lambda"', '"Kinesis"'),
+        ('"Kinesis"', '"Glue"'),
+        ('"Glue"', '"S3"'),
+        ('"S3"', '"Athena"'),
+        ('"S3"', '"SageMaker"'),
+        ('"SageMaker"', '"SageMaker Model Registry"'),
+        ('"SageMaker Model Registry"', '"SageMaker Endpoints"'),
+        ('"SageMaker Endpoints"', '"API Gateway"'),
+        ('"Lambda"', '"CloudWatch"'),
+        ('"SageMaker"', '"SageMaker Model Monitor"'),
+        ('"Neptune"', '"Bedrock"'),
+        ('"OpenSearch"', '"Bedrock"')
+    ]
+    for a,b in edges:
+        an = a.strip('"')
+        bn = b.strip('"')
+        if (an == "Client" or an in nodes) and (bn in nodes):
+            dot.append(f'{a} -> {b} [penwidth=1.2];')
+    dot.append("}")
+    return "\n".join(dot)
+
+def build_ml_dot(ml_components):
+    dot = [
+        "digraph MLFull {",
+        "rankdir=TB;",
+        'node [shape=rect, style="rounded,filled", fillcolor="#E8F0FE", fontsize=12];'
+    ]
+    dot.append('subgraph cluster_data { label="📂 Data Pipeline"; style=filled; fillcolor="#F1F8E9"; fontsize=14;')
+    for n in ["Data Ingestion","Data Storage","Data Preprocessing","Feature Engineering","Data Labeling","Data Versioning"]:
+        color = "#DFF4D8" if n in ml_components else "#FFF8E6"
+        dot.append(f'"{n}" [fillcolor="{color}"];')
+    dot.append("}")
+    dot.append('subgraph cluster_model { label="🤖 Model Dev & Training"; style=filled; fillcolor="#E3F2FD"; fontsize=14;')
+    for n in ["Problem Statement","Model Selection","Model Training","Hyperparameter Tuning","Model Evaluation","Model Registry"]:
+        color = "#DDEBF9" if n in ml_components else "#F8F8FF"
+        dot.append(f'"{n}" [fillcolor="{color}"];')
+    dot.append("}")
+    dot.append('subgraph cluster_deploy { label="🚀 Deployment & MLOps"; style=filled; fillcolor="#FFF3E0"; fontsize=14;')
+    for n in ["Model Packaging","Model Deployment","API/Serving Layer","Inference Service","Model Monitoring","Feedback Loop","Orchestration","Model Retraining"]:
+        color = "#FFF0D9" if n in ml_components else "#FFFCEA"
+        dot.append(f'"{n}" [fillcolor="{color}"];')
+    dot.append("}")
+    # connections
+    flow_pairs = [
+        ("Data Ingestion","Data Storage"),("Data Storage","Data Preprocessing"),("Data Preprocessing","Feature Engineering"),
+        ("Feature Engineering","Model Training"),("Model Training","Model Evaluation"),("Model Evaluation","Model Registry"),
+        ("Model Registry","Model Packaging"),("Model Packaging","Model Deployment"),("Model Deployment","API/Serving Layer"),
+        ("API/Serving Layer","Inference Service"),("Inference Service","Model Monitoring"),("Model Monitoring","Feedback Loop"),
+        ("Feedback Loop","Model Retraining")
+    ]
+    for a,b in flow_pairs:
+        dot.append(f'"{a}" -> "{b}" [penwidth=1.0];')
+    dot.append("}")
+    return "\n".join(dot)
+
+def strict_checks(required, recommended, ml_components, rps, tb, retention, sla):
+    svc = set(required) | set(recommended)
+    checks = {}
+    # Security presence
+    checks["Security"] = any(x in svc for x in ["IAM","KMS","Macie","GuardDuty","VPC","S3 Object Lock"])
+    # Storage resilience
+    checks["Storage"] = "S3" in svc
+    # Monitoring & MLOps
+    checks["Observability"] = any(x in svc for x in ["CloudWatch","SageMaker Model Monitor","CloudTrail"])
+    # Orchestration
+    checks["Orchestration"] = any(x in svc for x in ["Step Functions","CodePipeline","AutoScaling"])
+    # High RPS readiness
+    checks["HighRPS"] = (rps in ("high", "very_high") and any(x in svc for x in ["AutoScaling","ECS Fargate","Provisioned Concurrency","CloudFront"])) or (rps in ("very_low","low","medium"))
+    # Big Data readiness
+    checks["BigData"] = (tb in ("large","huge") and any(x in svc for x in ["Redshift","EMR","Athena","Glue"])) or (tb in ("tiny","small","medium"))
+    # SLA readiness
+    checks["SLA"] = False
+    if sla == "slo_99_99":
+        checks["SLA"] = all(x in svc for x in ["Multi-AZ","Route53"])
+    elif sla == "slo_99_95":
+        checks["SLA"] = "Multi-AZ" in svc or "AutoScaling" in svc
+    else:
+        checks["SLA"] = True
+    # ML lifecycle coverage (training, registry, monitoring, deployment)
+    checks["MLLifecycle"] = all(x in ml_components for x in ["Model Training","Model Registry","Model Monitoring","Model Deployment"])
+    return checks
+
+WEIGHTS = {"Security":0.22, "Storage":0.18, "Observability":0.15, "Orchestration":0.15, "HighRPS":0.10, "BigData":0.10, "SLA":0.05, "MLLifecycle":0.05}
+
+REMEDIATION = [
+    ("Security", "Add IAM, KMS, GuardDuty/Macie, VPC and S3 Object Lock for high compliance."),
+    ("Storage", "Add S3 + lifecycle policies; ensure Glue Data Catalog and Lake Formation if dataset large."),
+    ("Observability", "Add CloudWatch, CloudTrail and SageMaker Model Monitor."),
+    ("Orchestration", "Add Step Functions, CodePipeline and Autoscaling for production workflows."),
+    ("HighRPS", "Tune API Gateway + AutoScaling / CloudFront + provisioned concurrency for endpoints."),
+    ("BigData", "Add Redshift / EMR / Athena and partitioned Parquet storage for TB-scale datasets."),
+    ("SLA", "Add Multi-AZ, Route53 failover and multi-region replication for required SLAs."),
+    ("MLLifecycle", "Ensure Model Registry + Model Monitor + automated retraining pipelines exist."),
+]
+
+# the script's top-level flow, as one function
+def evaluate(params, rps, tb, retention, sla, brief):
+    profiles = detect_profiles(params, brief, rps, tb, retention, sla)
+    required_services, recommended_services = compose_services(profiles, rps, tb, retention, sla, params)
+    ml_pipeline = map_ml_components(required_services, recommended_services, params, rps, tb, sla)
+    checks = strict_checks(required_services, recommended_services, ml_pipeline, rps, tb, retention, sla)
+    score = 0.0
+    for k,w in WEIGHTS.items():
+        score += (1.0 if checks.get(k) else 0.0) * w * 100
+    score = round(score,1)
+    return {
+        "params": params,
+        "deterministic_inputs": {"RPS":rps,"DATA_TB":tb,"RETENTION":retention,"SLA":sla},
+        "brief": brief,
+        "profiles": sorted(list(profiles)),
+        "required_services": required_services,
+        "recommended_services": recommended_services,
+        "ml_pipeline": ml_pipeline,
+        "checks": checks,
+        "confidence": score,
+        "remediation": [text for k, text in REMEDIATION if not checks[k]],
+        "aws_dot": build_aws_dot(required_services, recommended_services),
+        "ml_dot": build_ml_dot(ml_pipeline),
+    }
@@ -0,0 +1,39 @@
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine
+
+BRIEFS = ["", "hipaa", "SAP", "health / sap", "banking RAG", "Health records on SAP", "sapphire"]
+
+def random_args(rng):
+    return (
+        {name: rng.randint(engine.PARAM_MIN, engine.PARAM_MAX) for name in engine.PARAM_NAMES},
+        rng.choice(engine.RPS_OPTIONS)[0],
+        rng.choice(engine.DATA_TB_OPTIONS)[0],
+        rng.choice(engine.RETENTION_OPTIONS)[0],
+        rng.choice(engine.SLA_OPTIONS)[0],
+        rng.choice(BRIEFS),
+    )
+
+@pytest.fixture
+def inputs():
+    # a fixed spread of random engine.evaluate argument tuples
+    rng = random.Random(0)
+    return [random_args(rng) for _ in range(500)]
+
+@pytest.fixture
+def install_pack():
+    # engine.add_rules for the duration of one test
+    saved = list(engine.RULE_PACKS)
+    yield engine.add_rules
+    engine.RULE_PACKS[:] = saved
+    engine.compile_rules()
+
+def outcome(report):
+    return {k: v for k, v in report.items() if k != "generated_at"}
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import batch
+import engine
+
+OPTIONS = (engine.RPS_OPTIONS, engine.DATA_TB_OPTIONS, engine.RETENTION_OPTIONS, engine.SLA_OPTIONS)
+
+def columns(inputs):
+    params = {name: np.array([args[0][name] for args in inputs], dtype=np.int8) for name in engine.PARAM_NAMES}
+    codes = [batch.dropdown_codes(options, [args[1 + j] for args in inputs]) for j, options in enumerate(OPTIONS)]
+    return params, codes, [args[5] for args in inputs]
+
+def test_rows_match_scalar(inputs):
+    params, codes, briefs = columns(inputs)
+    result = batch.evaluate_batch(params, *codes, briefs=briefs)
+    for i, args in enumerate(inputs):
+        report = engine.evaluate(*args)
+        assert batch.row(result, i) == {k: report[k] for k in batch.row(result, i)}, args
+
+def test_sizing_matches_scalar(inputs):
+    params, codes, briefs = columns(inputs)
+    sized, over = batch.size_batch(batch.evaluate_batch(params, *codes, briefs=briefs), *codes)
+    for i, args in enumerate(inputs):
+        services = engine.evaluate(*args)["sizing"]["services"]
+        for (svc, metric), values in sized.items():
+            assert int(values[i]) == services.get(svc, {}).get(metric, 0), (args, svc, metric)
+        assert {(svc, metric) for svc, m in services.items() for metric in m} <= set(sized)
+
+def test_no_briefs_means_empty_brief():
+    params, n = batch.slider_grid(["Data Volume", "Security & Compliance"])
+    codes = [np.full(n, j % len(options), dtype=np.int8) for j, options in enumerate(OPTIONS)]
+    result = batch.evaluate_batch(params, *codes)
+    dropdowns = [options[j % len(options)][0] for j, options in enumerate(OPTIONS)]
+    for i in range(n):
+        report = engine.evaluate({name: int(params[name][i]) for name in engine.PARAM_NAMES}, *dropdowns)
+        assert batch.row(result, i)["profiles"] == report["profiles"]
+        assert batch.row(result, i)["confidence"] == report["confidence"]
+
+def test_rule_packs_refused(install_pack):
+    install_pack({"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]})
+    params, codes, _ = columns([({name: 5 for name in engine.PARAM_NAMES}, "low", "small", "short", "slo_99_9", "")])
+    with pytest.raises(ValueError):
+        batch.evaluate_batch(params, *codes)
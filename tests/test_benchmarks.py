@@ -0,0 +1,65 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+from conftest import ROOT
+
+spec = importlib.util.spec_from_file_location("suite", os.path.join(ROOT, "benchmarks", "suite.py"))
+suite = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(suite)
+
+def results(**seconds):
+    return {"schema": suite.SCHEMA, "quick": True, "metrics": {k: {"seconds": v} for k, v in seconds.items()}}
+
+def test_compare_flags_regressions_beyond_threshold():
+    rows, regressions = suite.compare(results(a=1.0, b=1.0, c=1.0, gone=1.0), results(a=1.05, b=1.2, c=0.5, new=1.0), 0.10)
+    status = {name: s for name, *_, s in rows}
+    assert status == {"a": "ok", "b": "REGRESSION", "c": "improved", "new": "new", "gone": "missing"}
+    assert regressions == ["b"]
+
+def test_run_writes_a_comparable_results_file(tmp_path):
+    out = tmp_path / "results.json"
+    assert suite.main(["run", "--quick", "--only", "report.", "-o", str(out)]) == 0
+    data = json.loads(out.read_text())
+    assert data["schema"] == suite.SCHEMA and data["quick"] is True
+    assert list(data["metrics"]) == ["report.json_dumps"] and data["metrics"]["report.json_dumps"]["seconds"] > 0
+    assert suite.main(["compare", str(out), "--baseline", str(out)]) == 0
+
+def test_compare_exits_1_on_regression(tmp_path, capsys):
+    base, cur = tmp_path / "base.json", tmp_path / "cur.json"
+    base.write_text(json.dumps(results(x=1.0)))
+    cur.write_text(json.dumps(results(x=2.0)))
+    assert suite.main(["compare", str(cur), "--baseline", str(base)]) == 1
+    assert "x" in capsys.readouterr().out
+    cur.write_text(json.dumps(dict(results(x=1.0), schema=0)))
+    with pytest.raises(SystemExit):
+        suite.main(["compare", str(cur), "--baseline", str(base)])
+
+def test_compare_names_a_missing_file(tmp_path, capsys):
+    cur = tmp_path / "cur.json"
+    cur.write_text(json.dumps(results(x=1.0)))
+    missing = tmp_path / "baseline.json"
+    with pytest.raises(SystemExit) as e:
+        suite.main(["compare", str(cur), "--baseline", str(missing)])
+    assert e.value.code == 2
+    err = capsys.readouterr().err
+    assert str(missing) in err and "--update-baseline" in err
+    with pytest.raises(SystemExit):
+        suite.main(["compare", str(tmp_path / "nope.json"), "--baseline", str(cur)])
+    assert "nope.json" in capsys.readouterr().err
+
+def test_measure_returns_seconds_per_call():
+    calls = []
+    assert suite.measure(lambda: calls.append(1), 10, 3) >= 0
+    assert len(calls) == 31
+
+def test_single_pass_timings_are_medians(monkeypatch):
+    calls = []
+    def measure(fn, number, repeats):
+        calls.append((number, repeats))
+        return 1.0
+    monkeypatch.setattr(suite, "measure", measure)
+    out = suite.bench_sweeps(quick=True)
+    assert out["sweep.classes_engine"] == 1.0 and calls[0] == (1, 3)
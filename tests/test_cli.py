@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+import cli
+import engine
+
+def test_parse_spec_defaults():
+    params, rps, tb, retention, sla, brief = cli.parse_spec({})
+    assert params == {name: engine.PARAM_MIN for name in engine.PARAM_NAMES}
+    assert (rps, tb, retention, sla) == tuple(options[default][0] for _, options, default in cli.DROPDOWN_SPECS)
+    assert brief == ""
+
+def test_parse_spec_reads_top_level_and_deterministic_inputs():
+    spec = {"params": {"Data Volume": 9}, "deterministic_inputs": {"RPS": "high", "SLA": "slo_99_9"}, "SLA": "slo_99_99",
+            "brief": "sap"}
+    params, rps, tb, retention, sla, brief = cli.parse_spec(spec)
+    assert params["Data Volume"] == 9
+    assert rps == "high"
+    assert sla == "slo_99_99"   # top-level keys win over deterministic_inputs
+    assert brief == "sap"
+
+@pytest.mark.parametrize("spec, message", [
+    ([1, 2], "spec must be a JSON object"),
+    ({"params": [1, 2]}, "params must be an object"),
+    ({"params": None}, "params must be an object"),
+    ({"deterministic_inputs": [1]}, "deterministic_inputs must be an object"),
+    ({"deterministic_inputs": "high"}, "deterministic_inputs must be an object"),
+    ({"params": {"Data Volume": 11}}, "Data Volume"),
+    ({"params": {"Data Volume": True}}, "Data Volume"),
+    ({"params": {"Data Volume": "5"}}, "Data Volume"),
+    ({"RPS": "ludicrous"}, "RPS must be one of"),
+    ({"RPS": ["high"]}, "RPS must be one of"),
+    ({"brief": 3}, "brief must be a string"),
+    ({"documents": "req.md"}, "documents must be a list"),
+])
+def test_parse_spec_rejects_malformed_specs(spec, message):
+    with pytest.raises(ValueError, match=message):
+        cli.parse_spec(spec)
+
+def test_process_line_turns_bad_lines_into_error_records():
+    for line in ['{"params": [1, 2]}', '{"deterministic_inputs": [1]}', "not json", "[]", '{"RPS": "ludicrous"}']:
+        record = json.loads(cli.process_line(7, line))
+        assert set(record) == {"error", "line"} and record["line"] == 7
+
+def test_process_line_echoes_id():
+    record = json.loads(cli.process_line(1, json.dumps({"id": "a1", "params": {"Model Complexity": 9}})))
+    assert record["id"] == "a1"
+    assert record["profiles"] == engine.evaluate(*cli.parse_spec({"params": {"Model Complexity": 9}}))["profiles"]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_streams_one_report_per_line(inputs, workers):
+    specs = [{"id": i, "params": args[0], "RPS": args[1], "DATA_TB": args[2], "RETENTION": args[3], "SLA": args[4],
+              "brief": args[5]} for i, args in enumerate(inputs[:60])]
+    lines = [json.dumps(s) for s in specs[:30]] + ["", "oops"] + [json.dumps(s) for s in specs[30:]]
+    out = io.StringIO()
+    assert cli.run(io.StringIO("\n".join(lines) + "\n"), out, workers=workers, ordered=True, chunk_size=7) == 61
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[30] == {"error": records[30]["error"], "line": 32}
+    reports = records[:30] + records[31:]
+    for spec, args, report in zip(specs, inputs, reports):
+        assert report["id"] == spec["id"] and report["profiles"] == engine.evaluate(*args)["profiles"]
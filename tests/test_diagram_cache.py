@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from diagram_cache import DiagramCache
+
+class FakeRenderer:
+    def __init__(self, delay=None):
+        self.calls = []
+        self.delay = delay
+
+    def __call__(self, dot, fmt):
+        self.calls.append((dot, fmt))
+        if self.delay:
+            self.delay.wait(10)
+        return f"<{fmt}>{dot}</{fmt}>".encode("utf-8")
+
+def test_renders_each_dot_and_format_once():
+    renderer = FakeRenderer()
+    cache = DiagramCache(renderer=renderer)
+    assert cache.render("digraph {a}") == b"<svg>digraph {a}</svg>"
+    assert cache.render("digraph {a}") == b"<svg>digraph {a}</svg>"
+    cache.render("digraph {a}", "png")
+    assert renderer.calls == [("digraph {a}", "svg"), ("digraph {a}", "png")]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+    with pytest.raises(ValueError):
+        cache.render("digraph {a}", "pdf")
+
+def test_byte_cap_evicts_least_recently_used():
+    cache = DiagramCache(max_bytes=60, renderer=FakeRenderer())
+    for dot in ("a" * 10, "b" * 10, "c" * 10):
+        cache.render(dot)
+    assert cache.size_bytes <= 60 and cache.get("a" * 10) is None and cache.get("c" * 10) is not None
+
+def test_disk_tier_is_shared(tmp_path):
+    DiagramCache(disk_dir=str(tmp_path), renderer=FakeRenderer()).render("digraph {x}")
+    renderer = FakeRenderer()
+    other = DiagramCache(disk_dir=str(tmp_path), renderer=renderer)
+    assert other.render("digraph {x}") == b"<svg>digraph {x}</svg>"
+    assert renderer.calls == [] and other.disk_hits == 1
+
+def test_concurrent_requests_lay_out_once():
+    release = threading.Event()
+    renderer = FakeRenderer(delay=release)
+    cache = DiagramCache(renderer=renderer)
+    threads = [threading.Thread(target=cache.render, args=("digraph {y}",)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(10)
+    assert renderer.calls == [("digraph {y}", "svg")]
+
+def test_without_graphviz_render_raises():
+    cache = DiagramCache(renderer=FakeRenderer())
+    cache.renderer = None
+    assert not cache.available
+    with pytest.raises(RuntimeError):
+        cache.render("digraph {z}")
@@ -0,0 +1,16 @@
+import baseline
+import engine
+from conftest import outcome
+
+def test_matches_baseline_app(inputs):
+    for args in inputs:
+        report, expected = outcome(engine.evaluate(*args)), baseline.evaluate(*args)
+        assert {k: v for k, v in report.items() if k != "sizing"} == {k: v for k, v in expected.items() if k in report}, args
+        # the checks keep the baseline's order too (they are rendered and weighted in that order)
+        assert list(report["checks"]) == list(expected["checks"])
+
+def test_diagrams_match_baseline_app(inputs):
+    for args in inputs[:100]:
+        report, expected = engine.evaluate(*args), baseline.evaluate(*args)
+        assert engine.build_aws_dot(report["required_services"], report["recommended_services"]) == expected["aws_dot"]
+        assert engine.build_ml_dot(report["ml_pipeline"]) == expected["ml_dot"]
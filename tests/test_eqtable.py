@@ -0,0 +1,65 @@
+from array import array
+
+import pytest
+
+import engine
+import eqtable
+from conftest import outcome
+
+UX_PACK = {"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]}
+
+@pytest.fixture(scope="module")
+def table():
+    return eqtable.EquivalenceTable.build()
+
+def test_lookup_matches_engine(table, inputs):
+    for args in inputs:
+        assert outcome(table.evaluate(*args)) == outcome(engine.evaluate(*args)), args
+
+def test_every_class_representative_keys_to_itself(table):
+    for k, args in enumerate(table.representatives()):
+        if k % 97 == 0:
+            assert table.key(*args) == k
+            assert table.keyer.representative(k) == args
+
+def test_save_load_round_trip(table, inputs, tmp_path):
+    path = tmp_path / "eq.bin"
+    table.save(path)
+    loaded = eqtable.EquivalenceTable.load(path)
+    assert loaded.fingerprint == table.fingerprint
+    for args in inputs:
+        assert outcome(loaded.evaluate(*args)) == outcome(table.evaluate(*args))
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "eq.bin"
+    path.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        eqtable.EquivalenceTable.load(path)
+
+def test_load_refuses_a_table_built_for_other_rules(install_pack, tmp_path):
+    spec = eqtable.derive_classes()
+    path = tmp_path / "eq.bin"
+    eqtable.EquivalenceTable(spec, [], array("H")).save(path)
+    install_pack(UX_PACK)
+    with pytest.raises(ValueError, match="different rules"):
+        eqtable.EquivalenceTable.load(path)
+    assert eqtable.EquivalenceTable.load(path, check=False).fingerprint != eqtable.rules_fingerprint()
+
+def test_fingerprint_tracks_rules_and_weights(install_pack, monkeypatch):
+    base = eqtable.rules_fingerprint()
+    assert eqtable.rules_fingerprint() == base
+    monkeypatch.setitem(engine.WEIGHTS, "SLA", 0.06)
+    assert eqtable.rules_fingerprint() != base
+    monkeypatch.undo()
+    install_pack(UX_PACK)
+    assert eqtable.rules_fingerprint() != base
+
+def test_cli_refuses_table_with_other_rules(install_pack, tmp_path, capsys):
+    import cli
+    path = tmp_path / "eq.bin"
+    eqtable.EquivalenceTable(eqtable.derive_classes(), [], array("H")).save(path)
+    pack = tmp_path / "pack.json"
+    pack.write_text('{"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]}')
+    with pytest.raises(SystemExit):
+        cli.main(["--table", str(path), "--rules", str(pack), "-w", "1", str(tmp_path / "missing.jsonl")])
+    assert "different rules" in capsys.readouterr().err
@@ -0,0 +1,72 @@
+import threading
+
+import engine
+from conftest import outcome
+from incremental import STAGE_METRICS, IncrementalEvaluator
+from metrics import Metrics
+
+UX_PACK = {"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]}
+
+def test_reports_match_engine(inputs):
+    evaluator = IncrementalEvaluator(metrics=Metrics())
+    for args in inputs:
+        assert outcome(evaluator.evaluate(*args)) == outcome(engine.evaluate(*args)), args
+
+def test_only_affected_stages_recompute():
+    evaluator = IncrementalEvaluator(metrics=Metrics())
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    args = ("medium", "medium", "medium", "slo_99_9", "")
+    assert set(evaluator.run(params, *args)["recomputed"]) == set(evaluator._caches)
+    assert evaluator.run(dict(params, **{"User Experience": 6}), *args)["recomputed"] == []
+    assert evaluator.run(dict(params, **{"Automation (CI/CD)": 8}), *args)["recomputed"] == ["ml_pipeline", "checks", "ml_dot"]
+
+def test_rule_pack_install_rebuilds_keys_and_caches(install_pack):
+    evaluator = IncrementalEvaluator(metrics=Metrics())
+    params = {name: 9 for name in engine.PARAM_NAMES}
+    args = (params, "medium", "medium", "medium", "slo_99_9", "")
+    assert "Rich-UX" not in evaluator.run(*args)["profiles"]
+    install_pack(UX_PACK)
+    assert "Rich-UX" in evaluator.run(*args)["profiles"]
+    # User Experience is read now: moving it below 8 lands in another class
+    low = dict(params, **{"User Experience": 3})
+    assert "Rich-UX" not in evaluator.run(low, *args[1:])["profiles"]
+
+def test_sessions_compute_concurrently(monkeypatch):
+    # one session stuck in a stage must not block another session's run
+    evaluator = IncrementalEvaluator(metrics=Metrics())
+    entered, release = threading.Event(), threading.Event()
+    detect = engine.detect_profiles
+    def slow(params, *rest):
+        if params["Data Volume"] == 10:
+            entered.set()
+            release.wait(10)
+        return detect(params, *rest)
+    monkeypatch.setattr(engine, "detect_profiles", slow)
+    args = ("medium", "medium", "medium", "slo_99_9", "")
+    stuck = threading.Thread(target=evaluator.run, args=({name: 10 for name in engine.PARAM_NAMES},) + args)
+    stuck.start()
+    assert entered.wait(10)
+    done = threading.Thread(target=evaluator.run, args=({name: 1 for name in engine.PARAM_NAMES},) + args)
+    done.start()
+    done.join(10)
+    finished = not done.is_alive()
+    release.set()
+    stuck.join(10)
+    assert finished
+
+def test_counter_names_the_metric():
+    metrics = Metrics()
+    evaluator = IncrementalEvaluator(metrics=metrics)
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    evaluator.run(params, "medium", "medium", "medium", "slo_99_9")
+    evaluator.run(params, "high", "medium", "medium", "slo_99_9", counter="whatif_evaluations")
+    assert metrics.counter("evaluations") == 1 and metrics.counter("whatif_evaluations") == 1
+
+def test_each_stage_times_under_its_own_name():
+    metrics = Metrics()
+    evaluator = IncrementalEvaluator(metrics=metrics)
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    evaluator.run(params, "medium", "medium", "medium", "slo_99_9")
+    summary = metrics.summary()
+    assert len(set(STAGE_METRICS.values())) == len(STAGE_METRICS)
+    assert {name: summary[name]["count"] for name in STAGE_METRICS.values()} == dict.fromkeys(STAGE_METRICS.values(), 1)
@@ -0,0 +1,68 @@
+import pytest
+
+import engine
+import latency
+import sizing
+from services import REGISTRY
+
+SERVERLESS = REGISTRY.mask(["API Gateway", "Lambda", "DynamoDB", "S3", "CloudFront"])
+
+def test_path_follows_the_diagram_and_stops_at_async_services():
+    assert latency.serving_path(REGISTRY.mask(["API Gateway", "Lambda", "DynamoDB", "OpenSearch", "S3"])) == \
+        ["API Gateway", "Lambda", "DynamoDB", "OpenSearch"]
+    # routing hops forward to their first present successor only
+    assert latency.serving_path(REGISTRY.mask(["ALB", "ECS Fargate", "Bedrock", "S3"])) == ["ALB", "ECS Fargate", "Bedrock"]
+    assert latency.serving_path(REGISTRY.mask(["S3", "Glue"])) == []
+
+def test_erlang_c():
+    assert latency.erlang_c(1, 0.5) == pytest.approx(0.5)
+    assert latency.erlang_c(2, 1.0) == pytest.approx(1 / 3)
+    assert latency.erlang_c(100, 10) < 1e-9
+
+def test_simulation_is_seeded_and_ordered():
+    a = latency.simulate(SERVERLESS, "low", "small", "short", "slo_99_9", n=20000)
+    latency.reset()
+    b = latency.simulate(SERVERLESS, "low", "small", "short", "slo_99_9", n=20000)
+    assert a == b and not a["saturated"]
+    assert a["p50_ms"] < a["p95_ms"] < a["p99_ms"]
+    assert a["within_budget"] == (a["p99_ms"] <= latency.P99_BUDGET_MS["slo_99_9"])
+    # the median of a sum of independent lognormal hops sits above the sum of the hop medians
+    assert a["p50_ms"] >= sum(latency.HOPS[s]["p50_ms"] for s in a["path"])
+    assert latency.simulate(SERVERLESS, "low", "small", "short", "slo_99_9", n=20000, seed=1) != a
+
+def test_saturated_path_reports_no_percentiles():
+    out = latency.simulate(REGISTRY.mask(["API Gateway", "Lambda", "OpenSearch"]), "medium", "medium", "medium",
+                           "slo_99_9", n=1000)
+    assert out["saturated"] and out["bottleneck"] == "OpenSearch"
+    assert out["p50_ms"] is None and out["within_budget"] is False
+    assert out["saturation_rps"] < out["rps"]
+
+def test_no_budget_for_best_effort():
+    out = latency.simulate(SERVERLESS, "low", "small", "short", "best_effort", n=1000)
+    assert out["p99_budget_ms"] is None and out["within_budget"] is None
+
+def test_results_are_copies():
+    out = latency.simulate(SERVERLESS, "low", "small", "short", "slo_99_9", n=1000)
+    out["path"].clear()
+    out["hops"]["Lambda"]["servers"] = 0
+    again = latency.simulate(SERVERLESS, "low", "small", "short", "slo_99_9", n=1000)
+    assert again["path"] and again["hops"]["Lambda"]["servers"] != 0
+
+def test_simulate_report_uses_the_report_services(inputs):
+    for args in inputs[:20]:
+        report = engine.evaluate(*args)
+        mask = REGISTRY.mask(report["required_services"]) | REGISTRY.mask(report["recommended_services"])
+        assert latency.simulate_report(report, n=1000) == latency.simulate(mask, *args[1:5], n=1000)
+
+def test_throttle_cap_saturates_at_the_quota():
+    # API Gateway's servers come from the account RPS quota: whole servers round down, saturation is the quota
+    mask = REGISTRY.mask(["API Gateway", "Lambda", "DynamoDB"])
+    quota = sizing.LIMITS["api_gateway_account_rps"]
+    for rps, saturated in (("medium", False), ("high", True)):
+        hop = latency.simulate(mask, rps, "medium", "medium", "slo_99_9", n=1000)["hops"]["API Gateway"]
+        assert hop["saturation_rps"] == quota
+        assert hop["servers"] == int(quota * hop["mean_ms"] / 1000) and (hop["utilisation"] >= 1) == saturated
+    assert latency._servers({"servers": None, "max_rps": "api_gateway_account_rps"}, {}, 10.08) == 100
+    assert latency._saturation_rps({"servers": None, "max_rps": "api_gateway_account_rps"}, {}, 10.08) == quota
+    assert latency._servers({"servers": 0.2}, {}, 10) == 1
+    assert latency._saturation_rps({"servers": 0.2}, {}, 10) == 100
@@ -0,0 +1,102 @@
+import urllib.request
+
+import pytest
+
+from metrics import Metrics, percentile
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile([], 0.5) == 0.0
+    assert percentile(values, 0.5) == 51 and percentile(values, 0.95) == 95 and percentile(values, 1.0) == 100
+    assert percentile([3, 1, 2], 0.0) == 1
+
+def test_summary_over_the_window():
+    m = Metrics(window=100)
+    for i in range(1, 201):
+        m.observe("ml_mapping", i / 1000, blocks=i)
+    s = m.summary()["ml_mapping"]
+    # only the last 100 samples (101..200 ms) are in the window
+    assert s["count"] == 100
+    assert s["p50_ms"] == pytest.approx(151) and s["p95_ms"] == pytest.approx(195)
+    assert s["mean_ms"] == pytest.approx(150.5) and s["alloc_blocks_p50"] == 151
+
+def test_summary_orders_known_stages_first():
+    m = Metrics()
+    for name in ("custom", "rerun", "profile_detection"):
+        m.observe(name, 0.001)
+    assert list(m.summary()) == ["profile_detection", "rerun", "custom"]
+
+def test_stage_records_a_sample():
+    m = Metrics()
+    with m.stage("dot_building"):
+        pass
+    with pytest.raises(KeyError):
+        with m.stage("dot_building"):
+            raise KeyError
+    assert m.summary()["dot_building"]["count"] == 2
+
+def test_counters_and_gauges():
+    m = Metrics()
+    m.inc("cache_hits", cache="stage", stage="profiles")
+    m.inc("cache_hits", 2, stage="profiles", cache="stage")
+    m.set_gauge("cache_entries", 7, cache="diagram")
+    assert m.counter("cache_hits", cache="stage", stage="profiles") == 3
+    assert m.counter("cache_hits") == 0
+
+def test_prometheus_text_format():
+    m = Metrics(prefix="t")
+    m.observe("rerun", 0.5)
+    m.observe("rerun", 1.5)
+    m.inc("evaluations", 4)
+    m.inc("cache_hits", cache="stage")
+    m.set_gauge("cache_entries", 7, cache="diagram")
+    lines = m.prometheus().splitlines()
+    assert "# TYPE t_stage_seconds summary" in lines
+    assert 't_stage_seconds{stage="rerun",quantile="0.99"} 1.500000000' in lines
+    assert 't_stage_seconds_sum{stage="rerun"} 2.000000000' in lines
+    assert 't_stage_seconds_count{stage="rerun"} 2' in lines
+    assert lines.index("# TYPE t_evaluations_total counter") < lines.index("t_evaluations_total 4")
+    assert 't_cache_hits_total{cache="stage"} 1' in lines
+    assert lines.index("# TYPE t_cache_entries gauge") < lines.index('t_cache_entries{cache="diagram"} 7')
+    # every sample line is `name{labels} value`
+    for line in lines:
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            float(value)
+            assert name.startswith("t_")
+
+def test_alloc_blocks_are_a_summary():
+    # net blocks go negative when a stage frees more than it allocates: not a counter
+    m = Metrics(prefix="t")
+    m.observe("ml_mapping", 0.001, blocks=-40)
+    m.observe("ml_mapping", 0.001, blocks=10)
+    lines = m.prometheus().splitlines()
+    assert "# TYPE t_stage_alloc_blocks summary" in lines
+    assert 't_stage_alloc_blocks{stage="ml_mapping",quantile="0.99"} 10' in lines
+    assert 't_stage_alloc_blocks_sum{stage="ml_mapping"} -30' in lines
+    assert 't_stage_alloc_blocks_count{stage="ml_mapping"} 2' in lines
+    assert not any("alloc_blocks_total" in line for line in lines)
+
+def test_label_values_are_escaped():
+    m = Metrics(prefix="t")
+    m.inc("cache_hits", stage='say "hi"\\now\nthen')
+    m.observe('a"b', 0.25)
+    lines = m.prometheus().splitlines()
+    assert 't_cache_hits_total{stage="say \\"hi\\"\\\\now\\nthen"} 1' in lines
+    assert 't_stage_seconds_count{stage="a\\"b"} 1' in lines
+
+def test_write_and_serve(tmp_path):
+    m = Metrics()
+    m.inc("evaluations")
+    path = tmp_path / "metrics.prom"
+    m.write(str(path))
+    assert path.read_text() == m.prometheus()
+    server = m.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics") as resp:
+            assert resp.read().decode("utf-8") == m.prometheus()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other")
+    finally:
+        server.shutdown()
@@ -0,0 +1,84 @@
+import csv
+import io
+import os
+from collections import Counter
+
+import pytest
+
+import engine
+import portfolio
+from conftest import ROOT, outcome
+
+def portfolio_csv(inputs):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=portfolio.COLUMNS)
+    writer.writeheader()
+    for n, (params, rps, tb, retention, sla, brief) in enumerate(inputs):
+        writer.writerow(dict(params, name=f"p{n}", RPS=rps, DATA_TB=tb, RETENTION=retention, SLA=sla, brief=brief))
+    return out.getvalue()
+
+def check_against_reports(result, reports):
+    assert len(result) == len(reports)
+    assert result.confidence.tolist() == [r["confidence"] for r in reports]
+    profiles = Counter(p for r in reports for p in r["profiles"])
+    assert result.profile_frequencies() == {p: c for p, c in profiles.items()}
+    assert result.confidence_histogram() == dict(Counter(float(r["confidence"]) for r in reports))
+    remediation = Counter(t for r in reports for t in r["remediation"])
+    assert dict(result.top_remediation(k=len(remediation))) == dict(remediation)
+    usage = {s: (req, rec) for s, req, rec in result.service_usage()}
+    for s, (req, rec) in usage.items():
+        assert req == sum(s in r["required_services"] for r in reports)
+        assert rec == sum(s in r["recommended_services"] for r in reports)
+    assert set(usage) == {s for r in reports for s in r["required_services"] + r["recommended_services"]}
+    for row, r in zip(result.rows(range(len(result))), reports):
+        assert row["profiles"] == ", ".join(p for p in result.profiles if p in r["profiles"])
+        assert row["failed checks"] == ", ".join(k for k in result.checks if not r["checks"][k])
+
+def test_aggregates_match_per_row_evaluate(inputs):
+    names, args, errors = portfolio.read_csv(portfolio_csv(inputs[:300]))
+    assert not errors and names[:2] == ["p0", "p1"]
+    assert args == [tuple(a) for a in inputs[:300]]
+    result = portfolio.Portfolio(names, args)
+    check_against_reports(result, [engine.evaluate(*a) for a in args])
+    assert outcome(result.report(7)) == outcome(engine.evaluate(*args[7]))
+
+def test_rule_packs_fall_back_to_per_row_evaluate(inputs, install_pack):
+    install_pack({"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]})
+    args = [tuple(a) for a in inputs[:100]]
+    result = portfolio.Portfolio([f"p{n}" for n in range(len(args))], args)
+    check_against_reports(result, [engine.evaluate(*a) for a in args])
+    assert "Rich-UX" in result.profiles
+
+def test_csv_errors_carry_line_numbers():
+    text = ("name,RPS,Security & Compliance,brief\n"
+            "ok,high,7,\n"
+            "bad rps,warp,5,\n"
+            "\"multi\nline\",low,,\n"
+            "bad slider,low,11,\n"
+            "not int,low,x,\n")
+    names, args, errors = portfolio.read_csv(text)
+    assert names == ["ok", "multi\nline"]
+    assert [line for line, _ in errors] == [3, 6, 7]
+    assert "RPS" in errors[0][1] and "must be an integer" in errors[2][1]
+    with pytest.raises(ValueError, match="unknown CSV columns"):
+        portfolio.read_csv("name,Colour\nx,red\n")
+
+def test_order_and_csv_round_trip(inputs):
+    names, args, _ = portfolio.read_csv(portfolio_csv(inputs[:50]))
+    result = portfolio.Portfolio(names, args)
+    by_confidence = result.confidence[result.order("confidence")]
+    assert by_confidence.tolist() == sorted(result.confidence.tolist())
+    assert [names[i] for i in result.order("name")] == sorted(names)
+    rows = list(csv.DictReader(io.StringIO(result.to_csv())))
+    assert [r["name"] for r in rows] == names
+
+def test_page_renders_an_upload():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    text = "name,RPS,SLA,Security & Compliance\nfirst,high,slo_99_99,9\nsecond,low,best_effort,2\nbroken,warp,,\n"
+    at = testing.AppTest.from_file(os.path.join(ROOT, "pages", "1_Portfolio.py"), default_timeout=120)
+    at.session_state["portfolio_csv"] = text.encode("utf-8")
+    at.run()
+    assert not at.exception
+    assert at.metric[0].value == "2"
+    assert "1 rows skipped" in at.expander[0].label
+    assert [r["name"] for r in at.dataframe(key="portfolio_table").value.to_dict("records")] == ["first", "second"]
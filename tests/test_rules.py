@@ -0,0 +1,86 @@
+import json
+import random
+
+import pytest
+
+import engine
+import rules
+from conftest import random_args
+
+UX_PACK = {"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]}
+
+def test_pack_effects_reach_the_report(install_pack, inputs):
+    params = {name: 9 for name in engine.PARAM_NAMES}
+    args = (params, "medium", "medium", "medium", "slo_99_9", "")
+    assert "Rich-UX" not in engine.evaluate(*args)["profiles"]
+    install_pack(UX_PACK)
+    install_pack({"services": [{"when": [["profiles", "has", "Rich-UX"]], "required": ["CloudFront"], "recommended": []}],
+                  "remediation": [{"when": [["checks", "failed", "Observability"]], "text": "Export traces too."}]})
+    report = engine.evaluate(*args)
+    assert "Rich-UX" in report["profiles"] and "CloudFront" in report["required_services"]
+    for other in inputs:
+        report = engine.evaluate(*other)
+        assert (report["remediation"][-1:] == ["Export traces too."]) == (not report["checks"]["Observability"])
+
+def _holds(cond, params, rps, tb, retention, sla, brief):
+    field, op, value = cond
+    if field == "brief":
+        return any(kw.lower() in brief.lower() for kw in value)
+    if field in rules.DROPDOWN_FIELDS:
+        x = dict(zip(rules.DROPDOWN_FIELDS, (rps, tb, retention, sla)))[field]
+        return (x in value) == (op == "in")
+    x = params[field]
+    return x >= value if op == ">=" else x <= value if op == "<=" else x == value
+
+def test_indexed_profiles_match_direct_evaluation(install_pack, inputs):
+    rng = random.Random(1)
+    pack = []
+    for i in range(40):
+        when = []
+        for _ in range(rng.randint(0, 3)):
+            kind = rng.choice(["slider", "slider", "rps", "sla", "brief"])
+            if kind == "slider":
+                when.append([rng.choice(engine.PARAM_NAMES), rng.choice(rules.SLIDER_OPS), rng.randint(1, 10)])
+            elif kind == "brief":
+                when.append(["brief", "contains_any", rng.sample(["sap", "hipaa", "rag", "records"], 2)])
+            else:
+                options = engine.RPS_OPTIONS if kind == "rps" else engine.SLA_OPTIONS
+                when.append([kind, rng.choice(["in", "not_in"]), [v for v, _ in rng.sample(options, 2)]])
+        pack.append({"when": when, "profile": f"P{i}"})
+    install_pack({"profiles": pack})
+    for args in inputs:
+        params, rps, tb, retention, sla, brief = args
+        fired = {r["profile"] for r in pack if all(_holds(c, *args) for c in r["when"])}
+        detected = engine.detect_profiles(params, brief, rps, tb, retention, sla)
+        assert {p for p in detected if p.startswith("P") and p[1:].isdigit()} == fired, args
+
+@pytest.mark.parametrize("pack, message", [
+    ({"nonsense": []}, "unknown rule stages"),
+    ({"profiles": [{"when": []}]}, "needs a 'profile' entry"),
+    ({"profiles": ["x"]}, "is not an object"),
+    ({"profiles": [{"when": [["Data Volume", ">", 3]], "profile": "X"}]}, "slider condition"),
+    ({"profiles": [{"when": [["Nope", ">=", 3]], "profile": "X"}]}, "unknown field"),
+    ({"profiles": [{"when": [["rps", ">=", "high"]], "profile": "X"}]}, "supports 'in'"),
+    ({"profiles": [{"when": [["services", "has_any", ["S3"]]], "profile": "X"}]}, "cannot test"),
+    ({"profiles": [{"when": [["brief", "contains_any", [""]]], "profile": "X"}]}, "non-empty"),
+])
+def test_bad_packs_are_rejected_and_not_installed(install_pack, pack, message):
+    before = list(engine.RULE_PACKS)
+    with pytest.raises(ValueError, match=message):
+        install_pack(pack)
+    assert engine.RULE_PACKS == before
+
+def test_load_pack_validates_the_file(tmp_path):
+    path = tmp_path / "pack.json"
+    path.write_text(json.dumps(UX_PACK))
+    assert rules.load_pack(str(path)) == UX_PACK
+    path.write_text(json.dumps({"profiles": [{"when": []}]}))
+    with pytest.raises(ValueError):
+        rules.load_pack(str(path))
+
+def test_builtin_rules_compile_to_the_same_outcomes_twice():
+    rng = random.Random(3)
+    before = [engine.evaluate(*random_args(rng))["profiles"] for _ in range(50)]
+    engine.compile_rules()
+    rng = random.Random(3)
+    assert [engine.evaluate(*random_args(rng))["profiles"] for _ in range(50)] == before
@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+
+import engine
+import search
+from services import REGISTRY
+
+QUERIES = [
+    {},
+    {"must_pass": ["SLA", "HighRPS"], "must_include": ["Neptune"]},
+    {"must_pass": list(engine.WEIGHTS)},
+    {"must_include": ["Redshift", "Bedrock"], "min_confidence": 90},
+    {"must_include": ["SageMaker"], "include_recommended": True},
+    {"must_pass": ["Security"], "cost_weights": {"Redshift": 5.0, "EMR": 3.0, "Lambda": 0.5}},
+    {"must_include": ["Kinesis"], "brief": "SAP"},
+]
+
+@pytest.fixture(scope="module")
+def grid():
+    # every class representative, evaluated once per brief: (demand, report, required mask, recommended mask)
+    s = search.InverseSearch()
+    sliders = [[(name, v) for v in values] for name, values in s.slider_axes]
+    rows = {}
+    for brief in {q.get("brief", "") for q in QUERIES}:
+        rows[brief] = out = []
+        for dropdowns in itertools.product(*(classes for _, classes in s.dropdown_axes)):
+            for fixed in itertools.product(*sliders):
+                params = {name: engine.PARAM_MIN for name in engine.PARAM_NAMES}
+                params.update(fixed)
+                report = engine.evaluate(params, *(v for v, _ in dropdowns), brief)
+                demand = sum(v - engine.PARAM_MIN for v in params.values()) + sum(level for _, level in dropdowns)
+                out.append((demand, report, REGISTRY.mask(report["required_services"]),
+                            REGISTRY.mask(report["recommended_services"])))
+    return rows
+
+def brute_force(rows, must_pass=(), must_include=(), min_confidence=None, cost_weights=None,
+                include_recommended=False, brief=""):
+    cost = search._Cost(cost_weights, include_recommended)
+    points = set()
+    for demand, report, required, recommended in rows[brief]:
+        if not all(report["checks"][c] for c in must_pass):
+            continue
+        if min_confidence is not None and report["confidence"] < min_confidence:
+            continue
+        if (required | recommended) & REGISTRY.mask(must_include) != REGISTRY.mask(must_include):
+            continue
+        points.add((cost(required | recommended if include_recommended else required), demand))
+    return sorted(p for p in points if not any(q != p and search._dominates(q, p) for q in points))
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_front_matches_brute_force(grid, query):
+    results = search.search(**query)
+    assert [(r["cost"], r["demand"]) for r in results] == brute_force(grid, **query)
+    for r in results:
+        report = engine.evaluate(r["params"], *r["deterministic_inputs"].values(), query.get("brief", ""))
+        assert {k: report[k] for k in ("required_services", "recommended_services", "checks", "confidence")} == \
+               {k: r[k] for k in ("required_services", "recommended_services", "checks", "confidence")}
+
+def test_unknown_names_rejected():
+    with pytest.raises(ValueError):
+        search.search(must_include=["Nope"])
+    with pytest.raises(ValueError):
+        search.search(must_pass=["Nope"])
@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+
+import engine
+import server
+
+def _request(method, path, body=b"", headers=""):
+    return (f"{method} {path} HTTP/1.1\r\nHost: t\r\nContent-Length: {len(body)}\r\n{headers}\r\n").encode() + body
+
+async def _read(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = next(int(line.split(b":", 1)[1]) for line in head.split(b"\r\n") if line.lower().startswith(b"content-length"))
+    return status, json.loads(await reader.readexactly(length))
+
+def exchange(service, *raw, timeout=10):
+    # send the raw requests on one connection; -> [(status, json body)] for each answer
+    async def go():
+        loop = asyncio.get_running_loop()
+        srv = await loop.create_server(lambda: server.HTTPProtocol(service), "127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            out = []
+            for r in raw:
+                writer.write(r)
+                out.append(await asyncio.wait_for(_read(reader), timeout))
+            return out
+        finally:
+            writer.close()
+            srv.close()
+    return asyncio.run(go())
+
+def post(path, payload):
+    return _request("POST", path, json.dumps(payload).encode())
+
+GOOD = {"params": {"Model Complexity": 9, "Data Variety": 7}, "RPS": "high", "brief": "sap"}
+
+def test_evaluate_matches_engine():
+    [(status, report)] = exchange(server.EngineService(), post("/evaluate", GOOD))
+    assert status == 200
+    expected = engine.evaluate(*server.parse_spec(GOOD))
+    assert {k: v for k, v in report.items() if k != "generated_at"} == \
+           {k: v for k, v in json.loads(json.dumps(expected)).items() if k != "generated_at"}
+
+@pytest.mark.parametrize("payload", [{"params": [1, 2]}, {"params": None}, {"deterministic_inputs": [1]}, [1],
+                                     {"RPS": "ludicrous"}, {"documents": ["a.md"]}])
+def test_malformed_specs_get_400_and_keep_the_connection(payload):
+    (status, body), (status2, _) = exchange(server.EngineService(), post("/evaluate", payload), post("/evaluate", GOOD))
+    assert status == 400 and "error" in body
+    assert status2 == 200
+
+def test_batch_reports_bad_specs_per_index():
+    specs = [GOOD, {"params": [1, 2]}, {"params": None}, {"deterministic_inputs": [1]}, "x", GOOD]
+    [(status, results)] = exchange(server.EngineService(), post("/batch", {"specs": specs}))
+    assert status == 200
+    assert [r.get("index") for r in results] == [None, 1, 2, 3, 4, None]
+    assert results[0]["profiles"] == results[5]["profiles"]
+
+def test_batch_survives_failing_evaluation():
+    def broken(*args):
+        raise RuntimeError("boom")
+    [(status, results)] = exchange(server.EngineService(evaluate=broken), post("/batch", [GOOD]))
+    assert status == 200 and "boom" in results[0]["error"]
+    [(status, body)] = exchange(server.EngineService(evaluate=broken), post("/evaluate", GOOD))
+    assert status == 500 and "boom" in body["error"]
+
+def test_escaping_handler_errors_still_answer():
+    class Sync(server.EngineService):
+        def handle(self, method, path, body):
+            raise RuntimeError("sync")
+    class Async(server.EngineService):
+        def handle(self, method, path, body):
+            async def fail():
+                raise RuntimeError("async")
+            return fail()
+    for service, text in ((Sync(), "sync"), (Async(), "async")):
+        (status, body), (status2, _) = exchange(service, post("/evaluate", GOOD), post("/evaluate", GOOD))
+        assert status == status2 == 500 and text in body["error"]
+
+def test_negative_content_length_is_rejected():
+    raw = b"POST /evaluate HTTP/1.1\r\nHost: t\r\nContent-Length: -5\r\n\r\n{}"
+    [(status, body)] = exchange(server.EngineService(), raw)
+    assert status == 400 and "Content-Length" in body["error"]
+
+def test_invalid_json_and_routes():
+    service = server.EngineService()
+    answers = exchange(service, _request("POST", "/evaluate", b"{nope"), _request("GET", "/nowhere"),
+                       _request("GET", "/evaluate"), _request("GET", "/health"))
+    assert [status for status, _ in answers] == [400, 404, 405, 200]
+
+def test_cache_and_coalescing():
+    service = server.EngineService()
+    body = json.dumps(GOOD).encode()
+    async def go():
+        key, args = service.parse(GOOD)
+        results = await asyncio.gather(*(service.get("evaluate", key, args) for _ in range(10)))
+        return results, await service.get("evaluate", key, args)
+    results, again = asyncio.run(go())
+    assert len(set(results)) == 1 and again == results[0] and json.loads(body) == GOOD
+    assert service.coalesced == 9 and service.cache.hits == 1
+
+def test_lru_cache_evicts_oldest():
+    cache = server.LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.peek("b") is None and cache.peek("a") == 1 and cache.peek("c") == 3
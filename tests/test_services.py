@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+import engine
+from services import ServiceRegistry, ServiceSet, REGISTRY
+
+def test_registry_interns_once():
+    reg = ServiceRegistry(["S3", "IAM"])
+    assert reg.intern("S3") == 0 and reg.intern("KMS") == 2 and len(reg) == 3
+    assert reg.mask(["IAM", "S3", "IAM"]) == 0b11
+    assert reg.names_of(reg.mask(["KMS", "IAM", "S3"])) == ("IAM", "KMS", "S3")
+
+def test_set_operations_match_python_sets():
+    names = sorted(REGISTRY.names_of(engine.STORAGE_CORE | engine.COMPLEX_MODEL_REQUIRED | engine.TB_LARGE_REQUIRED
+                                     | engine.RPS_SCALE_REQUIRED | engine.COST_SAVING_RECOMMENDED))
+    rng = random.Random(0)
+    for _ in range(200):
+        a, b = set(rng.sample(names, 6)), set(rng.sample(names, 6))
+        sa, sb = ServiceSet.of(a), ServiceSet.of(b)
+        assert list(sa | sb) == sorted(a | b)
+        assert list(sa & b) == sorted(a & b)
+        assert list(sa - sb) == sorted(a - b)
+        assert list(sa ^ sb) == sorted(a ^ b)
+        assert len(sa) == len(a) and sa == a and (sa == sb) == (a == b)
+        assert all(n in sa for n in a) and not any(n in sa for n in b - a)
+        assert sa.any_of(sb.mask) == bool(a & b) and sa.all_of(sb.mask) == (b <= a)
+
+def test_coerce_accepts_sets_masks_and_names():
+    s = ServiceSet.of(["S3", "IAM"])
+    assert ServiceSet.coerce(s) is s
+    assert ServiceSet.coerce(s.mask) == s == ServiceSet.coerce(["IAM", "S3"])
+    assert not ServiceSet() and "S3" not in ServiceSet()
+
+def test_lookups_do_not_grow_the_registry():
+    before = len(REGISTRY)
+    s = ServiceSet.of(["S3"])
+    assert s != ["S3", "Not A Service"] and not s == {"Not A Service"} and "Not A Service" not in s
+    with pytest.raises(ValueError, match="Not A Service"):
+        ServiceSet.coerce(["S3", "Not A Service"])
+    with pytest.raises(ValueError):
+        s | ["Not A Service"]
+    assert len(REGISTRY) == before and "Not A Service" not in REGISTRY.ids
+
+def test_rule_packs_still_add_new_services(install_pack):
+    install_pack({"services": [{"when": [], "required": [], "recommended": ["Pack Only Service"]}]})
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    report = engine.evaluate(params, "medium", "medium", "medium", "slo_99_9")
+    assert "Pack Only Service" in report["recommended_services"]
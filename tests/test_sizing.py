@@ -0,0 +1,107 @@
+import copy
+import itertools
+import json
+import random
+
+import numpy as np
+import pytest
+
+import engine
+import sizing
+from services import REGISTRY
+
+@pytest.fixture
+def tables():
+    # load_table edits the module tables in place; put them back afterwards
+    saved = copy.deepcopy(sizing.DEMAND), copy.deepcopy(sizing.LIMITS)
+    yield
+    sizing.DEMAND.clear()
+    sizing.DEMAND.update(saved[0])
+    sizing.LIMITS.clear()
+    sizing.LIMITS.update(saved[1])
+    sizing.reset()
+
+def test_streaming_and_serving_at_high_rps():
+    mask = REGISTRY.mask(["API Gateway", "Kinesis", "MSK", "Lambda", "Provisioned Concurrency", "ECS Fargate"])
+    out = sizing.size(mask, "high", "small", "short", "slo_99_9")
+    assert out["demand"] == {"rps": 10000, "tb": 1, "retention_months": 1, "replicas": 1}
+    assert out["services"] == {
+        "API Gateway": {"peak_rps": 13000},
+        "Kinesis": {"shards": 13},
+        "MSK": {"partitions": 6, "brokers": 3},
+        "Lambda": {"concurrency": 2600, "provisioned_concurrency": 1300},
+        "ECS Fargate": {"tasks": 65},
+    }
+    assert out["warnings"] == [
+        "API Gateway peak_rps 13000 exceeds api_gateway_account_rps (10000)",
+        "Lambda concurrency 2600 exceeds lambda_account_concurrency (1000)",
+    ]
+
+def test_search_analytics_and_storage_at_large_tb():
+    mask = REGISTRY.mask(["OpenSearch", "Redshift", "EMR", "S3", "S3 Glacier"])
+    out = sizing.size(mask, "low", "large", "long", "slo_99_99")
+    assert out["services"] == {
+        "OpenSearch": {"primary_shards": 256, "replicas": 2, "data_nodes": 25},
+        "Redshift": {"nodes": 2},
+        "EMR": {"core_nodes": 26},
+        "S3": {"gb_months": 102400 * 3},
+        "S3 Glacier": {"gb_months": 102400 * 33},
+    }
+    assert out["warnings"] == []
+
+def test_storage_without_glacier_and_with_replication():
+    out = sizing.size(REGISTRY.mask(["S3"]), "low", "tiny", "short", "best_effort")
+    # 0.1 TB is 102.4 GB: one month rounds up to 103, not 104 from float noise
+    assert out["services"] == {"S3": {"gb_months": 103}}
+    out = sizing.size(REGISTRY.mask(["S3", "Multi-Region Replication"]), "low", "large", "long", "best_effort")
+    assert out["services"] == {"S3": {"gb_months": 102400 * 36 * 2}}
+
+def test_size_returns_copies():
+    mask = REGISTRY.mask(["Kinesis"])
+    sizing.size(mask, "high", "small", "short", "slo_99_9")["services"]["Kinesis"]["shards"] = 0
+    assert sizing.size(mask, "high", "small", "short", "slo_99_9")["services"]["Kinesis"]["shards"] == 13
+
+def test_report_sizing_is_size_of_its_services(inputs):
+    for args in inputs[:100]:
+        report = engine.evaluate(*args)
+        mask = REGISTRY.mask(report["required_services"]) | REGISTRY.mask(report["recommended_services"])
+        assert report["sizing"] == sizing.size(mask, *args[1:5])
+
+def test_size_columns_matches_size():
+    rng = random.Random(0)
+    services = sizing.SIZED_SERVICES + sizing.MODIFIERS
+    options = [list(sizing.DEMAND[key]) for key in ("rps", "tb", "retention_months", "replicas")]
+    rows = [([s for s in services if rng.random() < 0.5], *(rng.choice(o) for o in options)) for _ in range(300)]
+    rows += [(services, *combo) for combo in itertools.product(*options)]
+    d = {key: np.array([sizing.DEMAND[key][row[1 + j]] for row in rows], dtype=np.float64)
+         for j, key in enumerate(("rps", "tb", "retention_months", "replicas"))}
+    has = {s: np.array([s in row[0] for row in rows]) for s in services}
+    columns, over = sizing.size_columns(d, has)
+    for i, (names, *dropdowns) in enumerate(rows):
+        out = sizing.size(REGISTRY.mask(names), *dropdowns)
+        for (svc, metric), values in columns.items():
+            assert int(values[i]) == out["services"].get(svc, {}).get(metric, 0), (names, dropdowns, svc, metric)
+        exceeded = {limit for limit, flags in over.items() if flags[i]}
+        assert exceeded == {w.split(" exceeds ")[1].split(" ")[0] for w in out["warnings"]}
+
+@pytest.mark.parametrize("table, message", [
+    ({"limit": {}}, "unknown sizing table sections"),
+    ({"demand": {"users": {"low": 1}}}, "unknown demand 'users'"),
+    ({"demand": {"rps": {"ludicrous": 1}}}, "unknown rps options"),
+    ({"limits": {"kinesis_shard_rps": 2000, "warp_factor": 9}}, "unknown limits"),
+])
+def test_load_table_rejects_unknown_entries(tables, tmp_path, table, message):
+    path = tmp_path / "sizing.json"
+    path.write_text(json.dumps(table))
+    before = copy.deepcopy((sizing.DEMAND, sizing.LIMITS))
+    with pytest.raises(ValueError, match=message):
+        sizing.load_table(str(path))
+    assert (sizing.DEMAND, sizing.LIMITS) == before
+
+def test_load_table_applies_and_resets_the_memo(tables, tmp_path):
+    mask = REGISTRY.mask(["Kinesis"])
+    assert sizing.size(mask, "very_high", "small", "short", "slo_99_9")["services"]["Kinesis"]["shards"] == 65
+    path = tmp_path / "sizing.json"
+    path.write_text(json.dumps({"demand": {"rps": {"very_high": 80000}}, "limits": {"kinesis_shard_rps": 2000}}))
+    sizing.load_table(str(path))
+    assert sizing.size(mask, "very_high", "small", "short", "slo_99_9")["services"]["Kinesis"]["shards"] == 102
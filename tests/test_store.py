@@ -0,0 +1,95 @@
+import pytest
+
+import engine
+from store import ReportStore
+
+def stored(tmp_path, inputs, n=200):
+    store = ReportStore(str(tmp_path / "reports.db"))
+    reports = [engine.evaluate(*args) for args in inputs[:n]]
+    ids = store.add_many(reports[: n // 2], project="a") + store.add_many(reports[n // 2:], project="b")
+    return store, dict(zip(ids, reports))
+
+def brute_force(reports, services=(), required=(), profiles=(), failed=(), passed=(), rps=None, sla=None,
+                project=None, confidence_below=None):
+    out = []
+    for rid, (proj, r) in reports.items():
+        checks = r.get("checks", {})
+        if (all(s in r["required_services"] or s in r["recommended_services"] for s in services)
+                and all(s in r["required_services"] for s in required)
+                and all(p in r["profiles"] for p in profiles)
+                and all(checks.get(c) is False for c in failed)
+                and all(checks.get(c) is True for c in passed)
+                and (rps is None or r["deterministic_inputs"]["RPS"] == rps)
+                and (sla is None or r["deterministic_inputs"]["SLA"] == sla)
+                and (project is None or proj == project)
+                and (confidence_below is None or r["confidence"] < confidence_below)):
+            out.append(rid)
+    return out
+
+def test_round_trip_is_exact(tmp_path, inputs):
+    store, reports = stored(tmp_path, inputs)
+    # checks out of id order and non-bool values fall back to the JSON part
+    odd = dict(reports[1], checks=dict(reversed(list(reports[1]["checks"].items()))), confidence=90)
+    rid = store.add(odd)
+    for i, report in list(reports.items()) + [(rid, odd)]:
+        got = store.get(i)
+        assert got == report and list(got) == list(report) and list(got["checks"]) == list(report["checks"])
+    store.close()
+    reopened = ReportStore(str(tmp_path / "reports.db"))
+    assert reopened.get(rid) == odd
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"services": ["Neptune"]},
+    {"required": ["SageMaker"], "project": "b"},
+    {"profiles": ["Compliance-High"]},
+    {"failed": ["Observability"]},
+    {"passed": ["Security", "SLA"]},
+    {"rps": "high", "sla": "slo_99_99"},
+    {"confidence_below": 80},
+])
+def test_queries_match_brute_force(tmp_path, inputs, filters):
+    store, reports = stored(tmp_path, inputs)
+    owners = {rid: ("a" if n < 100 else "b", r) for n, (rid, r) in enumerate(reports.items())}
+    assert store.query(**filters) == brute_force(owners, **filters)
+    assert store.count(**filters) == len(store.query(**filters))
+
+def test_passed_needs_the_check(tmp_path, inputs):
+    store, reports = stored(tmp_path, inputs, n=10)
+    report = dict(engine.evaluate(*inputs[0]))
+    del report["checks"]["Security"]
+    unsorted = dict(report, checks=dict(reversed(list(report["checks"].items()))))
+    without, reversed_ = store.add(report), store.add(unsorted)
+    assert without not in store.query(passed=["Security"])
+    assert without in store.query(passed=["Storage"]) and reversed_ in store.query(passed=["Storage"])
+    assert reversed_ not in store.query(passed=["Security"])
+
+def test_rolled_back_add_leaves_names_consistent(tmp_path, inputs):
+    path = str(tmp_path / "reports.db")
+    store = ReportStore(path)
+    first = engine.evaluate(*inputs[0])
+    store.add(first)
+    bad = dict(first, profiles=["Ghost"], brief="never stored", extra=object())
+    with pytest.raises(TypeError):
+        store.add_many([dict(first, profiles=["Also-Ghost"]), bad])
+    assert store.query() == [1] and store.count(profiles=["Also-Ghost"]) == 0
+    later = dict(first, profiles=["Ghost", "Real"], brief="stored")
+    rid = store.add(later)
+    assert store.get(rid) == later and store.query(profiles=["Ghost"]) == [rid]
+    store.close()
+    reopened = ReportStore(path)
+    assert reopened.get(1) == first and reopened.get(rid) == later
+    assert reopened.query(profiles=["Real"]) == [rid]
+
+def test_diff(tmp_path, inputs):
+    store = ReportStore(str(tmp_path / "reports.db"))
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    a = store.add(engine.evaluate(params, "medium", "medium", "medium", "slo_99_9"), project="p")
+    b = store.add(engine.evaluate(dict(params, **{"Security & Compliance": 9}), "medium", "medium", "medium", "slo_99_9"),
+                  project="p")
+    out = store.diff(a, store.run_id("p", 2))
+    assert out["b"] == b and out["inputs"] == {"Security & Compliance": [5, 9]}
+    ra, rb = store.get(a), store.get(b)
+    assert out["profiles_gained"] == sorted(set(rb["profiles"]) - set(ra["profiles"]))
+    assert out["checks_flipped"] == {k: [ra["checks"][k], rb["checks"][k]] for k in ra["checks"]
+                                     if ra["checks"][k] != rb["checks"][k]}
@@ -0,0 +1,99 @@
+import io
+import json
+import random
+
+import pytest
+
+import cli
+import tagging
+
+def brute_force(text, dictionary):
+    # every (term, start) with the tagger's whole-word rules, by trying each term at each position
+    text = text.lower()
+    def word(ch):
+        return ch.isalnum() or ch == "_"
+    terms = {}
+    for tag_terms in dictionary.values():
+        for term in tag_terms:
+            term = term.strip().lower()
+            if not term or term in terms:
+                continue
+            n = 0
+            for i in range(len(text) - len(term) + 1):
+                if text.startswith(term, i) and (i == 0 or not word(text[i - 1]) or not word(term[0])):
+                    j = i + len(term)
+                    if not word(term[-1]) or j == len(text) or not word(text[j]):
+                        n += 1
+            if n:
+                terms[term] = n
+    return terms
+
+def random_document(rng, dictionary, words=3000):
+    vocabulary = [t for terms in dictionary.values() for t in terms]
+    vocabulary += [t.upper() for t in vocabulary[:10]] + ["saphire", "xsap", "phishing", "bank's", "s/4", "real", "-"]
+    vocabulary += ["the", "data", "platform", "with", "and", "records"]
+    separators = [" ", "  ", "\n", ", ", ". ", "/", "-", "_", "(", ")"]
+    return "".join(rng.choice(vocabulary) + rng.choice(separators) for _ in range(words))
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1000, 1 << 20])
+def test_scan_matches_brute_force_at_any_chunk_size(chunk_size):
+    rng = random.Random(chunk_size)
+    text = random_document(rng, tagging.DICTIONARY)
+    result = tagging.Tagger().scan(io.StringIO(text), chunk_size)
+    assert result["terms"] == brute_force(text, tagging.DICTIONARY)
+    assert result["chars"] == len(text)
+    tags = {}
+    tagger = tagging.Tagger()
+    for term, n in result["terms"].items():
+        for tag in tagger.term_tags[term]:
+            tags[tag] = tags.get(tag, 0) + n
+    assert result["tags"] == tags
+
+def test_symbol_terms_and_overlaps():
+    dictionary = {"a": ["sap", "sap hana", "s/4hana", ".net"], "b": ["hana"]}
+    text = "SAP HANA, s/4hana on sapphire; x.net and .NET"
+    assert tagging.Tagger(dictionary).scan(text)["terms"] == brute_force(text, dictionary)
+
+def test_merge_and_brief_tags():
+    a = tagging.Tagger().scan("hipaa hipaa sap")
+    b = tagging.Tagger().scan("sap patient")
+    merged = tagging.merge([a, b])
+    assert merged["tags"] == {"health": 1, "hipaa": 2, "sap": 2}
+    assert merged["chars"] == len("hipaa hipaa sap") + len("sap patient")
+    assert tagging.brief_tags(merged["tags"], 2) == ["hipaa", "sap"]
+    assert tagging.tag_brief("banking", merged["tags"], 2) == "banking hipaa sap"
+    assert tagging.tag_brief("", merged["tags"], 1) == "health hipaa sap"
+    report = tagging.apply_tags({"brief": "banking hipaa sap"}, "banking", merged["tags"], 2)
+    assert report == {"brief": "banking", "tags": ["hipaa", "sap"]}
+
+def test_default_tagger_rebuilds_only_after_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(tagging, "DICTIONARY", {k: list(v) for k, v in tagging.DICTIONARY.items()})
+    tagging.dictionary_changed()
+    tagger = tagging.default_tagger()
+    assert tagging.default_tagger() is tagger
+    path = tmp_path / "extra.json"
+    path.write_text(json.dumps({"logistics": ["warehouse", "fleet"]}))
+    tagging.load_dictionary(path)
+    rebuilt = tagging.default_tagger()
+    assert rebuilt is not tagger
+    assert rebuilt.scan("fleet warehouse")["tags"] == {"logistics": 2}
+    path.write_text(json.dumps({"logistics": ["", "fleet"]}))
+    with pytest.raises(ValueError):
+        tagging.load_dictionary(path)
+    monkeypatch.undo()
+    tagging.dictionary_changed()
+
+def test_scan_file(tmp_path):
+    doc = tmp_path / "req.md"
+    doc.write_text("Patient records (PHI) must stay HIPAA compliant. Integrates with SAP S/4HANA.")
+    assert tagging.scan_file(doc, chunk_size=5)["tags"] == tagging.Tagger().scan(doc.read_text())["tags"]
+
+def test_cli_report_keeps_the_typed_brief(tmp_path):
+    doc = tmp_path / "req.md"
+    doc.write_text("Patient records (PHI) must stay HIPAA compliant. Integrates with SAP S/4HANA.")
+    report = json.loads(cli.process_line(1, json.dumps({"brief": "claims portal", "documents": [str(doc)]})))
+    assert report["brief"] == "claims portal"
+    assert report["tags"] == ["health", "hipaa", "sap"]
+    # the tags still reached the rules
+    tagged = json.loads(cli.process_line(2, json.dumps({"brief": "claims portal health hipaa sap"})))
+    assert report["profiles"] == tagged["profiles"]
@@ -0,0 +1,40 @@
+import verify
+from eqtable import ClassKeyer, derive_classes
+
+def summary(stride):
+    results, cross_process = verify.sweep(workers=1, stride=stride, recheck=0)
+    return verify.summarize(results, cross_process, 0.0, 1)
+
+def test_builtin_rules_hold_every_invariant():
+    size = ClassKeyer(derive_classes()).size
+    out = summary(size // 500)
+    assert out["checked"] == len(range(0, size, size // 500))
+    assert not verify.violated(out)
+    assert all(inv["violations"] == 0 for inv in out["invariants"].values())
+
+def test_dead_and_overlapping_pack_rules_fail_strict(install_pack):
+    install_pack({
+        "profiles": [{"when": [["Security & Compliance", ">=", 9], ["Security & Compliance", "<=", 2]],
+                      "profile": "Never"}],
+        "services": [{"when": [["User Experience", ">=", 8]], "required": ["CloudFront"], "recommended": []},
+                     {"when": [["User Experience", ">=", 8]], "required": ["CloudFront"], "recommended": []}],
+    })
+    size = ClassKeyer(derive_classes()).size
+    out = summary(size // 500)
+    assert not verify.violated(out) and verify.violated(out, strict=True)
+    [dead] = [row for row in out["rules"]["profiles"] if row["label"].startswith("Never")]
+    assert dead["status"] == "dead" and dead["fired"] == 0
+    overlapping = [row for row in out["rules"]["services"] if "User Experience >= 8" in row["label"]][-2:]
+    assert [row["status"] for row in overlapping] == ["redundant", "redundant"]
+    assert overlapping[0]["fired"] == overlapping[1]["fired"] > 0
+    assert overlapping[0]["label"] == "required: CloudFront when User Experience >= 8"
+
+def test_service_rule_labels_list_both_tiers():
+    rule = {"when": [["profiles", "has", "Rich-UX"]], "required": ["S3", "CloudFront"], "recommended": ["Lambda"]}
+    assert verify._label("services", rule) == "required: CloudFront, S3; recommended: Lambda when profiles has Rich-UX"
+    assert verify._label("services", {"when": [], "recommended": ["Lambda"]}) == "recommended: Lambda always"
+
+def test_contributors_keep_rules_with_a_unique_effect():
+    assert verify._contributors([0, 1, 2], [0b011, 0b001, 0b100]) == [2, 0]
+    assert verify._contributors([0, 1], [0b1, 0b1]) == []
+    assert verify._contributors([3], [0, 0, 0, 0]) == [3]
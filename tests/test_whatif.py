@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+import engine
+import whatif
+from conftest import ROOT
+from incremental import IncrementalEvaluator
+from metrics import Metrics
+
+UX_PACK = {"profiles": [{"when": [["User Experience", ">=", 8]], "profile": "Rich-UX"}]}
+
+def _changes(a, b):
+    fields = ["profiles", "required_services", "recommended_services", "checks", "confidence"]
+    return any(a[f] != b[f] for f in fields)
+
+def test_explore_lists_exactly_the_moves_that_change_the_result(inputs):
+    for args in inputs[:40]:
+        rows, skipped = whatif.explore(*args, evaluator=IncrementalEvaluator(metrics=Metrics()))
+        listed = {(r["control"], r["change"]) for r in rows}
+        base = engine.evaluate(*args)
+        expected = set()
+        moves = list(whatif.neighbours(*args))
+        for control, old, new, moved in moves:
+            if _changes(base, engine.evaluate(*moved)):
+                expected.add((control, f"{old} → {new}"))
+        assert listed == expected, args
+        assert skipped <= len(moves) - len(listed)
+
+def test_neighbours_move_one_control_one_step():
+    params = {name: 1 for name in engine.PARAM_NAMES}
+    for control, old, new, moved in whatif.neighbours(params, "very_low", "tiny", "short", "best_effort", ""):
+        changed = [name for name in engine.PARAM_NAMES if moved[0][name] != params[name]]
+        changed += [k for k, a, b in zip(("RPS", "DATA_TB", "RETENTION", "SLA"), moved[1:5],
+                                          ("very_low", "tiny", "short", "best_effort")) if a != b]
+        assert len(changed) == 1
+
+def test_keyer_follows_rule_packs(install_pack):
+    params = {name: 7 for name in engine.PARAM_NAMES}
+    args = (params, "medium", "medium", "medium", "slo_99_9", "")
+    rows, _ = whatif.explore(*args, evaluator=IncrementalEvaluator(metrics=Metrics()))
+    assert not any(r["control"] == "User Experience" for r in rows)
+    install_pack(UX_PACK)
+    rows, _ = whatif.explore(*args, evaluator=IncrementalEvaluator(metrics=Metrics()))
+    assert any(r["control"] == "User Experience" and r["profiles_gained"] == ["Rich-UX"] for r in rows)
+
+def test_neighbour_runs_have_their_own_counter():
+    metrics = Metrics()
+    params = {name: 5 for name in engine.PARAM_NAMES}
+    whatif.explore(params, "medium", "medium", "medium", "slo_99_9", evaluator=IncrementalEvaluator(metrics=metrics))
+    assert metrics.counter("evaluations") == 1
+    assert metrics.counter("whatif_evaluations") > 0
+
+def test_app_explores_only_when_asked():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+    assert not at.exception
+    before = len(at.dataframe)
+    at.toggle(key="whatif_explore").set_value(True).run()
+    assert not at.exception
+    assert len(at.dataframe) == before + 1
@@ -0,0 +1,31 @@
+import pytest
+
+testing = pytest.importorskip("streamlit.testing.v1")
+
+import widgets
+
+SCRIPT = """
+import streamlit as st
+import widgets
+from diagram_cache import DiagramCache
+
+calls = st.session_state.setdefault("calls", [])
+def render(dot, fmt):
+    calls.append(fmt)
+    return b'<svg xmlns="http://www.w3.org/2000/svg" width="4" height="4"></svg>' if fmt == "svg" else b"PNG"
+cache = st.session_state.setdefault("cache", DiagramCache(renderer=render))
+widgets.get_diagram_cache = lambda: cache
+widgets.show_diagram("digraph { a -> b }", "aws")
+"""
+
+def test_png_is_not_rendered_on_rerun():
+    original = widgets.get_diagram_cache
+    try:
+        at = testing.AppTest.from_string(SCRIPT).run()
+        assert not at.exception
+        at.run()
+        assert not at.exception
+        # the SVG is laid out once (then cached); the PNG only on request
+        assert at.session_state["calls"] == ["svg"]
+    finally:
+        widgets.get_diagram_cache = original
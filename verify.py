@@ -0,0 +1,527 @@
+# Exhaustive verification of the decision engine: every input equivalence class, all CPU cores.
+#
+#   python verify.py                            # all classes; exit 1 if any invariant is violated
+#   python verify.py --json coverage.json       # also write the full coverage matrix
+#   python verify.py --stride 101               # quick pass over every 101st class
+#   python verify.py --rules pack.json --strict # rule packs too; dead / redundant rules also fail
+#
+# Every engine input falls into one of ClassKeyer(derive_classes()).size classes (eqtable.py) and the
+# outcome is constant within a class, so one member per class covers the whole input space. That
+# premise is checked as well: a second member of each class (top of every slider band, last value of
+# every dropdown class, other keywords in upper case) must give the same outcome.
+#
+# Per class the rules are also re-run one by one straight from their conditions (rules.holds, no
+# index). That reproduces the report stage by stage and counts, for every rule, how often it fires
+# and how often it changes the outcome: the coverage matrix of dead rules (never fire), redundant
+# rules (fire, but other rules always supply the same effect / an earlier rule decides the check),
+# checks that never fail or never pass, and ML components that are always or never covered.
+#
+# Reports are hashed per chunk; a sample of chunks is re-run in fresh interpreters with a different
+# PYTHONHASHSEED and must hash the same. generated_at is pinned through SOURCE_DATE_EPOCH.
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+import engine
+from eqtable import OUTCOME_FIELDS, ClassKeyer, derive_classes
+from incremental import IncrementalEvaluator
+from rules import STAGES, holds
+from services import REGISTRY, ServiceSet
+
+INVARIANTS = {
+    "class_key": "a class's representative maps back to that class",
+    "class_uniform": "another member of the class gives the same outcome",
+    "byte_identical": "evaluating the same inputs twice gives byte-identical reports",
+    "incremental_agrees": "IncrementalEvaluator reports the same bytes as engine.evaluate",
+    "tiers_disjoint": "no service is both required and recommended",
+    "canonical_order": "profiles sorted, services in registry order, no duplicates",
+    "pipeline_complete": "ml_pipeline lists every component exactly once",
+    "checks_complete": "every check is reported, in rule order",
+    "score_consistent": "confidence is the weighted score of the reported checks",
+    "rules_agree": "rule-by-rule evaluation reproduces every stage of the report",
+    "failures_remediated": "every failed check has a remediation",
+    # global: checked once, not per class
+    "weights_complete": "every check has a non-negative weight and every weight a check",
+    "score_monotone": "passing one more check never lowers the score; 0 when all fail, 100 when all pass",
+    "cross_process": "re-running chunks in fresh interpreters with another hash seed gives the same bytes",
+}
+EXAMPLES = 3
+EPOCH = "1700000000"
+
+def _mask(value):
+    return ServiceSet.coerce(value).mask if value else 0
+
+def _label(stage, rule):
+    conds = " & ".join(f"{f} {op} {', '.join(REGISTRY.names_of(v)) if f == 'services' and isinstance(v, int) else v}"
+                       for f, op, v in rule.get("when", []))
+    if stage == "profiles":
+        effect = rule["profile"] + (" (fallback)" if rule.get("fallback") else "")
+    elif stage == "ml_pipeline":
+        comps = rule["components"]
+        effect = ", ".join(comps[:3]) + (f" +{len(comps) - 3}" if len(comps) > 3 else "")
+    elif stage == "checks":
+        effect = rule["check"]
+    elif stage == "remediation":
+        effect = rule["text"][:40]
+    else:
+        tiers = [(tier, ", ".join(REGISTRY.names_of(_mask(rule.get(tier))))) for tier in ("required", "recommended")]
+        effect = "; ".join(f"{tier}: {names}" for tier, names in tiers if names) or "no services"
+    return f"{effect} when {conds}" if conds else f"{effect} always"
+
+def _contributors(positions, effects):
+    # fired rules that supply at least one effect bit no other fired rule does
+    if len(positions) < 2:
+        return positions
+    prefix, acc = [], 0
+    for p in positions:
+        prefix.append(acc)
+        acc |= effects[p]
+    out, acc = [], 0
+    for i in range(len(positions) - 1, -1, -1):
+        p = positions[i]
+        if effects[p] & ~(prefix[i] | acc):
+            out.append(p)
+        acc |= effects[p]
+    return out
+
+# --------------------------
+# Worker: one chunk of classes
+# --------------------------
+_state = None
+
+class _Sweep:
+    def __init__(self):
+        rs = engine.RULESET
+        self.spec = derive_classes()
+        self.keyer = ClassKeyer(self.spec)
+        self.incremental = IncrementalEvaluator()
+        self.rules = rs.rules
+        self.conditions = rs.conditions
+        self.components = rs.components
+        self.check_names = rs.check_names
+        n_profiles = len(rs.profile_names)
+        pids = {p: i for i, p in enumerate(rs.profile_names)}
+        cids = {c: i for i, c in enumerate(rs.components)}
+        width = len(REGISTRY)
+        texts = {}
+        self.fallback = [bool(r.get("fallback")) for r in self.rules["profiles"]]
+        self.service_masks = [(_mask(r.get("required")), _mask(r.get("recommended"))) for r in self.rules["services"]]
+        self.effects = {
+            "profiles": [1 << (pids[r["profile"]] + (n_profiles if r.get("fallback") else 0)) for r in self.rules["profiles"]],
+            "services": [req | rec << width for req, rec in self.service_masks],
+            "ml_pipeline": [sum(1 << cids[c] for c in set(r["components"])) for r in self.rules["ml_pipeline"]],
+            "remediation": [1 << texts.setdefault(r["text"], len(texts)) for r in self.rules["remediation"]],
+        }
+        self.verdicts = []
+        for r in self.rules["checks"]:
+            kind = next(k for k in ("any", "all", "pipeline_all", "pass") if k in r)
+            self.verdicts.append((kind, _mask(r[kind]) if kind in ("any", "all") else r[kind]))
+        # remediation rule positions per check they test
+        self.remedies = {}
+        for pos, conds in enumerate(self.conditions["remediation"]):
+            for kind, field, op, value in conds:
+                if kind == "checks":
+                    self.remedies.setdefault(value, []).append(pos)
+
+    def _alternate(self, k):
+        # the class member at the other end of every slider band / dropdown class / keyword group
+        spec = self.spec
+        digits = self.keyer.digits(k)
+        n_sliders, n_dropdowns = len(spec["sliders"]), len(spec["dropdowns"])
+        params = {}
+        for s, d in zip(spec["sliders"], digits):
+            cuts = s["cuts"]
+            params[s["name"]] = cuts[d] - 1 if d < len(cuts) else engine.PARAM_MAX
+        rps, tb, retention, sla = (dd["classes"][d][-1] for dd, d in zip(spec["dropdowns"], digits[n_sliders:]))
+        flags = digits[n_sliders + n_dropdowns:]
+        brief = " ".join(["Project"] + [g[-1].upper() for g, on in zip(spec["brief_groups"], flags) if on])
+        return params, rps, tb, retention, sla, brief
+
+    def run(self, start, stop, stride):
+        self.digest = hashlib.sha256()
+        self.violations = Counter()
+        self.examples = {}
+        self.fired = {stage: [0] * len(self.rules[stage]) for stage in STAGES}
+        self.effective = {stage: [0] * len(self.rules[stage]) for stage in STAGES}
+        self.passed, self.failed, self.covered = Counter(), Counter(), Counter()
+        self.profiles, self.required, self.recommended = Counter(), Counter(), Counter()
+        self.outcomes = set()
+        count = 0
+        for k in range(start, stop, stride):
+            self.check(k)
+            count += 1
+        return {
+            "start": start, "stop": stop, "stride": stride, "classes": count,
+            "digest": self.digest.hexdigest(),
+            "violations": dict(self.violations), "examples": self.examples,
+            "fired": self.fired, "effective": self.effective,
+            "passed": dict(self.passed), "failed": dict(self.failed), "covered": dict(self.covered),
+            "profiles": dict(self.profiles), "required": dict(self.required), "recommended": dict(self.recommended),
+            "outcomes": self.outcomes,
+        }
+
+    def fail(self, name, k, args, message):
+        self.violations[name] += 1
+        examples = self.examples.setdefault(name, [])
+        if len(examples) < EXAMPLES:
+            params, rps, tb, retention, sla, brief = args
+            examples.append({"class": k, "message": message, "params": params, "RPS": rps, "DATA_TB": tb,
+                             "RETENTION": retention, "SLA": sla, "brief": brief})
+
+    def check(self, k):
+        args = self.keyer.representative(k)
+        if self.keyer.key(*args) != k:
+            self.fail("class_key", k, args, f"representative keys to {self.keyer.key(*args)}")
+
+        report = engine.evaluate(*args)
+        data = json.dumps(report).encode("utf-8")
+        self.digest.update(data)
+        again = json.dumps(engine.evaluate(*args)).encode("utf-8")
+        if again != data:
+            self.fail("byte_identical", k, args, "second evaluation differs")
+        if json.dumps(self.incremental.evaluate(*args)).encode("utf-8") != data:
+            self.fail("incremental_agrees", k, args, "incremental report differs")
+
+        outcome = [report[f] for f in OUTCOME_FIELDS]
+        self.outcomes.add(hashlib.sha1(json.dumps(outcome).encode("utf-8")).digest()[:8])
+        alt = self._alternate(k)
+        if self.keyer.key(*alt) == k:
+            other = engine.evaluate(*alt)
+            moved = [f for f, value in zip(OUTCOME_FIELDS, outcome) if other[f] != value]
+            if moved:
+                self.fail("class_uniform", k, alt, f"{', '.join(moved)} differ from the representative's")
+
+        self.check_report(k, args, report)
+        self.interpret(k, args, report)
+
+    def check_report(self, k, args, report):
+        req, rec = report["required_services"], report["recommended_services"]
+        both = set(req) & set(rec)
+        if both:
+            self.fail("tiers_disjoint", k, args, f"both required and recommended: {sorted(both)}")
+        profiles = report["profiles"]
+        if (profiles != sorted(set(profiles)) or req != list(REGISTRY.names_of(REGISTRY.mask(req)))
+                or rec != list(REGISTRY.names_of(REGISTRY.mask(rec)))):
+            self.fail("canonical_order", k, args, "profiles or services out of order / duplicated")
+        ml = report["ml_pipeline"]
+        if len(ml) != len(self.components) or set(ml) != set(self.components):
+            self.fail("pipeline_complete", k, args, f"{len(ml)} entries for {len(self.components)} components")
+        checks = report["checks"]
+        if list(checks) != self.check_names:
+            self.fail("checks_complete", k, args, f"checks {list(checks)}")
+        if report["confidence"] != engine.confidence_score(checks) or not 0 <= report["confidence"] <= 100:
+            self.fail("score_consistent", k, args, f"confidence {report['confidence']}")
+
+        for p in profiles:
+            self.profiles[p] += 1
+        for s in req:
+            self.required[s] += 1
+        for s in rec:
+            self.recommended[s] += 1
+        for name, ok in checks.items():
+            (self.passed if ok else self.failed)[name] += 1
+
+    def interpret(self, k, args, report):
+        params, rps, tb, retention, sla, brief = args
+        checks = report["checks"]
+        failed = {name for name, ok in checks.items() if not ok}
+        svc = REGISTRY.mask(report["required_services"]) | REGISTRY.mask(report["recommended_services"])
+        inputs = {"params": params, "rps": rps, "tb": tb, "retention": retention, "sla": sla, "brief": brief.lower(),
+                  "profiles": set(report["profiles"]), "services": svc, "failed": failed}
+        fired = {}
+        for stage in STAGES:
+            hits = fired[stage] = [pos for pos, conds in enumerate(self.conditions[stage])
+                                   if all(holds(c, inputs) for c in conds)]
+            counts = self.fired[stage]
+            for pos in hits:
+                counts[pos] += 1
+        mismatched = []
+
+        # profiles: fallback rules only count when no other profile rule fired
+        hits = fired["profiles"]
+        primary = [p for p in hits if not self.fallback[p]]
+        applied = primary or hits
+        profiles = {self.rules["profiles"][p]["profile"] for p in applied}
+        if profiles != inputs["profiles"]:
+            mismatched.append("profiles")
+        self._count_effective("profiles", applied)
+
+        req = rec = 0
+        for pos in fired["services"]:
+            req |= self.service_masks[pos][0]
+            rec |= self.service_masks[pos][1]
+        rec &= ~req
+        if req != REGISTRY.mask(report["required_services"]) or rec != REGISTRY.mask(report["recommended_services"]):
+            mismatched.append("services")
+        self._count_effective("services", fired["services"])
+
+        covered = set()
+        for pos in fired["ml_pipeline"]:
+            covered.update(self.rules["ml_pipeline"][pos]["components"])
+        pipeline = [c for c in self.components if c in covered] + [c for c in self.components if c not in covered]
+        if pipeline != report["ml_pipeline"]:
+            mismatched.append("ml_pipeline")
+        self._count_effective("ml_pipeline", fired["ml_pipeline"])
+        for c in covered:
+            self.covered[c] += 1
+
+        # checks: the first fired rule of each check decides it
+        deciding = {}
+        for pos in fired["checks"]:
+            deciding.setdefault(self.rules["checks"][pos]["check"], pos)
+        verdicts = {}
+        for name in self.check_names:
+            pos = deciding.get(name)
+            kind, operand = self.verdicts[pos] if pos is not None else ("pass", False)
+            if kind == "any":
+                verdicts[name] = svc & operand != 0
+            elif kind == "all":
+                verdicts[name] = svc & operand == operand
+            elif kind == "pipeline_all":
+                verdicts[name] = all(c in report["ml_pipeline"] for c in operand)
+            else:
+                verdicts[name] = bool(operand)
+        if verdicts != checks:
+            mismatched.append("checks")
+        effective = self.effective["checks"]
+        for pos in deciding.values():
+            effective[pos] += 1
+
+        texts = [self.rules["remediation"][pos]["text"] for pos in fired["remediation"]]
+        if texts != report["remediation"]:
+            mismatched.append("remediation")
+        self._count_effective("remediation", fired["remediation"])
+        if mismatched:
+            self.fail("rules_agree", k, args, f"stages {', '.join(mismatched)} differ from the report")
+        hit = set(fired["remediation"])
+        unremedied = [name for name in failed if not hit.intersection(self.remedies.get(name, ()))]
+        if unremedied:
+            self.fail("failures_remediated", k, args, f"no remediation for {sorted(unremedied)}")
+
+    def _count_effective(self, stage, positions):
+        counts = self.effective[stage]
+        for pos in _contributors(positions, self.effects[stage]):
+            counts[pos] += 1
+
+def _init_worker(rule_packs=()):
+    global _state
+    # forked workers inherit the packs main() installed; spawned ones load them here
+    if rule_packs and not engine.RULE_PACKS:
+        for path in rule_packs:
+            engine.load_rule_pack(path)
+    _state = _Sweep()
+
+def verify_chunk(task):
+    return _state.run(*task)
+
+# --------------------------
+# Global invariants (do not depend on the inputs)
+# --------------------------
+def check_weights():
+    problems = []
+    names = engine.RULESET.check_names
+    missing = [k for k in names if k not in engine.WEIGHTS]
+    extra = [k for k in engine.WEIGHTS if k not in names]
+    negative = [k for k, w in engine.WEIGHTS.items() if w < 0]
+    if missing:
+        problems.append(f"checks without a weight: {missing}")
+    if extra:
+        problems.append(f"weights without a check: {extra}")
+    if negative:
+        problems.append(f"negative weights: {negative}")
+    return problems
+
+def check_monotone():
+    # every subset of passed checks (2 ** checks, 256 for the built-in rules)
+    names = engine.RULESET.check_names
+    scores = [engine.confidence_score({k: bool(bits >> i & 1) for i, k in enumerate(names)}) for bits in range(1 << len(names))]
+    problems = []
+    for bits, score in enumerate(scores):
+        for i, k in enumerate(names):
+            if not bits >> i & 1 and scores[bits | 1 << i] < score:
+                problems.append(f"passing {k} lowers {score} to {scores[bits | 1 << i]}")
+    if scores[0] != 0 or scores[-1] != 100:
+        problems.append(f"score is {scores[0]} with every check failed and {scores[-1]} with every check passed")
+    return problems[:EXAMPLES]
+
+# --------------------------
+# Sweep
+# --------------------------
+def tasks(size, stride=1, chunk=2048):
+    step = stride * chunk
+    return [(start, min(start + step, size), stride) for start in range(0, size, step)]
+
+def _pool(workers, rule_packs, context=None):
+    ctx = multiprocessing.get_context(context) if context else multiprocessing
+    return ctx.Pool(workers, initializer=_init_worker, initargs=(tuple(rule_packs),))
+
+def sweep(workers=None, stride=1, chunk=2048, rule_packs=(), recheck=8, progress=None):
+    # -> (merged chunk results, cross-process problems)
+    os.environ.setdefault("SOURCE_DATE_EPOCH", EPOCH)
+    workers = workers or os.cpu_count() or 1
+    size = ClassKeyer(derive_classes()).size
+    todo = tasks(size, stride, chunk)
+    results = []
+    if workers == 1:
+        _init_worker(rule_packs)
+        for task in todo:
+            results.append(verify_chunk(task))
+            if progress:
+                progress(len(results), len(todo))
+    else:
+        with _pool(workers, rule_packs) as pool:
+            for result in pool.imap_unordered(verify_chunk, todo):
+                results.append(result)
+                if progress:
+                    progress(len(results), len(todo))
+    results.sort(key=lambda r: r["start"])
+
+    problems = []
+    if recheck:
+        # evenly spread sample, first and last chunk included
+        picks = sorted({round(i * (len(todo) - 1) / max(recheck - 1, 1)) for i in range(min(recheck, len(todo)))})
+        seed = os.environ.get("PYTHONHASHSEED")
+        os.environ["PYTHONHASHSEED"] = "2" if seed == "1" else "1"
+        try:
+            with _pool(min(workers, len(picks)), rule_packs, "spawn") as pool:
+                rerun = pool.map(verify_chunk, [todo[i] for i in picks])
+        finally:
+            if seed is None:
+                del os.environ["PYTHONHASHSEED"]
+            else:
+                os.environ["PYTHONHASHSEED"] = seed
+        for i, result in zip(picks, rerun):
+            if result["digest"] != results[i]["digest"]:
+                problems.append(f"classes {result['start']}..{result['stop']} hash differently in a fresh interpreter")
+    return results, problems
+
+def summarize(results, cross_process, seconds, workers):
+    rs = engine.RULESET
+    total = sum(r["classes"] for r in results)
+    violations = Counter()
+    examples = {}
+    for r in results:
+        violations.update(r["violations"])
+        for name, found in r["examples"].items():
+            room = EXAMPLES - len(examples.setdefault(name, []))
+            examples[name].extend(found[:room])
+    for name, problems in (("weights_complete", check_weights()), ("score_monotone", check_monotone()),
+                           ("cross_process", cross_process)):
+        violations[name] += len(problems)
+        examples[name] = [{"message": p} for p in problems]
+
+    def merged(key):
+        out = Counter()
+        for r in results:
+            out.update(r[key])
+        return out
+
+    rule_rows = {}
+    for stage in STAGES:
+        fired = [sum(r["fired"][stage][pos] for r in results) for pos in range(len(rs.rules[stage]))]
+        effective = [sum(r["effective"][stage][pos] for r in results) for pos in range(len(rs.rules[stage]))]
+        rule_rows[stage] = [{
+            "rule": pos, "label": _label(stage, rule), "fired": f, "effective": e,
+            "status": "dead" if not f else "redundant" if not e else "live",
+        } for pos, (rule, f, e) in enumerate(zip(rs.rules[stage], fired, effective))]
+    passed, failed, covered = merged("passed"), merged("failed"), merged("covered")
+    required, recommended, profiles = merged("required"), merged("recommended"), merged("profiles")
+    return {
+        "classes": ClassKeyer(derive_classes()).size,
+        "checked": total,
+        "seconds": round(seconds, 1),
+        "workers": workers,
+        "distinct_outcomes": len(set().union(*(r["outcomes"] for r in results))),
+        "invariants": {name: {"description": text, "violations": violations[name], "examples": examples.get(name, [])}
+                       for name, text in INVARIANTS.items()},
+        "rules": rule_rows,
+        "checks": {k: {"passed": passed[k], "failed": failed[k],
+                       "status": "never fails" if not failed[k] else "never passes" if not passed[k] else "live"}
+                   for k in rs.check_names},
+        "components": {c: {"covered": covered[c],
+                           "status": "always" if covered[c] == total else "never" if not covered[c] else "live"}
+                       for c in rs.components},
+        "profiles": {p: profiles[p] for p in rs.profile_names},
+        "services": {s: {"required": required[s], "recommended": recommended[s]}
+                     for s in REGISTRY.names if required[s] or recommended[s]},
+        "unused_services": [s for s in REGISTRY.names if not required[s] and not recommended[s]],
+    }
+
+def render(summary):
+    lines = [f"verified {summary['checked']}/{summary['classes']} classes in {summary['seconds']} s "
+             f"on {summary['workers']} workers ({summary['distinct_outcomes']} distinct outcomes)", "", "invariants:"]
+    for name, inv in summary["invariants"].items():
+        n = inv["violations"]
+        lines.append(f"  {'ok  ' if not n else 'FAIL'}  {name:<20} {inv['description']}" + (f"  [{n}]" if n else ""))
+        for ex in inv["examples"]:
+            where = f"class {ex['class']}: " if "class" in ex else ""
+            lines.append(f"          {where}{ex['message']}")
+    lines += ["", "rules:"]
+    for stage, rows in summary["rules"].items():
+        counts = Counter(row["status"] for row in rows)
+        lines.append(f"  {stage:<12} {len(rows)} rules: {counts['live']} live, {counts['redundant']} redundant, {counts['dead']} dead")
+        for row in rows:
+            if row["status"] != "live":
+                lines.append(f"    {row['status']:<9} #{row['rule']} {row['label']}  (fired in {row['fired']} classes)")
+    lines += ["", "checks:"]
+    for name, c in summary["checks"].items():
+        flag = "" if c["status"] == "live" else f"  <- {c['status']}"
+        lines.append(f"  {name:<14} passed {c['passed']:>7}  failed {c['failed']:>7}{flag}")
+    always = [c for c, v in summary["components"].items() if v["status"] == "always"]
+    never = [c for c, v in summary["components"].items() if v["status"] == "never"]
+    lines += ["", f"ML components always covered: {', '.join(always) or '-'}",
+              f"ML components never covered: {', '.join(never) or '-'}",
+              f"profiles never detected: {', '.join(p for p, n in summary['profiles'].items() if not n) or '-'}",
+              f"services never selected: {', '.join(summary['unused_services']) or '-'}"]
+    return "\n".join(lines)
+
+def violated(summary, strict=False):
+    if any(inv["violations"] for inv in summary["invariants"].values()):
+        return True
+    if strict:
+        return (any(row["status"] != "live" for rows in summary["rules"].values() for row in rows)
+                or any(c["status"] != "live" for c in summary["checks"].values()))
+    return False
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sweep every input equivalence class, check engine invariants and "
+                                             "report rule / check coverage.")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count; 1 = in-process)")
+    ap.add_argument("--stride", type=int, default=1, help="check every Nth class only (default: all)")
+    ap.add_argument("--chunk-size", type=int, default=2048, help="classes per task sent to a worker")
+    ap.add_argument("--recheck", type=int, default=8,
+                    help="chunks re-run in fresh interpreters with another hash seed (0 = skip)")
+    ap.add_argument("--rules", action="append", default=[], help="extra JSON rule pack (see rules.py); repeatable")
+    ap.add_argument("--json", default=None, help="write the full coverage matrix and invariant results here")
+    ap.add_argument("--strict", action="store_true", help="also fail on dead / redundant rules and one-sided checks")
+    args = ap.parse_args(argv)
+    for path in args.rules:
+        try:
+            engine.load_rule_pack(path)
+        except (OSError, ValueError) as e:
+            ap.error(f"{path}: {e}")
+    workers = args.workers or os.cpu_count() or 1
+
+    def progress(done, total):
+        print(f"\r{done}/{total} chunks", end="", file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    results, cross_process = sweep(workers, args.stride, args.chunk_size, args.rules, args.recheck,
+                                   progress if sys.stderr.isatty() else None)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    summary = summarize(results, cross_process, time.perf_counter() - t0, workers)
+    print(render(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    sys.exit(1 if violated(summary, args.strict) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# One-step sensitivity ("what-if") explorer around the current configuration.
+#
+# For every single-control move (each slider +/-1, each dropdown to its neighbouring option) we
+# report which profiles / services / checks would change and the confidence delta, ranked by impact.
+# Neighbours are cheap: a move that stays inside the same equivalence class (eqtable) cannot change
+# anything and is skipped outright, and the rest go through the shared IncrementalEvaluator, so only
+# the stages whose inputs actually moved are recomputed - compose_services / strict_checks are reused
+# from cache whenever their own class keys are unchanged.
+
+import engine
+from eqtable import ClassKeyer, derive_classes
+from incremental import IncrementalEvaluator
+from services import REGISTRY
+
+DROPDOWN_CONTROLS = [
+    ("RPS", 1, engine.RPS_OPTIONS),
+    ("DATA_TB", 2, engine.DATA_TB_OPTIONS),
+    ("RETENTION", 3, engine.RETENTION_OPTIONS),
+    ("SLA", 4, engine.SLA_OPTIONS),
+]
+
+_keyer = (None, None)
+
+# full class keyer of the current engine.RULESET (rebuilt after a rule pack install replaces it)
+def _full_keyer():
+    global _keyer
+    ruleset, keyer = _keyer
+    if ruleset is not engine.RULESET:
+        keyer = ClassKeyer(derive_classes())
+        _keyer = (engine.RULESET, keyer)
+    return keyer
+
+def neighbours(params, rps, tb, retention, sla, brief=""):
+    # yields (control, old value, new value, args) for every one-step move
+    args = (params, rps, tb, retention, sla, brief)
+    for name in engine.PARAM_NAMES:
+        for step in (-1, 1):
+            v = params[name] + step
+            if engine.PARAM_MIN <= v <= engine.PARAM_MAX:
+                yield name, params[name], v, (dict(params, **{name: v}),) + args[1:]
+    for control, pos, options in DROPDOWN_CONTROLS:
+        values = [v for v, _ in options]
+        i = values.index(args[pos])
+        for j in (i - 1, i + 1):
+            if 0 <= j < len(values):
+                moved = list(args)
+                moved[pos] = values[j]
+                yield control, values[i], values[j], tuple(moved)
+
+def _diff(base, other):
+    base_svc = base["required"].mask | base["recommended"].mask
+    other_svc = other["required"].mask | other["recommended"].mask
+    flipped = [f"{k}: {'pass' if base['checks'][k] else 'fail'} → {'pass' if v else 'fail'}"
+               for k, v in other["checks"].items() if base["checks"].get(k) != v]
+    return {
+        "profiles_gained": sorted(other["profiles"] - base["profiles"]),
+        "profiles_lost": sorted(base["profiles"] - other["profiles"]),
+        "services_gained": list(REGISTRY.names_of(other_svc & ~base_svc)),
+        "services_lost": list(REGISTRY.names_of(base_svc & ~other_svc)),
+        # same service, different tier (required <-> recommended)
+        "services_retiered": list(REGISTRY.names_of((base["required"].mask ^ other["required"].mask) & base_svc & other_svc)),
+        "checks_flipped": flipped,
+        "score_delta": round(other["confidence"] - base["confidence"], 1),
+    }
+
+def explore(params, rps, tb, retention, sla, brief="", evaluator=None, base=None, include_unchanged=False):
+    # returns (rows ranked by impact, number of neighbours skipped as same-class)
+    evaluator = evaluator or IncrementalEvaluator()
+    base = base or evaluator.run(params, rps, tb, retention, sla, brief)
+    keyer = _full_keyer()
+    base_key = keyer.key(params, rps, tb, retention, sla, brief)
+    rows, skipped = [], 0
+    for control, old, new, args in neighbours(params, rps, tb, retention, sla, brief):
+        if keyer.key(*args) == base_key:
+            skipped += 1
+            continue
+        diff = _diff(base, evaluator.run(*args, counter="whatif_evaluations"))
+        changes = sum(len(v) for k, v in diff.items() if k != "score_delta")
+        if not changes and not diff["score_delta"] and not include_unchanged:
+            continue
+        rows.append(dict(control=control, change=f"{old} → {new}", impact=changes, **diff))
+    rows.sort(key=lambda r: (-abs(r["score_delta"]), -r["impact"], r["control"], r["change"]))
+    return rows, skipped
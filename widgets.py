@@ -0,0 +1,36 @@
+# Streamlit helpers shared by app.py and the pages/ scripts.
+
+import os
+from functools import partial
+
+import streamlit as st
+
+from diagram_cache import DiagramCache
+from metrics import METRICS
+
+# download_button accepts a callable (run when clicked) from Streamlit 1.52 on
+LAZY_DOWNLOADS = tuple(int(p) for p in st.__version__.split(".")[:2]) >= (1, 52)
+
+# Rendered diagrams are cached by DOT hash across sessions (set ARCHITECT_DIAGRAM_CACHE_DIR for a disk tier)
+@st.cache_resource
+def get_diagram_cache():
+    return DiagramCache(disk_dir=os.environ.get("ARCHITECT_DIAGRAM_CACHE_DIR"))
+
+def show_diagram(dot, name):
+    diagrams = get_diagram_cache()
+    if not diagrams.available:
+        # no local graphviz binary: fall back to client-side layout (timed as the hand-off only)
+        with METRICS.stage("graph_rendering"):
+            st.graphviz_chart(dot, width="stretch")
+        return
+    svg = diagrams.render(dot, "svg")
+    st.image(svg.decode("utf-8"), width="stretch")
+    col_svg, col_png = st.columns(2)
+    col_svg.download_button("Download SVG", svg, file_name=f"{name}.svg", mime="image/svg+xml", key=f"{name}_svg")
+    # the PNG is only for the download, so it is laid out when asked for rather than on every rerun
+    if LAZY_DOWNLOADS:
+        col_png.download_button("Download PNG", partial(diagrams.render, dot, "png"), file_name=f"{name}.png",
+                                mime="image/png", key=f"{name}_png")
+    elif col_png.button("Render PNG", key=f"{name}_png_render"):
+        col_png.download_button("Download PNG", diagrams.render(dot, "png"), file_name=f"{name}.png", mime="image/png",
+                                key=f"{name}_png")